@@ -1,5 +1,16 @@
 """Backend application package."""
 
-from .main import app
+from __future__ import annotations
+
+from typing import Any
 
 __all__ = ["app"]
+
+
+def __getattr__(name: str) -> Any:
+    # Import the FastAPI app lazily so worker processes can import submodules cheaply.
+    if name == "app":
+        from .main import app
+
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,79 @@
+"""Request execution and response helpers shared by the API routers."""
+from __future__ import annotations
+
+import json
+from functools import partial
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from ..config import settings
+from ..core.workers import Deadline, DeadlineExceeded, Overloaded, get_worker_pool
+from ..services.export import encode_chunks
+
+# API responses are gzipped while the client waits, so they trade some size for much less CPU than downloads.
+RESPONSE_COMPRESSION_LEVEL = 1
+T = TypeVar("T")
+
+
+async def run_in_worker_pool(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run CPU-bound work in the bounded worker pool under the request deadline.
+
+    A full queue answers 429 and a missed deadline 503, both with ``Retry-After``.
+    """
+
+    pool = get_worker_pool()
+    deadline = Deadline.after(settings.request_deadline_seconds)
+    try:
+        return await pool.run(partial(func, *args, deadline=deadline, **kwargs), deadline)
+    except Overloaded as exc:
+        raise HTTPException(
+            status_code=429, detail="Too many concurrent requests", headers={"Retry-After": str(exc.retry_after)}
+        ) from exc
+    except DeadlineExceeded as exc:
+        raise HTTPException(
+            status_code=503, detail="Request deadline exceeded", headers={"Retry-After": str(pool.retry_after())}
+        ) from exc
+
+
+def render_ndjson(records: Iterable[Any]) -> Iterator[str]:
+    """Render JSON-serializable records as newline-delimited JSON."""
+
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Whether an ``Accept-Encoding`` header admits a gzip-encoded response."""
+
+    for coding in (accept_encoding or "").split(","):
+        name, _, parameters = coding.partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        quality = parameters.strip().lower()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        return True
+    return False
+
+
+def ndjson_response(lines: Iterable[str], accept_encoding: Optional[str]) -> StreamingResponse:
+    """Stream rendered NDJSON ``lines``, gzip-encoded when ``accept_encoding`` admits it."""
+
+    compress = accepts_gzip(accept_encoding)
+    headers = {"Vary": "Accept-Encoding"}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        encode_chunks(lines, compress=compress, level=RESPONSE_COMPRESSION_LEVEL),
+        media_type="application/x-ndjson",
+        headers=headers,
+    )
+
+
+__all__ = ["RESPONSE_COMPRESSION_LEVEL", "accepts_gzip", "ndjson_response", "render_ndjson", "run_in_worker_pool"]
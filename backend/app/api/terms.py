@@ -2,18 +2,57 @@
 
 from __future__ import annotations
 
+import json
 import os
 import secrets
 from pathlib import Path
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
-
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+from ..config import settings
+from ..core.lifecycle import lazy_singleton
+from ..core.metrics import INDEX_SIZE
+from ..core.normalization import NormalizationOptions
+from ..core.profiling import QueryProfile, phase
+from ..core.workers import Deadline
 from ..models.terms import Term, TermsRepository
+from .responses import ndjson_response, run_in_worker_pool
 
 router = APIRouter(prefix="/terms", tags=["terms"])
 
 _DATA_PATH = Path(__file__).resolve().parents[2] / "data" / "terms.json"
-_repository = TermsRepository(_DATA_PATH)
+MAX_TERMS_BATCH = 1000
+
+
+@lazy_singleton
+def get_terms_repository() -> TermsRepository:
+    """Return the shared terms repository, creating it on first use.
+
+    With ``Settings.shared_index_dir`` set this is a read-only view of the published dictionary.
+    """
+
+    if settings.shared_index_dir:
+        from ..search.shared import SharedTermsRepository
+
+        return SharedTermsRepository(settings.shared_index_dir, settings.shared_index_refresh_seconds)
+    return TermsRepository(_DATA_PATH, NormalizationOptions.from_settings(settings))
+
+
+def _terms_sizes():
+    if get_terms_repository.cache_info().currsize:
+        for unit, value in get_terms_repository().stats().items():
+            yield ("terms", unit), value
+
+
+INDEX_SIZE.add_callback(_terms_sizes)
+
+
+def preload_terms() -> int:
+    """Warm-up hook: load and normalize the terms before the service reports ready."""
+
+    return get_terms_repository().preload()
 
 
 async def require_admin_token(x_admin_token: str = Header(..., alias="X-Admin-Token")) -> None:
@@ -36,17 +75,76 @@ async def require_admin_token(x_admin_token: str = Header(..., alias="X-Admin-To
 @router.get("", response_model=list[Term], summary="Search terms")
 async def search_terms(
     q: str | None = Query(default=None, description="Keyword to search for"),
-) -> list[Term]:
-    """Perform a fuzzy search over the stored terms."""
+    profile: bool = Query(default=False, description="Return a per-phase timing breakdown and work counters"),
+    repository: TermsRepository = Depends(get_terms_repository),
+) -> list[Term] | JSONResponse:
+    """Perform a fuzzy search over the stored terms.
+
+    With ``profile=true`` the terms are wrapped as ``{"items": [...], "profile": {...}}``.
+    """
 
+    query_profile = QueryProfile() if profile else None
     try:
         normalized_query = q.strip() if q else None
-        return _repository.search(normalized_query)
+        terms = repository.search(normalized_query, query_profile)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(exc),
+        ) from exc
+    if query_profile is None:
+        return terms
+
+    with phase(query_profile, "serialize"):
+        items = [term.model_dump(mode="json") for term in terms]
+    query_profile.count("objects_materialized", len(items))
+    return JSONResponse(
+        {"items": items, "profile": query_profile.as_dict()},
+        headers={"Server-Timing": query_profile.server_timing()},
+    )
+
+
+class TermsBatchRequest(BaseModel):
+    queries: list[str] = Field(..., max_length=MAX_TERMS_BATCH, description="Keywords to search for")
+
+
+def _render_terms_batch(repository: TermsRepository, queries: list[str], *, deadline: Deadline) -> list[str]:
+    results = repository.search_many(query or None for query in queries)
+    # Results for different queries overlap, so each matched term is serialized only once.
+    serialized: dict[int, str] = {}
+    lines = []
+    for query in queries:
+        deadline.check()
+        items = []
+        for term in results[query or None]:
+            item = serialized.get(id(term))
+            if item is None:
+                item = serialized[id(term)] = term.model_dump_json()
+            items.append(item)
+        lines.append(f'{{"query":{json.dumps(query, ensure_ascii=False)},"items":[{",".join(items)}]}}\n')
+    return lines
+
+
+@router.post("/batch", summary="Search terms for many keywords")
+async def search_terms_batch(
+    request: TermsBatchRequest,
+    accept_encoding: str | None = Header(default=None, alias="Accept-Encoding"),
+    repository: TermsRepository = Depends(get_terms_repository),
+) -> StreamingResponse:
+    """Stream ``{"query": ..., "items": [...]}`` NDJSON lines, one per distinct query in request order.
+
+    Every query is answered from the same snapshot of the terms; clients that accept gzip get a gzip-encoded stream.
+    """
+
+    queries = list(dict.fromkeys(query.strip() for query in request.queries))
+    try:
+        lines = await run_in_worker_pool(_render_terms_batch, repository, queries)
     except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(exc),
         ) from exc
+    return ndjson_response(lines, accept_encoding)
 
 
 @router.post(
@@ -63,4 +161,4 @@ async def upload_terms() -> dict[str, int]:
     )
 
 
-__all__ = ["router"]
+__all__ = ["get_terms_repository", "preload_terms", "router"]
@@ -1,59 +1,273 @@
 """API endpoints for accessing the bilingual legal corpus."""
 from __future__ import annotations
 
-from typing import Optional
+import threading
+from typing import Any, Optional
 
 try:  # pragma: no cover - optional FastAPI dependency
-    from fastapi import APIRouter, HTTPException, Query
+    from fastapi import APIRouter, Header, HTTPException, Query
+    from fastapi.responses import JSONResponse, StreamingResponse
 except ModuleNotFoundError:  # pragma: no cover - fallback for tests
+    class JSONResponse:  # type: ignore
+        def __init__(self, content: object, headers: dict | None = None) -> None:
+            self.content = content
+            self.headers = headers or {}
+
+    class StreamingResponse:  # type: ignore
+        def __init__(self, content: object, media_type: str | None = None, headers: dict | None = None) -> None:
+            self.body_iterator = content
+            self.media_type = media_type
+            self.headers = headers or {}
+
     class Query:  # type: ignore
         def __init__(self, default: object, **_: object) -> None:
             self.default = default
 
+    Header = Query  # type: ignore
+
     class HTTPException(Exception):
-        def __init__(self, status_code: int, detail: str) -> None:
+        def __init__(self, status_code: int, detail: str, headers: dict | None = None) -> None:
             super().__init__(detail)
             self.status_code = status_code
             self.detail = detail
+            self.headers = headers
 
     class APIRouter:  # type: ignore
         def __init__(self, prefix: str = "", tags: list[str] | None = None) -> None:
             self.prefix = prefix
             self.tags = tags or []
 
-        def get(self, path: str):  # pragma: no cover - no actual routing in tests
+        def get(self, path: str, **_: object):  # pragma: no cover - no actual routing in tests
             def decorator(func):
                 return func
 
             return decorator
 
+        post = get
+
+
+from pydantic import BaseModel, Field
+
+from backend.app.api.responses import ndjson_response, render_ndjson, run_in_worker_pool
+from backend.app.config import settings
+from backend.app.core.lifecycle import lazy_singleton
+from backend.app.core.metrics import INDEX_SIZE, record_cache, timed
+from backend.app.core.normalization import NormalizationOptions
+from backend.app.core.profiling import QueryProfile
+from backend.app.core.workers import Deadline
+from backend.app.models.corpus import Document, Paragraph, SentenceAlignment
+from backend.app.search.indexer import CorpusIndexer, create_indexer
+from backend.app.services.alignment import AlignmentRepository, AlignmentService, content_fingerprint
+from backend.app.services.export import (
+    FORMATS,
+    ExportFilter,
+    export_corpus,
+)
+from backend.app.services.translation_memory import DEFAULT_LIMIT, DEFAULT_THRESHOLD, TranslationMemory
+
+
+def build_alignment_repository() -> AlignmentRepository:
+    """The alignment store selected by ``Settings.corpus_storage``."""
+
+    if settings.corpus_storage == "sql":
+        from backend.app.services.storage import SqlCorpusRepository
+
+        return SqlCorpusRepository()
+    return AlignmentRepository()
 
-from backend.app.models.corpus import Document, Paragraph
-from backend.app.search.indexer import CorpusIndexer
-from backend.app.services.alignment import AlignmentService
 
 router = APIRouter(prefix="/corpus", tags=["corpus"])
-indexer = CorpusIndexer()
-alignment_service = AlignmentService()
+
+
+@lazy_singleton
+def get_indexer() -> CorpusIndexer:
+    """Return the shared search index, creating the configured backend on first use."""
+
+    return create_indexer(settings)
+
+
+@lazy_singleton
+def get_alignment_service() -> AlignmentService:
+    return AlignmentService(build_alignment_repository())
+
+
+@lazy_singleton
+def get_translation_memory() -> TranslationMemory:
+    return TranslationMemory(options=NormalizationOptions.from_settings(settings))
+
+
+def close_indexer() -> None:
+    """Shutdown hook: stop the shard processes or close the database file the index holds."""
+
+    if not get_indexer.cache_info().currsize:
+        return
+    close = getattr(get_indexer(), "close", None)
+    if close is not None:
+        close()
+        get_indexer.cache_clear()
+
+
+_TM_REFRESH_LOCK = threading.Lock()
+
+
+def refresh_translation_memory(*, wait: bool = True) -> TranslationMemory:
+    """Return the translation memory, first rebuilding it if the shared index has a new generation.
+
+    Outside shared mode ``sync_document`` keeps the memory current and it is returned as is.
+    With ``wait=False`` a caller that finds another thread rebuilding answers from the
+    previous generation instead of waiting.
+    """
+
+    translation_memory = get_translation_memory()
+    if not settings.shared_index_dir:
+        return translation_memory
+    indexer = get_indexer()
+    generation, entries = indexer.alignment_snapshot()
+    if generation == translation_memory.generation or not _TM_REFRESH_LOCK.acquire(blocking=wait):
+        return translation_memory
+    try:
+        # Another thread may have rebuilt it while this one waited for the lock.
+        generation, entries = indexer.alignment_snapshot()
+        if generation != translation_memory.generation:
+            translation_memory.replace(entries, generation)
+    finally:
+        _TM_REFRESH_LOCK.release()
+    return translation_memory
+
+
+def _index_sizes():
+    # Only report indexes that exist; a scrape must not build them.
+    if get_indexer.cache_info().currsize:
+        for unit, value in get_indexer().stats().items():
+            yield ("corpus", unit), value
+    if get_translation_memory.cache_info().currsize:
+        yield ("translation_memory", "segments"), len(get_translation_memory())
+
+
+INDEX_SIZE.add_callback(_index_sizes)
+
+_LAZY_ATTRIBUTES = {
+    "indexer": get_indexer,
+    "alignment_service": get_alignment_service,
+    "translation_memory": get_translation_memory,
+}
+
+
+def __getattr__(name: str) -> Any:
+    # ``from backend.app.api.v1.corpus import indexer`` still works, without building it at import.
+    try:
+        factory = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    return factory()
+
+MAX_TM_BATCH = 1000
+MAX_DOCUMENT_BATCH = 1000
+
+
+class TranslationMemoryBatchRequest(BaseModel):
+    segments: list[str] = Field(..., max_length=MAX_TM_BATCH, description="Segments to look up")
+    limit: int = Field(DEFAULT_LIMIT, ge=1, le=50)
+    threshold: float = Field(DEFAULT_THRESHOLD, ge=0.0, le=1.0, description="Minimum similarity (0-1)")
+    language: Optional[str] = Field(None, description="Only match sentences in this language")
+
+
+class DocumentBatchRequest(BaseModel):
+    document_ids: list[str] = Field(..., max_length=MAX_DOCUMENT_BATCH, description="Documents to fetch")
 
 
 @router.get("/")
-def search_corpus(
+async def search_corpus(
     query: str = Query("", description="Full-text search query"),
     category: Optional[str] = Query(None, description="Filter by legal category"),
     year: Optional[int] = Query(None, description="Filter by publication year"),
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
+    profile: bool = Query(False, description="Include a per-phase timing breakdown and work counters"),
+) -> Any:
+    if not profile:
+        return await run_in_worker_pool(
+            get_indexer().search, query=query, category=category, year=year, page=page, page_size=page_size
+        )
+    query_profile = QueryProfile()
+    results = await run_in_worker_pool(
+        get_indexer().search,
+        query=query,
+        category=category,
+        year=year,
+        page=page,
+        page_size=page_size,
+        profile=query_profile,
+    )
+    return JSONResponse(
+        {**results, "profile": query_profile.as_dict()},
+        headers={"Server-Timing": query_profile.server_timing()},
+    )
+
+
+def _lookup_translation_memory(segment: str, **kwargs: Any) -> list:
+    return refresh_translation_memory(wait=False).lookup(segment, **kwargs)
+
+
+def _lookup_translation_memory_batch(segments: list, **kwargs: Any) -> list:
+    return refresh_translation_memory(wait=False).lookup_many(segments, **kwargs)
+
+
+@router.get("/tm")
+async def translation_memory_lookup(
+    segment: str = Query(..., min_length=1, description="Segment to find fuzzy matches for"),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=50),
+    threshold: float = Query(DEFAULT_THRESHOLD, ge=0.0, le=1.0, description="Minimum similarity (0-1)"),
+    language: Optional[str] = Query(None, description="Only match sentences in this language"),
 ) -> dict:
-    return indexer.search(query=query, category=category, year=year, page=page, page_size=page_size)
+    matches = await run_in_worker_pool(
+        _lookup_translation_memory, segment, limit=limit, threshold=threshold, language=language
+    )
+    return {"segment": segment, "matches": [match.to_dict() for match in matches]}
 
 
-@router.get("/{document_id}")
-def get_document(document_id: str) -> dict:
-    document = indexer.get_document(document_id)
-    if not document:
-        raise HTTPException(status_code=404, detail="Document not found")
-    alignments = alignment_service.get_alignments(document_id)
+@router.post("/tm/batch")
+async def translation_memory_batch(request: TranslationMemoryBatchRequest) -> dict:
+    results = await run_in_worker_pool(
+        _lookup_translation_memory_batch,
+        request.segments,
+        limit=request.limit,
+        threshold=request.threshold,
+        language=request.language,
+    )
+    return {
+        "results": [
+            {"segment": segment, "matches": [match.to_dict() for match in matches]}
+            for segment, matches in zip(request.segments, results)
+        ]
+    }
+
+
+@router.get("/export")
+def export_corpus_stream(
+    export_format: str = Query("jsonl", alias="format", description="Output format: tmx, jsonl or tsv"),
+    category: Optional[str] = Query(None, description="Filter by legal category"),
+    year: Optional[int] = Query(None, description="Filter by publication year"),
+    language_pair: Optional[str] = Query(None, description="Filter by language pair, e.g. bn-zh"),
+    min_score: Optional[float] = Query(None, description="Minimum alignment score"),
+    compress: bool = Query(False, description="Gzip the response body"),
+) -> StreamingResponse:
+    if export_format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {export_format}")
+    try:
+        filters = ExportFilter.from_language_pair(language_pair, category=category, year=year, min_score=min_score)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    _, media_type = FORMATS[export_format]
+    filename = f"corpus.{export_format}" + (".gz" if compress else "")
+    return StreamingResponse(
+        export_corpus(get_indexer(), filters, export_format, compress=compress),
+        media_type="application/gzip" if compress else media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def _document_payload(document: Document, alignments: list[SentenceAlignment]) -> dict:
     return {
         "document": {
             "identifier": document.identifier,
@@ -77,21 +291,82 @@ def get_document(document_id: str) -> dict:
     }
 
 
+def _render_documents_batch(document_ids: list, *, deadline: Deadline) -> list:
+    found = get_indexer().get_documents(document_ids)
+    records = []
+    for document_id in document_ids:
+        deadline.check()
+        if document_id in found:
+            records.append({"document_id": document_id, **_document_payload(*found[document_id])})
+        else:
+            records.append({"document_id": document_id, "error": "Document not found"})
+    return list(render_ndjson(records))
+
+
+@router.post("/batch")
+async def get_documents_batch(
+    request: DocumentBatchRequest,
+    accept_encoding: Optional[str] = Header(None, alias="Accept-Encoding"),
+) -> StreamingResponse:
+    """Stream each distinct requested document as one NDJSON line, in request order.
+
+    All documents are read from the index in one lookup; unknown ids get a line with an ``error``.
+    Clients that accept gzip receive a gzip-encoded stream.
+    """
+
+    lines = await run_in_worker_pool(_render_documents_batch, list(dict.fromkeys(request.document_ids)))
+    return ndjson_response(lines, accept_encoding)
+
+
+@router.get("/{document_id}")
+def get_document(document_id: str) -> dict:
+    document = get_indexer().get_document(document_id)
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return _document_payload(document, get_indexer().get_alignments(document_id))
+
+
 @router.get("/{document_id}/export")
 def export_document(document_id: str) -> dict:
     document_payload = get_document(document_id)
     return document_payload
 
 
+@timed()
 def sync_document(
     document: Document,
     source_text: str,
     target_text: str,
     category: Optional[str] = None,
-) -> None:
+    *,
+    indexer: Optional[CorpusIndexer] = None,
+    alignment_service: Optional[AlignmentService] = None,
+    translation_memory: Optional[TranslationMemory] = None,
+) -> bool:
+    """Align and index a document, returning False when its text was unchanged and the work was skipped.
+
+    The index, alignment service and translation memory default to the process-wide ones.
+    """
+
+    if indexer is None:
+        indexer = get_indexer()
+    if alignment_service is None:
+        alignment_service = get_alignment_service()
+    if translation_memory is None:
+        translation_memory = get_translation_memory()
     if category and category not in document.categories:
         document.categories.append(category)
-    alignment_result = alignment_service.align_and_store(document, source_text, target_text)
+    fingerprint = content_fingerprint(source_text, target_text)
+    # A durable repository's fingerprint covers documents stored by earlier processes, such as the
+    # previous load_corpus run, which this process's index may never have loaded.
+    unchanged = (
+        alignment_service.repository.durable or indexer.get_document(document.identifier) is not None
+    ) and alignment_service.is_unchanged(document.identifier, fingerprint)
+    record_cache("unchanged_documents", unchanged)
+    if unchanged:
+        alignment_service.repository.update_document(document)
+        indexer.update_document(document)
+        return False
     paragraphs = []
     if source_text:
         paragraphs.append(
@@ -113,4 +388,32 @@ def sync_document(
                 text=target_text,
             )
         )
+    alignment_service.repository.save_document(document, paragraphs)
+    alignment_result = alignment_service.align_and_store(
+        document, source_text, target_text, fingerprint=fingerprint
+    )
     indexer.index_document(document, paragraphs, alignment_result.alignments)
+    translation_memory.add_alignments(document.identifier, alignment_result.alignments)
+    return True
+
+
+def restore_index() -> int:
+    """Warm-up hook: build the index and reload it from persistent storage when that is configured."""
+
+    indexer = get_indexer()
+    if settings.shared_index_dir:
+        # Workers attach to the builder's published index; the translation memory stays per
+        # process and is rebuilt whenever a lookup finds a newer generation.
+        refresh_translation_memory()
+        return indexer.stats()["documents"]
+    translation_memory = get_translation_memory()
+    load_into = getattr(get_alignment_service().repository, "load_into", None)
+    if load_into is not None:
+        load_into(indexer)
+    # An SQLite index outlives the process even when the alignments are kept in memory, so the
+    # translation memory is always rebuilt from whatever the index holds now.
+    count = 0
+    for document in indexer.iter_documents():
+        translation_memory.add_alignments(document.identifier, indexer.get_alignments(document.identifier))
+        count += 1
+    return count
@@ -1,4 +1,4 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response, status
 
 router = APIRouter(tags=["health"])
 
@@ -6,3 +6,16 @@ router = APIRouter(tags=["health"])
 @router.get("/healthz", summary="Health check")
 async def health_check() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@router.get("/readyz", summary="Readiness check")
+async def readiness_check(request: Request, response: Response) -> dict:
+    """Report 503 until the startup warm-up has loaded the indexes."""
+
+    readiness = getattr(request.app.state, "readiness", None)
+    if readiness is None:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "starting", "warm_up_seconds": {}, "error": None}
+    if not readiness.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return readiness.as_dict()
@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import AnyUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -16,6 +16,27 @@ class Settings(BaseSettings):
 
     database_url: AnyUrl = "postgresql+asyncpg://postgres:postgres@db:5432/zhbn_legal"
     sync_database_url: Optional[AnyUrl] = None
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    corpus_storage: Literal["memory", "sql"] = "memory"
+
+    search_backend: Literal["memory", "sqlite"] = "memory"
+    search_sqlite_path: str = "corpus-index.sqlite3"
+    search_shards: int = 1
+    search_fold_width: bool = True
+    search_fold_case: bool = True
+    search_fold_chinese_variants: bool = True
+    search_fold_bengali_variants: bool = True
+    shared_index_dir: Optional[str] = None
+    shared_index_refresh_seconds: float = 1.0
+
+    warmup_in_background: bool = True
+    worker_threads: int = 4
+    worker_queue_depth: int = 64
+    request_deadline_seconds: float = 5.0
 
     cors_origins: list[str] = ["http://localhost:3000"]
 
@@ -0,0 +1,92 @@
+"""Startup warm-up and readiness tracking."""
+from __future__ import annotations
+
+import functools
+import logging
+import threading
+import time
+from collections import namedtuple
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Generic, Iterable, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+WarmUpHook = Tuple[str, Callable[[], object]]
+T = TypeVar("T")
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class lazy_singleton(Generic[T]):
+    """Zero-argument factory that builds its object once, even when first called concurrently.
+
+    ``functools.lru_cache`` may run the factory in several threads at once and keep only one
+    result, so a warm-up hook and an early request could each build an index. Here the first
+    caller builds under a lock while the others wait. ``cache_info().currsize`` and
+    ``cache_clear()`` behave as they do for ``lru_cache``.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, factory: Callable[[], T]) -> None:
+        functools.update_wrapper(self, factory)
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._value: object = self._MISSING
+        self._hits = 0
+        self._misses = 0
+
+    def __call__(self) -> T:
+        value = self._value
+        if value is self._MISSING:
+            with self._lock:
+                value = self._value
+                if value is self._MISSING:
+                    self._misses += 1
+                    value = self._value = self._factory()
+                    return value  # type: ignore[return-value]
+        self._hits += 1
+        return value  # type: ignore[return-value]
+
+    def cache_info(self) -> CacheInfo:
+        built = self._value is not self._MISSING
+        return CacheInfo(self._hits, self._misses, 1, int(built))
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._value = self._MISSING
+            self._hits = self._misses = 0
+
+
+@dataclass
+class Readiness:
+    """Whether the warm-up hooks have finished; ``/readyz`` reports this."""
+
+    state: str = "starting"
+    durations: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def as_dict(self) -> dict:
+        return {"status": self.state, "warm_up_seconds": dict(self.durations), "error": self.error}
+
+
+def run_warm_up(hooks: Iterable[WarmUpHook], readiness: Readiness) -> None:
+    """Run each hook in order, recording its duration; stop at the first failure."""
+
+    for name, hook in hooks:
+        started = time.perf_counter()
+        try:
+            hook()
+        except Exception as exc:
+            logger.exception("Warm-up hook %s failed", name)
+            readiness.state = "failed"
+            readiness.error = f"{name}: {exc}"
+            return
+        readiness.durations[name] = round(time.perf_counter() - started, 4)
+    readiness.state = "ready"
+
+
+__all__ = ["Readiness", "WarmUpHook", "lazy_singleton", "run_warm_up"]
@@ -0,0 +1,296 @@
+"""In-process metrics exposed in the Prometheus text format.
+
+Counters and histograms are plain Python objects updated under a per-series lock, so
+recording a sample costs about a microsecond and needs no external service. Gauges are
+computed by callbacks when ``/metrics`` is scraped.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Sample = Tuple[str, Tuple[Tuple[str, str], ...], float]
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: List["_Metric"] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: "_Metric") -> None:
+        with self._lock:
+            if any(existing.name == metric.name for existing in self._metrics):
+                raise ValueError(f"Duplicate metric {metric.name}")
+            self._metrics.append(metric)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics):
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                if labels:
+                    rendered = ",".join(f'{key}="{_escape(label)}"' for key, label in labels)
+                    lines.append(f"{name}{{{rendered}}} {_format_value(value)}")
+                else:
+                    lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional[Registry] = REGISTRY,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def labels(self, *values: str) -> Any:
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self) -> Any:  # pragma: no cover - overridden
+        raise NotImplementedError
+
+    def _label_pairs(self, values: Tuple[str, ...]) -> Tuple[Tuple[str, str], ...]:
+        return tuple(zip(self.labelnames, values))
+
+    def samples(self) -> Iterator[Sample]:  # pragma: no cover - overridden
+        raise NotImplementedError
+
+
+class _CounterValue:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterValue:
+        return _CounterValue()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def samples(self) -> Iterator[Sample]:
+        for values, child in list(self._children.items()):
+            yield f"{self.name}_total", self._label_pairs(values), child.value
+
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self.bounds = bounds
+        # One slot per bucket plus the +Inf overflow; cumulated when rendered.
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        registry: Optional[Registry] = REGISTRY,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def samples(self) -> Iterator[Sample]:
+        for values, child in list(self._children.items()):
+            labels = self._label_pairs(values)
+            with child._lock:
+                counts = list(child.counts)
+                total = child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", labels + (("le", _format_value(bound)),), cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+
+class GaugeCallback(_Metric):
+    """Gauge whose series are produced by ``callback`` at scrape time.
+
+    The callback returns ``(label values, value)`` pairs; errors leave the gauge empty.
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        callback: Optional[Callable[[], Iterable[Tuple[Tuple[str, ...], float]]]] = None,
+        registry: Optional[Registry] = REGISTRY,
+    ) -> None:
+        super().__init__(name, documentation, labelnames, registry)
+        self._callbacks = [callback] if callback is not None else []
+
+    def add_callback(self, callback: Callable[[], Iterable[Tuple[Tuple[str, ...], float]]]) -> None:
+        self._callbacks.append(callback)
+
+    def samples(self) -> Iterator[Sample]:
+        for callback in list(self._callbacks):
+            try:
+                series = list(callback())
+            except Exception:  # pragma: no cover - a broken collector must not break the scrape
+                continue
+            for values, value in series:
+                yield self.name, self._label_pairs(tuple(values)), value
+
+
+FUNCTION_SECONDS = Histogram(
+    "zhbn_function_duration_seconds", "Time spent in instrumented hot-path functions.", ["function"]
+)
+REQUEST_SECONDS = Histogram(
+    "zhbn_http_request_duration_seconds", "HTTP request latency by handler.", ["method", "handler", "status"]
+)
+CACHE_REQUESTS = Counter("zhbn_cache_requests", "Cache lookups by cache and result (hit or miss).", ["cache", "result"])
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def _cache_hit_ratios() -> Iterator[Tuple[Tuple[str], float]]:
+    totals: Dict[str, List[float]] = {}
+    for (cache, result), child in list(CACHE_REQUESTS._children.items()):
+        totals.setdefault(cache, [0.0, 0.0])[0 if result == "hit" else 1] += child.value
+    for cache, (hits, misses) in sorted(totals.items()):
+        if hits + misses:
+            yield (cache,), hits / (hits + misses)
+
+
+CACHE_HIT_RATIO = GaugeCallback("zhbn_cache_hit_ratio", "Fraction of cache lookups that hit.", ["cache"], _cache_hit_ratios)
+INDEX_SIZE = GaugeCallback("zhbn_index_size", "Size of the loaded indexes by index and unit.", ["index", "unit"])
+
+
+def timed(name: Optional[str] = None) -> Callable[[F], F]:
+    """Record each call's duration in ``zhbn_function_duration_seconds``."""
+
+    def decorator(func: F) -> F:
+        series = FUNCTION_SECONDS.labels(name or func.__qualname__)
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                series.observe(time.perf_counter() - started)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per handler until the response completes."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            handler = getattr(route, "name", None) or "unmatched"
+            REQUEST_SECONDS.labels(scope["method"], handler, str(status)).observe(time.perf_counter() - started)
+
+
+__all__ = [
+    "CACHE_HIT_RATIO",
+    "CACHE_REQUESTS",
+    "CONTENT_TYPE",
+    "Counter",
+    "FUNCTION_SECONDS",
+    "GaugeCallback",
+    "Histogram",
+    "INDEX_SIZE",
+    "MetricsMiddleware",
+    "REGISTRY",
+    "REQUEST_SECONDS",
+    "Registry",
+    "record_cache",
+    "timed",
+]
@@ -0,0 +1,247 @@
+"""Text normalization shared by indexing and querying.
+
+Stored text is normalized once when it is indexed; queries go through the identical
+pipeline, so matching is a plain substring test on normalized strings. An offset map
+from normalized to original positions lets highlights point back into the original.
+"""
+from __future__ import annotations
+
+import unicodedata
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from backend.app.config import Settings
+
+# Common Traditional Chinese characters in legal text and their Simplified forms.
+_TRADITIONAL = (
+    "傳們個會國說這來時為後對學開關與從經發業現動產當進種長過還將體點義區問題見實際認"
+    "規則條機權護務錄檢據證審準賣買費貨幣稅員項無聯處書記議變專屬應鄉縣級辦確陳華漢語"
+    "氣歲齊黨軍營衛訴訟頁頭顧領導歷執職責戶簽訂約絕續紀總線組織結給統繼網羅紅純紙終維"
+    "編緊練縮繫係隨險陽陰隊雙難雜電靈響願類顯風飛飯館馬驗髮鬥魚鳥麥黃龍龜譯詞釋憲眾慣"
+    "資財債賠償罰懲獄監緩觸詐騙賄賂貪竊盜搶綁殺傷災禍頒佈廢壞號稱鬧親愛婦離撫養遺囑贈"
+    "讓擔擬協調諮詢談請報訊視聽觀覽覺歸歡萬億兩幾價錢銀鐵鋼礦運輸車軌轉輪邊遠遷選遞適"
+    "達遲違鄰醫藥環獎勞勵勢勝參啟單嚴團圖場壓壯夢奪奮婁寧寶尋屆層嶺師帶幫廣廳張彈彙徑"
+    "徵憶懷戰戲擁擇擴攜敵數斷於晉極構標樣樹橋檔歐殘滅漁滯潔濟濫灣爭爾獨猶獻畢畫異療盡"
+    "盤礎禮穩積競筆節範築簡糧納紛紐細絡絲綠綜緒締績縱繳罷聖聞聲肅脅膽舉舊艦藝蘇蘭術補"
+    "裝製複計討訓託設許評詳試話該誠誤課論諾謀謂講謝識譽讀讚負貢敗貧貴貸貿賓賞賦質購贊"
+    "趙軟較載輔輕輯農迴遊遙邁郵鄭醜釐針鈔銷鋪鎮錯鍵門閉間閱闊闡階隱雖雞雲靜順須預頓頻"
+    "顏額餘驅驚鬆麼齡"
+)
+_SIMPLIFIED = (
+    "传们个会国说这来时为后对学开关与从经发业现动产当进种长过还将体点义区问题见实际认"
+    "规则条机权护务录检据证审准卖买费货币税员项无联处书记议变专属应乡县级办确陈华汉语"
+    "气岁齐党军营卫诉讼页头顾领导历执职责户签订约绝续纪总线组织结给统继网罗红纯纸终维"
+    "编紧练缩系系随险阳阴队双难杂电灵响愿类显风飞饭馆马验发斗鱼鸟麦黄龙龟译词释宪众惯"
+    "资财债赔偿罚惩狱监缓触诈骗贿赂贪窃盗抢绑杀伤灾祸颁布废坏号称闹亲爱妇离抚养遗嘱赠"
+    "让担拟协调咨询谈请报讯视听观览觉归欢万亿两几价钱银铁钢矿运输车轨转轮边远迁选递适"
+    "达迟违邻医药环奖劳励势胜参启单严团图场压壮梦夺奋娄宁宝寻届层岭师带帮广厅张弹汇径"
+    "征忆怀战戏拥择扩携敌数断于晋极构标样树桥档欧残灭渔滞洁济滥湾争尔独犹献毕画异疗尽"
+    "盘础礼稳积竞笔节范筑简粮纳纷纽细络丝绿综绪缔绩纵缴罢圣闻声肃胁胆举旧舰艺苏兰术补"
+    "装制复计讨训托设许评详试话该诚误课论诺谋谓讲谢识誉读赞负贡败贫贵贷贸宾赏赋质购赞"
+    "赵软较载辅轻辑农回游遥迈邮郑丑厘针钞销铺镇错键门闭间阅阔阐阶隐虽鸡云静顺须预顿频"
+    "颜额余驱惊松么龄"
+)
+_CHINESE_VARIANTS = str.maketrans(_TRADITIONAL, _SIMPLIFIED)
+_JOINERS = str.maketrans("", "", "\u200c\u200d\u2060\ufeff")
+# Legacy encoding of the Bengali khanda ta: TA + VIRAMA + ZERO WIDTH JOINER.
+_BENGALI_KHANDA_TA = ("\u09a4\u09cd\u200d", "\u09ce")
+_NON_STARTER_CATEGORIES = {"Mn", "Mc", "Me"}
+
+
+@dataclass(frozen=True)
+class NormalizationOptions:
+    """Folding steps applied to both indexed text and queries."""
+
+    unicode_form: str = "NFKC"
+    casefold: bool = True
+    fold_chinese_variants: bool = True
+    fold_bengali_variants: bool = True
+
+    @classmethod
+    def from_settings(cls, settings: "Settings") -> "NormalizationOptions":
+        return cls(
+            unicode_form="NFKC" if settings.search_fold_width else "NFC",
+            casefold=settings.search_fold_case,
+            fold_chinese_variants=settings.search_fold_chinese_variants,
+            fold_bengali_variants=settings.search_fold_bengali_variants,
+        )
+
+    def as_metadata(self) -> Dict[str, str]:
+        return {
+            "normalization.unicode_form": self.unicode_form,
+            "normalization.casefold": str(self.casefold).lower(),
+            "normalization.chinese_variants": str(self.fold_chinese_variants).lower(),
+            "normalization.bengali_variants": str(self.fold_bengali_variants).lower(),
+        }
+
+
+DEFAULT_OPTIONS = NormalizationOptions()
+
+
+def normalize(text: str, options: NormalizationOptions = DEFAULT_OPTIONS) -> str:
+    """Apply the normalization pipeline to ``text``."""
+
+    if options.fold_bengali_variants and _BENGALI_KHANDA_TA[0] in text:
+        text = text.replace(*_BENGALI_KHANDA_TA)
+    form = options.unicode_form
+    if not unicodedata.is_normalized(form, text):
+        text = unicodedata.normalize(form, text)
+    if options.casefold:
+        text = text.casefold()
+    if options.fold_bengali_variants:
+        text = text.translate(_JOINERS)
+    if options.fold_chinese_variants:
+        text = text.translate(_CHINESE_VARIANTS)
+    if not unicodedata.is_normalized(form, text):
+        text = unicodedata.normalize(form, text)
+    return text
+
+
+@dataclass
+class NormalizedText:
+    """Normalized text with a map back to positions in the original string.
+
+    ``offsets[i]`` is the original index of the character cluster that produced normalized
+    character ``i``; ``offsets[len(text)]`` is the original length. ``None`` means the
+    normalization did not change the text.
+    """
+
+    text: str
+    offsets: Optional[array] = None
+
+    def original_span(self, start: int, end: int) -> Tuple[int, int]:
+        """Map a ``[start, end)`` span of the normalized text to the original text."""
+
+        offsets = self.offsets
+        if offsets is None:
+            return start, end
+        original_start = offsets[start]
+        if end <= start:
+            return original_start, original_start
+        # Extend the end to the close of the cluster containing the last matched character.
+        cluster_start = offsets[end - 1]
+        position = end
+        while offsets[position] == cluster_start:
+            position += 1
+        return original_start, offsets[position]
+
+    def find_spans(self, query: str) -> List[Tuple[int, int]]:
+        """Original-text spans of every non-overlapping occurrence of a normalized ``query``."""
+
+        if not query:
+            return []
+        spans = []
+        position = self.text.find(query)
+        while position != -1:
+            spans.append(self.original_span(position, position + len(query)))
+            position = self.text.find(query, position + len(query))
+        return spans
+
+    @classmethod
+    def join(cls, parts: Sequence["NormalizedText"], originals: Sequence[str], separator: str = " ") -> "NormalizedText":
+        """Concatenate normalized parts as if ``separator.join(originals)`` had been normalized.
+
+        ``separator`` must be unchanged by normalization.
+        """
+
+        text = separator.join(part.text for part in parts)
+        if all(part.offsets is None for part in parts) and all(
+            len(part.text) == len(original) for part, original in zip(parts, originals)
+        ):
+            return cls(text)
+        offsets = array("I")
+        base = 0
+        for index, (part, original) in enumerate(zip(parts, originals)):
+            if index:
+                offsets.extend(range(base, base + len(separator)))
+                base += len(separator)
+            if part.offsets is None:
+                offsets.extend(range(base, base + len(part.text)))
+            else:
+                offsets.extend(offset + base for offset in part.offsets[:-1])
+            base += len(original)
+        offsets.append(base)
+        return cls(text, offsets)
+
+
+@lru_cache(maxsize=65536)
+def _starts_cluster(character: str, form: str) -> bool:
+    """Whether normalization can never merge ``character`` with the preceding one."""
+
+    if character in "\u200c\u200d\u034f" or unicodedata.combining(character):
+        return False
+    if unicodedata.category(character) in _NON_STARTER_CATEGORIES:
+        return False
+    code = ord(character)
+    if 0x1160 <= code <= 0x11FF:  # Hangul medial vowels and final consonants compose backwards
+        return False
+    decomposed = unicodedata.normalize(form, character)
+    if decomposed and decomposed[0] != character:
+        return _starts_cluster(decomposed[0], form)
+    return True
+
+
+_CHARACTER_TABLES: Dict[NormalizationOptions, Dict[str, Tuple[bool, str]]] = {}
+
+
+def _character_table(options: NormalizationOptions) -> Dict[str, Tuple[bool, str]]:
+    """Per-options cache of ``character -> (starts a cluster, normalized form)``."""
+
+    table = _CHARACTER_TABLES.get(options)
+    if table is None:
+        table = _CHARACTER_TABLES.setdefault(options, {})
+    return table
+
+
+def normalize_with_offsets(text: str, options: NormalizationOptions = DEFAULT_OPTIONS) -> NormalizedText:
+    """Normalize ``text`` and record where each normalized character came from."""
+
+    normalized = normalize(text, options)
+    if normalized == text:
+        return NormalizedText(normalized)
+    form = options.unicode_form
+    table = _character_table(options)
+    pieces: List[str] = []
+    offsets = array("I")
+    # Stays true while every character maps to exactly one character, e.g. width folding.
+    one_to_one = True
+    cluster_start = 0
+    cluster_piece = ""
+    for index, character in enumerate(text):
+        info = table.get(character)
+        if info is None:
+            info = table[character] = (_starts_cluster(character, form), normalize(character, options))
+        if index and not info[0]:
+            cluster_piece = ""
+            continue
+        if index:
+            piece = cluster_piece or normalize(text[cluster_start:index], options)
+            pieces.append(piece)
+            offsets.extend([cluster_start] * len(piece))
+            one_to_one = one_to_one and len(piece) == 1 and index - cluster_start == 1
+        cluster_start = index
+        cluster_piece = info[1]
+    piece = cluster_piece or normalize(text[cluster_start:], options)
+    pieces.append(piece)
+    offsets.extend([cluster_start] * len(piece))
+    one_to_one = one_to_one and len(piece) == 1 and len(text) - cluster_start == 1
+    if "".join(pieces) != normalized:  # pragma: no cover - defensive
+        # Normalization interacted across clusters; fall back to highlighting the whole text.
+        offsets = array("I", [0] * len(normalized))
+        one_to_one = False
+    if one_to_one:
+        return NormalizedText(normalized)
+    offsets.append(len(text))
+    return NormalizedText(normalized, offsets)
+
+
+__all__ = [
+    "DEFAULT_OPTIONS",
+    "NormalizationOptions",
+    "NormalizedText",
+    "normalize",
+    "normalize_with_offsets",
+]
@@ -0,0 +1,80 @@
+"""Opt-in per-query profiling: phase timings and work counters.
+
+Search code takes ``profile: Optional[QueryProfile] = None`` and only touches it behind an
+``is not None`` check, so an unprofiled query pays nothing beyond that comparison. Phases
+are entered a handful of times per query; per-item work is tallied in local integers and
+added to the counters once.
+
+Counter names shared by the search backends:
+
+``candidates_examined``
+    Documents or terms considered after filtering.
+``postings_read``
+    Normalized texts (or rows) scanned for the query.
+``hits_scored``
+    Matches that were scored.
+``objects_materialized``
+    Result objects built for the response.
+``cache_hits`` / ``cache_misses``
+    Lookups in the backend's in-process cache.
+"""
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Dict, Iterator, Optional
+
+_NO_PHASE: ContextManager[None] = nullcontext()
+
+
+class QueryProfile:
+    """Accumulates wall-clock time per phase, in first-entered order, plus named counters."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def total_seconds(self) -> float:
+        """Time since the profile was created, frozen the first time it is reported."""
+
+        if self.finished is None:
+            self.finished = time.perf_counter()
+        return self.finished - self.started
+
+    def as_dict(self) -> dict:
+        return {
+            "total_ms": round(self.total_seconds() * 1000, 3),
+            "phases_ms": {name: round(seconds * 1000, 3) for name, seconds in self.phases.items()},
+            "counters": dict(self.counters),
+        }
+
+    def server_timing(self) -> str:
+        """Render the phases as a ``Server-Timing`` header value."""
+
+        entries = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.phases.items()]
+        entries.append(f"total;dur={self.total_seconds() * 1000:.3f}")
+        return ", ".join(entries)
+
+
+def phase(profile: Optional[QueryProfile], name: str) -> ContextManager[None]:
+    """Time ``name`` on ``profile``, or do nothing when profiling is off."""
+
+    if profile is None:
+        return _NO_PHASE
+    return profile.phase(name)
+
+
+__all__ = ["QueryProfile", "phase"]
@@ -0,0 +1,137 @@
+"""Bounded worker pool with admission control and cooperative request deadlines."""
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Extra time the caller waits past the deadline for a worker to notice it and stop.
+_DEADLINE_GRACE = 0.05
+
+
+class DeadlineExceeded(Exception):
+    """Raised inside a worker when its request deadline has passed."""
+
+
+class Overloaded(Exception):
+    """Raised when the pool's queue is full and new work is turned away."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(f"Worker pool is saturated; retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """Absolute ``time.monotonic()`` instant after which work should stop.
+
+    The monotonic clock is system-wide, so a deadline can be passed to worker processes.
+    """
+
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self) -> None:
+        if time.monotonic() >= self.expires_at:
+            raise DeadlineExceeded("Request deadline exceeded")
+
+
+class WorkerPool:
+    """Runs blocking calls on a fixed number of threads, rejecting work beyond ``max_queue``.
+
+    Each admitted call holds a slot until its thread finishes, even when the caller has
+    already given up on it, so a slow query cannot push the pool past its bounds.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, *, name: str = "worker") -> None:
+        if max_workers < 1:
+            raise ValueError("At least one worker is required")
+        self.max_workers = max_workers
+        self.max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._pending = 0
+        # Exponentially weighted mean task duration, used for Retry-After estimates.
+        self._mean_seconds = 0.05
+
+    @property
+    def pending(self) -> int:
+        """Calls running or waiting for a thread."""
+
+        return self._pending
+
+    def retry_after(self) -> int:
+        backlog = max(1, self._pending - self.max_workers + 1)
+        return max(1, math.ceil(self._mean_seconds * backlog / self.max_workers))
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                raise Overloaded(self.retry_after())
+            self._pending += 1
+
+    def _release(self, seconds: float) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._mean_seconds += 0.2 * (seconds - self._mean_seconds)
+
+    def _execute(self, func: Callable[[], T], deadline: Optional[Deadline]) -> T:
+        started = time.monotonic()
+        try:
+            # Time spent queued counts against the deadline.
+            if deadline is not None:
+                deadline.check()
+            return func()
+        finally:
+            self._release(time.monotonic() - started)
+
+    async def run(self, func: Callable[[], T], deadline: Optional[Deadline] = None) -> T:
+        """Run ``func`` on a worker thread; raise ``Overloaded`` or ``DeadlineExceeded`` instead of waiting forever."""
+
+        self._admit()
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self._executor, self._execute, func, deadline)
+        except BaseException:
+            self._release(0.0)
+            raise
+        if deadline is None:
+            return await future
+        try:
+            # Shield the future so a caller timeout does not mark it cancelled while it still runs.
+            return await asyncio.wait_for(asyncio.shield(future), deadline.remaining() + _DEADLINE_GRACE)
+        except asyncio.TimeoutError:
+            # The worker will finish on its own; retrieve its outcome so it is not logged as lost.
+            future.add_done_callback(lambda done: done.cancelled() or done.exception())
+            raise DeadlineExceeded("Request deadline exceeded") from None
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache
+def get_worker_pool() -> WorkerPool:
+    """Return the shared pool for CPU-bound request work, sized by ``Settings``."""
+
+    from backend.app.config import get_settings
+
+    settings = get_settings()
+    return WorkerPool(settings.worker_threads, settings.worker_queue_depth, name="request-worker")
+
+
+__all__ = ["Deadline", "DeadlineExceeded", "Overloaded", "WorkerPool", "get_worker_pool"]
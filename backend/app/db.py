@@ -1,26 +1,83 @@
+"""Database engines and sessions, created on first use.
+
+Nothing connects or even imports a driver until an engine is requested, so importing the
+application does not require the database drivers to be installed.
+"""
 from __future__ import annotations
 
 from contextlib import asynccontextmanager, contextmanager
-from typing import AsyncGenerator, Generator
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Generator
 
 from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import Session, sessionmaker
 
 from .config import settings
 
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+
+def _sync_database_url() -> str:
+    return str(settings.sync_database_url or str(settings.database_url).replace("+asyncpg", ""))
+
+
+def _pool_options(url: str) -> dict[str, Any]:
+    # SQLite uses single-connection pools that do not accept sizing arguments.
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+@lru_cache
+def get_engine() -> "AsyncEngine":
+    """Return the shared async engine, creating it on first use."""
+
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = str(settings.database_url)
+    return create_async_engine(url, future=True, echo=False, **_pool_options(url))
+
+
+@lru_cache
+def get_session_factory() -> "async_sessionmaker[AsyncSession]":
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    return async_sessionmaker(get_engine(), expire_on_commit=False, class_=AsyncSession)
 
-engine = create_async_engine(str(settings.database_url), future=True, echo=False)
-AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
-sync_database_url = str(settings.sync_database_url or str(settings.database_url).replace("+asyncpg", ""))
-sync_engine = create_engine(sync_database_url, future=True, echo=False)
-sync_session_factory = sessionmaker(bind=sync_engine, expire_on_commit=False, class_=Session)
+@lru_cache
+def get_sync_engine() -> Engine:
+    """Return the shared synchronous engine, creating it on first use."""
+
+    url = _sync_database_url()
+    return create_engine(url, future=True, echo=False, **_pool_options(url))
+
+
+@lru_cache
+def get_sync_session_factory() -> sessionmaker[Session]:
+    return sessionmaker(bind=get_sync_engine(), expire_on_commit=False, class_=Session)
+
+
+async def dispose_engines() -> None:
+    """Close the pooled connections of any engine that was created."""
+
+    if get_engine.cache_info().currsize:
+        await get_engine().dispose()
+    if get_sync_engine.cache_info().currsize:
+        get_sync_engine().dispose()
 
 
 @asynccontextmanager
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    session = AsyncSessionLocal()
+async def get_db() -> AsyncGenerator["AsyncSession", None]:
+    session = get_session_factory()()
     try:
         yield session
     finally:
@@ -29,8 +86,26 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 
 @contextmanager
 def get_sync_db() -> Generator[Session, None, None]:
-    session = sync_session_factory()
+    session = get_sync_session_factory()()
     try:
         yield session
     finally:
         session.close()
+
+
+_LAZY_ATTRIBUTES = {
+    "engine": get_engine,
+    "AsyncSessionLocal": get_session_factory,
+    "sync_engine": get_sync_engine,
+    "sync_session_factory": get_sync_session_factory,
+    "sync_database_url": _sync_database_url,
+}
+
+
+def __getattr__(name: str) -> Any:
+    # Keep the old module-level names importable without creating engines at import time.
+    try:
+        factory = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    return factory()
@@ -1,10 +1,52 @@
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 
 from .api import api_router
+from .api.terms import preload_terms
+from .api.v1.corpus import close_indexer, restore_index
 from .config import settings
+from .core.lifecycle import Readiness, WarmUpHook, run_warm_up
+from .core.metrics import CONTENT_TYPE, REGISTRY, MetricsMiddleware
+from .core.workers import get_worker_pool
+
+WARM_UP_HOOKS: tuple[WarmUpHook, ...] = (
+    ("corpus_index", restore_index),
+    ("terms", preload_terms),
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    readiness = app.state.readiness = Readiness()
+    warm_up = asyncio.to_thread(run_warm_up, WARM_UP_HOOKS, readiness)
+    task = None
+    if settings.warmup_in_background:
+        # Serve liveness checks straight away; /readyz turns green once the indexes are loaded.
+        task = asyncio.create_task(warm_up)
+    else:
+        await warm_up
+    try:
+        yield
+    finally:
+        if task is not None:
+            await task
+        if get_worker_pool.cache_info().currsize:
+            get_worker_pool().shutdown()
+            get_worker_pool.cache_clear()
+        close_indexer()
+        # Engines only exist if something imported the db module; avoid importing SQLAlchemy here.
+        db = sys.modules.get(f"{__package__}.db")
+        if db is not None:
+            await db.dispose_engines()
 
-app = FastAPI(title=settings.project_name)
+
+app = FastAPI(title=settings.project_name, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,9 +56,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(api_router)
 
 
 @app.get("/", summary="Service metadata")
 async def root() -> dict[str, str]:
     return {"service": settings.project_name, "status": "ok"}
+
+
+@app.get("/metrics", summary="Prometheus metrics", include_in_schema=False)
+async def metrics() -> Response:
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
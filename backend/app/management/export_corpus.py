@@ -0,0 +1,45 @@
+"""Management command to export the parallel corpus as TMX, JSONL or TSV."""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import BinaryIO, Iterable
+
+from backend.app.api.v1.corpus import indexer, restore_index
+from backend.app.services.export import FORMATS, ExportFilter, export_corpus
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export the aligned corpus for MT training")
+    parser.add_argument("output", help="Output file path, or '-' for standard output")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="jsonl")
+    parser.add_argument("--category", help="Only export documents in this category")
+    parser.add_argument("--year", type=int, help="Only export documents published in this year")
+    parser.add_argument("--language-pair", help="Only export this language pair, e.g. bn-zh")
+    parser.add_argument("--min-score", type=float, help="Minimum alignment score")
+    parser.add_argument("--gzip", action="store_true", help="Gzip the output")
+    return parser.parse_args(argv)
+
+
+def write_export(stream: BinaryIO, args: argparse.Namespace) -> None:
+    filters = ExportFilter.from_language_pair(
+        args.language_pair, category=args.category, year=args.year, min_score=args.min_score
+    )
+    for chunk in export_corpus(indexer, filters, args.format, compress=args.gzip):
+        stream.write(chunk)
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    args = parse_args(argv)
+    restore_index()
+    if args.output == "-":
+        write_export(sys.stdout.buffer, args)
+        sys.stdout.buffer.flush()
+        return
+    with Path(args.output).open("wb") as stream:
+        write_export(stream, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,53 +2,303 @@
 from __future__ import annotations
 
 import argparse
+import io
 import json
+import logging
+import os
+import tempfile
+import time
+from contextlib import suppress
+from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, BinaryIO, Iterable, Iterator, Optional, TextIO, Tuple
 
 from backend.app.api.v1.corpus import sync_document
+from backend.app.config import settings
 from backend.app.models.corpus import Document
+from backend.app.search.indexer import CorpusIndexer
+from backend.app.services.alignment import AlignmentService
+from backend.app.services.translation_memory import TranslationMemory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = 5.0
+_READ_CHUNK_SIZE = 1 << 16
+_JSONL_SUFFIXES = {".jsonl", ".ndjson"}
+
+
+@dataclass
+class Checkpoint:
+    """Position of the last document whose ingestion was committed.
+
+    ``offset`` counts the committed documents and ``position`` is the byte offset where the last
+    of them starts in the file, so a resumed run can seek straight to it.
+    """
+
+    offset: int = 0
+    identifier: Optional[str] = None
+    position: Optional[int] = None
+
+    @classmethod
+    def load(cls, path: Path) -> "Checkpoint":
+        if not path.exists():
+            return cls()
+        data = json.loads(path.read_text(encoding="utf-8"))
+        position = data.get("position")
+        return cls(
+            offset=int(data.get("offset", 0)),
+            identifier=data.get("identifier"),
+            position=int(position) if position is not None else None,
+        )
+
+    def save(self, path: Path) -> None:
+        temp_path: Path | None = None
+        try:
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, delete=False) as temp_file:
+                temp_path = Path(temp_file.name)
+                json.dump(asdict(self), temp_file)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            temp_path.replace(path)
+        except Exception:
+            if temp_path is not None:
+                with suppress(OSError):
+                    temp_path.unlink(missing_ok=True)
+            raise
 
 
 def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Load bilingual legal corpus from JSON file")
-    parser.add_argument("path", type=Path, help="Path to JSON file containing documents")
-    return parser.parse_args(argv)
+    parser = argparse.ArgumentParser(description="Load bilingual legal corpus from a JSON array or JSONL file")
+    parser.add_argument("path", type=Path, help="Path to JSON or JSONL file containing documents")
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="Checkpoint file recording the last committed document (defaults to <path>.checkpoint)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue from the last committed checkpoint; earlier documents are only kept with APP_CORPUS_STORAGE=sql",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Number of documents ingested between checkpoint commits",
+    )
+    parser.add_argument(
+        "--flush-interval",
+        type=float,
+        default=DEFAULT_FLUSH_INTERVAL,
+        help="Maximum number of seconds between checkpoint commits",
+    )
+    args = parser.parse_args(argv)
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    return args
+
+
+def _iter_jsonl(fp: BinaryIO, start: int = 0) -> Iterator[Tuple[int, dict[str, Any]]]:
+    position = start
+    for raw in fp:
+        line = raw.strip()
+        if line:
+            yield position, json.loads(line)
+        position += len(raw)
+
+
+def _iter_json_array(
+    fp: TextIO, chunk_size: int = _READ_CHUNK_SIZE, *, start: Optional[int] = None
+) -> Iterator[Tuple[int, dict[str, Any]]]:
+    """Incrementally decode the elements of a top-level JSON array with the byte offset of each.
+
+    With ``start`` the stream is positioned at byte ``start`` inside the array, at or before an element.
+    """
+
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    started = start is not None
+    # Bytes of the text before buffer[counted]; only newly consumed text is encoded to advance it.
+    consumed = start or 0
+    counted = 0
+
+    def fill(size: int = chunk_size) -> bool:
+        nonlocal buffer, position, eof, counted
+        chunk = fp.read(size)
+        if not chunk:
+            eof = True
+            return False
+        count(position)
+        buffer = buffer[position:] + chunk
+        position = counted = 0
+        return True
+
+    def count(upto: int) -> None:
+        nonlocal consumed, counted
+        consumed += len(buffer[counted:upto].encode("utf-8"))
+        counted = upto
+
+    while True:
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            if buffer[position] == "," and not started:
+                raise ValueError("Corpus file is not a JSON array")
+            position += 1
+        if position >= len(buffer):
+            if eof or not fill():
+                raise ValueError("Unexpected end of corpus file")
+            continue
+        if not started:
+            if buffer[position] != "[":
+                raise ValueError("Corpus file is not a JSON array")
+            started = True
+            position += 1
+            continue
+        if buffer[position] == "]":
+            return
+        try:
+            entry, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # Grow the read size with the pending element so huge documents decode in O(n).
+            if eof or not fill(max(chunk_size, len(buffer) - position)):
+                raise
+            continue
+        count(position)
+        entry_start = consumed
+        position = end
+        yield entry_start, entry
+
+
+def iter_positioned_entries(path: Path, start: int = 0) -> Iterator[Tuple[int, dict[str, Any]]]:
+    """Yield ``(byte offset, entry)`` pairs from a JSON array or JSONL file, beginning at byte ``start``.
+
+    A non-zero ``start`` must be an offset previously yielded for the same file.
+    """
+
+    with path.open("rb") as fp:
+        head = fp.read(_READ_CHUNK_SIZE)
+        is_array = path.suffix.lower() not in _JSONL_SUFFIXES and head.lstrip().startswith(b"[")
+        fp.seek(start)
+        if not is_array:
+            yield from _iter_jsonl(fp, start)
+            return
+        text = io.TextIOWrapper(fp, encoding="utf-8")
+        yield from _iter_json_array(text, start=start or None)
+
+
+def iter_entries(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield raw document entries one at a time from a JSON array or JSONL file."""
+
+    for _, entry in iter_positioned_entries(path):
+        yield entry
+
+
+def build_document(entry: dict[str, Any]) -> Document:
+    publication_date = None
+    if entry.get("publication_date"):
+        publication_date = datetime.fromisoformat(entry["publication_date"]).date()
+    return Document(
+        identifier=entry["identifier"],
+        title=entry["title"],
+        source_language=entry["source_language"],
+        target_language=entry["target_language"],
+        source=entry.get("source", "unknown"),
+        publication_date=publication_date,
+        official_url=entry.get("official_url"),
+        categories=entry.get("categories", []),
+    )
 
 
 def load_documents(path: Path) -> list[Document]:
-    data = json.loads(path.read_text(encoding="utf-8"))
-    documents: list[Document] = []
-    for entry in data:
-        publication_date = None
-        if entry.get("publication_date"):
-            publication_date = datetime.fromisoformat(entry["publication_date"]).date()
-        document = Document(
-            identifier=entry["identifier"],
-            title=entry["title"],
-            source_language=entry["source_language"],
-            target_language=entry["target_language"],
-            source=entry.get("source", "unknown"),
-            publication_date=publication_date,
-            official_url=entry.get("official_url"),
-            categories=entry.get("categories", []),
-        )
-        documents.append(document)
-    return documents
+    return [build_document(entry) for entry in iter_entries(path)]
 
 
-def main(argv: Iterable[str] | None = None) -> None:
-    args = parse_args(argv)
-    entries = json.loads(args.path.read_text(encoding="utf-8"))
-    documents = load_documents(args.path)
-    for entry, document in zip(entries, documents):
+def default_checkpoint_path(path: Path) -> Path:
+    return path.with_name(path.name + ".checkpoint")
+
+
+def ingest(
+    path: Path,
+    *,
+    checkpoint_path: Path | None = None,
+    resume: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    indexer: CorpusIndexer | None = None,
+    alignment_service: AlignmentService | None = None,
+    translation_memory: TranslationMemory | None = None,
+) -> int:
+    """Stream documents from ``path`` into the corpus, committing checkpoints as it goes.
+
+    Documents go to the given index and services, or to the process-wide ones by default.
+    Returns the number of documents ingested by this run.
+    """
+
+    checkpoint_path = checkpoint_path or default_checkpoint_path(path)
+    checkpoint = Checkpoint.load(checkpoint_path) if resume else Checkpoint()
+    committed = Checkpoint(offset=checkpoint.offset, identifier=checkpoint.identifier, position=checkpoint.position)
+    pending = 0
+    ingested = 0
+    last_flush = time.monotonic()
+
+    if checkpoint.offset and checkpoint.position is not None:
+        # Seek to the last committed document, which is re-read only to verify the checkpoint.
+        entries = iter_positioned_entries(path, checkpoint.position)
+        first = checkpoint.offset - 1
+    else:
+        entries = iter_positioned_entries(path)
+        first = 0
+    for offset, (position, entry) in enumerate(entries, start=first):
+        if offset < checkpoint.offset:
+            if offset == checkpoint.offset - 1 and checkpoint.identifier not in (None, entry.get("identifier")):
+                raise ValueError(
+                    f"Checkpoint {checkpoint_path} does not match {path}: expected document "
+                    f"{checkpoint.identifier!r} at offset {offset}"
+                )
+            continue
+        document = build_document(entry)
         sync_document(
             document,
             source_text=entry.get("source_text", ""),
             target_text=entry.get("target_text", ""),
             category=entry.get("category"),
+            indexer=indexer,
+            alignment_service=alignment_service,
+            translation_memory=translation_memory,
+        )
+        committed.offset = offset + 1
+        committed.identifier = document.identifier
+        committed.position = position
+        pending += 1
+        ingested += 1
+        if pending >= batch_size or time.monotonic() - last_flush >= flush_interval:
+            committed.save(checkpoint_path)
+            pending = 0
+            last_flush = time.monotonic()
+
+    if pending:
+        committed.save(checkpoint_path)
+    return ingested
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    args = parse_args(argv)
+    if args.resume and settings.corpus_storage != "sql":
+        logger.warning(
+            "Resuming without APP_CORPUS_STORAGE=sql: documents ingested by earlier runs are not "
+            "reloaded into this process's index, only the remaining ones are added"
         )
+    ingest(
+        args.path,
+        checkpoint_path=args.checkpoint,
+        resume=args.resume,
+        batch_size=args.batch_size,
+        flush_interval=args.flush_interval,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,86 @@
+"""Management command to build the corpus index and terms and publish them for shared use.
+
+Uvicorn workers started with ``APP_SHARED_INDEX_DIR`` attach to the published files instead
+of building their own index, and switch to each new generation this command publishes.
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Iterable
+
+from backend.app.config import settings
+from backend.app.core.normalization import NormalizationOptions
+from backend.app.models.terms import TermsRepository
+from backend.app.search.indexer import CorpusIndexer
+from backend.app.search.shared import DEFAULT_KEEP_GENERATIONS, SharedIndexDirectory
+from backend.app.services.alignment import AlignmentService
+from backend.app.services.translation_memory import TranslationMemory
+
+_DEFAULT_TERMS_PATH = Path(__file__).resolve().parents[2] / "data" / "terms.json"
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Publish the corpus index and terms for shared-memory workers")
+    parser.add_argument(
+        "directory",
+        type=Path,
+        nargs="?",
+        default=Path(settings.shared_index_dir) if settings.shared_index_dir else None,
+        help="Directory to publish into (defaults to APP_SHARED_INDEX_DIR)",
+    )
+    parser.add_argument(
+        "--corpus",
+        type=Path,
+        default=None,
+        help="JSON or JSONL corpus to align and index; without it the configured corpus storage is used",
+    )
+    parser.add_argument("--terms", type=Path, default=_DEFAULT_TERMS_PATH, help="Terms JSON file to publish")
+    parser.add_argument(
+        "--keep",
+        type=int,
+        default=DEFAULT_KEEP_GENERATIONS,
+        help="Number of generations to keep on disk for workers that have not switched yet",
+    )
+    args = parser.parse_args(argv)
+    if args.directory is None:
+        parser.error("a directory is required when APP_SHARED_INDEX_DIR is not set")
+    return args
+
+
+def publish(directory: Path, corpus: Path | None, terms_path: Path, keep: int = DEFAULT_KEEP_GENERATIONS) -> int:
+    """Build everything in this process and publish it as a new generation."""
+
+    from backend.app.api.v1.corpus import build_alignment_repository
+    from backend.app.management.load_corpus import ingest
+
+    # The builder indexes into a private in-memory index; only the workers read the shared files.
+    options = NormalizationOptions.from_settings(settings)
+    indexer = CorpusIndexer(options)
+    alignment_service = AlignmentService(build_alignment_repository())
+    load_into = getattr(alignment_service.repository, "load_into", None)
+    if load_into is not None:
+        load_into(indexer)
+    if corpus is not None:
+        ingest(
+            corpus,
+            checkpoint_path=directory / "publish.checkpoint",
+            indexer=indexer,
+            alignment_service=alignment_service,
+            # Workers build their own translation memory from the published alignments.
+            translation_memory=TranslationMemory(options=options),
+        )
+        (directory / "publish.checkpoint").unlink(missing_ok=True)
+    terms = TermsRepository(terms_path, options).load_terms()
+    return SharedIndexDirectory(directory).publish(indexer.iter_entries(), terms, options, keep)
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    args = parse_args(argv)
+    args.directory.mkdir(parents=True, exist_ok=True)
+    generation = publish(args.directory, args.corpus, args.terms, args.keep)
+    print(f"Published generation {generation} to {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""SQLAlchemy table models backing persistent corpus storage."""
+from __future__ import annotations
+
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import JSON, Date, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+
+class Base(DeclarativeBase):
+    """Declarative base shared by all persistent models."""
+
+
+class DocumentRecord(Base):
+    __tablename__ = "documents"
+
+    identifier: Mapped[str] = mapped_column(String(255), primary_key=True)
+    title: Mapped[str] = mapped_column(Text)
+    source_language: Mapped[str] = mapped_column(String(16))
+    target_language: Mapped[str] = mapped_column(String(16))
+    source: Mapped[str] = mapped_column(Text)
+    publication_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    official_url: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    categories: Mapped[list[str]] = mapped_column(JSON, default=list)
+    fingerprint: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+
+
+class ParagraphRecord(Base):
+    __tablename__ = "paragraphs"
+    __table_args__ = (Index("ix_paragraphs_document_order", "document_id", "order"),)
+
+    identifier: Mapped[str] = mapped_column(String(255), primary_key=True)
+    document_id: Mapped[str] = mapped_column(
+        String(255), ForeignKey("documents.identifier", ondelete="CASCADE")
+    )
+    order: Mapped[int] = mapped_column(Integer)
+    language: Mapped[str] = mapped_column(String(16))
+    text: Mapped[str] = mapped_column(Text)
+
+
+class AlignmentRecord(Base):
+    __tablename__ = "alignments"
+    __table_args__ = (Index("ix_alignments_document_position", "document_id", "position", unique=True),)
+
+    identifier: Mapped[str] = mapped_column(String(36), primary_key=True)
+    document_id: Mapped[str] = mapped_column(
+        String(255), ForeignKey("documents.identifier", ondelete="CASCADE")
+    )
+    position: Mapped[int] = mapped_column(Integer)
+    source_sentence: Mapped[str] = mapped_column(Text)
+    target_sentence: Mapped[str] = mapped_column(Text)
+    source_language: Mapped[str] = mapped_column(String(16))
+    target_language: Mapped[str] = mapped_column(String(16))
+    score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    source_paragraph: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    target_paragraph: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+
+__all__ = ["Base", "DocumentRecord", "ParagraphRecord", "AlignmentRecord"]
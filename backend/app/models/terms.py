@@ -5,13 +5,21 @@ from __future__ import annotations
 import json
 import os
 import tempfile
+import threading
 from contextlib import suppress
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator
 
 from pydantic import BaseModel, Field, field_validator
 
+from backend.app.core.metrics import record_cache, timed
+from backend.app.core.normalization import DEFAULT_OPTIONS, NormalizationOptions, normalize
+from backend.app.core.profiling import QueryProfile, phase
+
+# Separates the searchable fields of a term inside its normalized search blob.
+FIELD_SEPARATOR = "\x1f"
+
 
 def _strip_text(value: str | None) -> str | None:
     if isinstance(value, str):
@@ -93,26 +101,94 @@ class TermMergeResult:
     total: int
 
 
+def _iter_fields(term: Term) -> Iterator[str]:
+    yield term.headword
+    yield term.definitions.zh
+    yield term.definitions.en
+    yield term.definitions.bn
+    for usage in term.usages:
+        yield usage.chinese
+        yield usage.english
+        yield usage.bengali
+        if usage.explanation:
+            yield usage.explanation
+        if usage.source:
+            yield usage.source
+        if usage.article:
+            yield usage.article
+        if usage.contexts.zh:
+            yield usage.contexts.zh
+        if usage.contexts.en:
+            yield usage.contexts.en
+        if usage.contexts.bn:
+            yield usage.contexts.bn
+
+
+def term_search_text(term: Term, options: NormalizationOptions = DEFAULT_OPTIONS) -> str:
+    """Normalized text a term is searched by: its fields joined by :data:`FIELD_SEPARATOR`."""
+
+    return normalize(FIELD_SEPARATOR.join(_iter_fields(term)), options)
+
+
 class TermsRepository:
-    """JSON-backed persistence layer for legal terms."""
+    """JSON-backed persistence layer for legal terms.
+
+    Parsed terms and their normalized search text are cached until the storage file changes.
+    """
 
-    def __init__(self, storage_path: Path) -> None:
+    def __init__(self, storage_path: Path, options: NormalizationOptions = DEFAULT_OPTIONS) -> None:
         self.storage_path = storage_path
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        self.options = options
+        self._cache: tuple[tuple[int, int], list[Term], list[str]] | None = None
+        self._lock = threading.Lock()
 
+    def _load_index(self, profile: QueryProfile | None = None) -> tuple[list[Term], list[str]]:
+        try:
+            stat = self.storage_path.stat()
+        except FileNotFoundError:
+            return [], []
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._cache
+            hit = cached is not None and cached[0] == key
+            record_cache("terms", hit)
+            if profile is not None:
+                profile.count("cache_hits" if hit else "cache_misses")
+            if hit:
+                return cached[1], cached[2]
+
+            try:
+                with self.storage_path.open("r", encoding="utf-8") as fp:
+                    data = json.load(fp)
+            except json.JSONDecodeError as exc:  # pragma: no cover - defensive
+                raise ValueError("Stored terms file is not valid JSON") from exc
+
+            terms = [Term.model_validate(item) for item in data]
+            blobs = [term_search_text(term, self.options) for term in terms]
+            self._cache = (key, terms, blobs)
+            return terms, blobs
+
+    def preload(self) -> int:
+        """Parse and normalize the stored terms ahead of the first search, returning their count."""
+
+        terms, _ = self._load_index()
+        return len(terms)
+
+    def stats(self) -> dict[str, int]:
+        """Size of the loaded terms; zeros until they have been read."""
+
+        cached = self._cache
+        if cached is None:
+            return {"terms": 0, "bytes": 0}
+        return {"terms": len(cached[1]), "bytes": cached[0][1]}
+
+    @timed()
     def load_terms(self) -> list[Term]:
         """Load all terms from the JSON storage, returning an empty list if missing."""
 
-        if not self.storage_path.exists():
-            return []
-
-        try:
-            with self.storage_path.open("r", encoding="utf-8") as fp:
-                data = json.load(fp)
-        except json.JSONDecodeError as exc:  # pragma: no cover - defensive
-            raise ValueError("Stored terms file is not valid JSON") from exc
-
-        return [Term.model_validate(item) for item in data]
+        terms, _ = self._load_index()
+        return list(terms)
 
     def save_terms(self, terms: Iterable[Term]) -> None:
         """Persist the provided terms back to storage."""
@@ -131,6 +207,8 @@ class TermsRepository:
 
             assert temp_path is not None
             temp_path.replace(self.storage_path)
+            with self._lock:
+                self._cache = None
         except Exception:
             if temp_path is not None:
                 with suppress(OSError):
@@ -155,48 +233,57 @@ class TermsRepository:
         self.save_terms(existing_terms)
         return TermMergeResult(added=added, total=len(existing_terms))
 
-    def search(self, query: str | None) -> list[Term]:
-        """Perform a case-insensitive substring search across headword, definitions and usages."""
+    @timed()
+    def search(self, query: str | None, profile: QueryProfile | None = None) -> list[Term]:
+        """Perform a normalized substring search across headword, definitions and usages."""
 
-        all_terms = self.load_terms()
+        with phase(profile, "load"):
+            terms, blobs = self._load_index(profile)
         if not query:
-            return all_terms
-
-        normalized = query.casefold()
-
-        def iter_fields(term: Term) -> Iterable[str]:
-            yield term.headword
-            yield term.definitions.zh
-            yield term.definitions.en
-            yield term.definitions.bn
-            for usage in term.usages:
-                yield usage.chinese
-                yield usage.english
-                yield usage.bengali
-                if usage.explanation:
-                    yield usage.explanation
-                if usage.source:
-                    yield usage.source
-                if usage.article:
-                    yield usage.article
-                if usage.contexts.zh:
-                    yield usage.contexts.zh
-                if usage.contexts.en:
-                    yield usage.contexts.en
-                if usage.contexts.bn:
-                    yield usage.contexts.bn
-
-        def matches(term: Term) -> bool:
-            return any(normalized in field.casefold() for field in iter_fields(term))
-
-        return [term for term in all_terms if matches(term)]
+            return list(terms)
+
+        with phase(profile, "normalize"):
+            normalized = normalize(query, self.options)
+        if not normalized or FIELD_SEPARATOR in normalized:
+            return []
+        with phase(profile, "match"):
+            matches = [term for term, blob in zip(terms, blobs) if normalized in blob]
+        if profile is not None:
+            profile.count("candidates_examined", len(terms))
+            profile.count("postings_read", len(blobs))
+            profile.count("hits_scored", len(matches))
+        return matches
+
+    @timed()
+    def search_many(self, queries: Iterable[str | None]) -> dict[str | None, list[Term]]:
+        """Search every distinct query against one loaded snapshot of the terms, keyed by query.
+
+        Queries that normalize to the same text are matched once and share their result list.
+        """
+
+        terms, blobs = self._load_index()
+        by_normalized: dict[str | None, list[Term]] = {}
+        results: dict[str | None, list[Term]] = {}
+        for query in dict.fromkeys(queries):
+            normalized = normalize(query, self.options) if query else None
+            if normalized not in by_normalized:
+                if normalized is None:
+                    by_normalized[normalized] = list(terms)
+                elif not normalized or FIELD_SEPARATOR in normalized:
+                    by_normalized[normalized] = []
+                else:
+                    by_normalized[normalized] = [term for term, blob in zip(terms, blobs) if normalized in blob]
+            results[query] = by_normalized[normalized]
+        return results
 
 
 __all__ = [
+    "FIELD_SEPARATOR",
     "Term",
     "TermDefinition",
     "TermContext",
     "TermUsage",
     "TermMergeResult",
     "TermsRepository",
+    "term_search_text",
 ]
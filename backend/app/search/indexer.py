@@ -3,10 +3,23 @@ from __future__ import annotations
 
 import itertools
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, List, Optional
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from backend.app.core.metrics import timed
+from backend.app.core.normalization import (
+    DEFAULT_OPTIONS,
+    NormalizationOptions,
+    NormalizedText,
+    normalize,
+    normalize_with_offsets,
+)
+from backend.app.core.profiling import QueryProfile, phase
+from backend.app.core.workers import Deadline
 from backend.app.models.corpus import Document, Paragraph, SentenceAlignment
 
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from backend.app.config import Settings
+
 
 @dataclass
 class SearchHit:
@@ -14,6 +27,8 @@ class SearchHit:
     paragraph: Optional[Paragraph]
     alignment: Optional[SentenceAlignment]
     score: float
+    normalized: Optional[NormalizedText] = None
+    query: str = ""
 
 
 @dataclass
@@ -23,10 +38,60 @@ class CorpusIndex:
     settings: Dict[str, str] = field(default_factory=dict)
 
 
+def alignment_text(alignment: SentenceAlignment, options: NormalizationOptions = DEFAULT_OPTIONS) -> NormalizedText:
+    """Normalized ``"source target"`` text that an alignment is searched by."""
+
+    originals = [alignment.source_sentence, alignment.target_sentence]
+    return NormalizedText.join([normalize_with_offsets(text, options) for text in originals], originals)
+
+
+def highlight_spans(
+    normalized: Optional[NormalizedText],
+    query: str,
+    alignment: Optional[SentenceAlignment] = None,
+) -> Dict[str, List[List[int]]]:
+    """Original-text ``[start, end)`` spans of the normalized query, per rendered field."""
+
+    spans = normalized.find_spans(query) if normalized is not None else []
+    if alignment is None:
+        return {"text": [[start, end] for start, end in spans]}
+    # Alignment text is "source target"; split spans at the joining space.
+    boundary = len(alignment.source_sentence)
+    source: List[List[int]] = []
+    target: List[List[int]] = []
+    for start, end in spans:
+        if start < boundary:
+            source.append([start, min(end, boundary)])
+        if end > boundary + 1:
+            target.append([max(start - boundary - 1, 0), end - boundary - 1])
+    return {"source_sentence": source, "target_sentence": target}
+
+
+def render_hit(hit: SearchHit) -> dict:
+    return {
+        "document_id": hit.document.identifier,
+        "title": hit.document.title,
+        "language_pair": f"{hit.document.source_language}-{hit.document.target_language}",
+        "paragraph_id": hit.paragraph.identifier if hit.paragraph else None,
+        "alignment_id": hit.alignment.identifier if hit.alignment else None,
+        "text": hit.paragraph.text if hit.paragraph else None,
+        "source_sentence": hit.alignment.source_sentence if hit.alignment else None,
+        "target_sentence": hit.alignment.target_sentence if hit.alignment else None,
+        "score": hit.score,
+        "official_url": hit.document.official_url,
+        "publication_date": hit.document.publication_date.isoformat() if hit.document.publication_date else None,
+        "highlights": highlight_spans(hit.normalized, hit.query, hit.alignment),
+    }
+
+
 class CorpusIndexer:
-    """In-memory search index with an Elasticsearch-like interface."""
+    """In-memory search index with an Elasticsearch-like interface.
 
-    def __init__(self) -> None:
+    Text is normalized once when a document is indexed; queries go through the same
+    pipeline, configured by ``options`` and recorded in the index settings.
+    """
+
+    def __init__(self, options: NormalizationOptions = DEFAULT_OPTIONS) -> None:
         self.index = CorpusIndex(
             name="corpus",
             mappings={
@@ -36,11 +101,16 @@ class CorpusIndexer:
                 "text": "text",
                 "year": "integer",
             },
-            settings={"analysis": "standard"},
+            settings={"analysis": "standard", **options.as_metadata()},
         )
+        self.options = options
         self._documents: Dict[str, Document] = {}
         self._paragraphs: Dict[str, List[Paragraph]] = {}
         self._alignments: Dict[str, List[SentenceAlignment]] = {}
+        self._normalized: Dict[str, Tuple[List[NormalizedText], List[NormalizedText]]] = {}
+        # document id -> (paragraphs, alignments, UTF-8 bytes of indexed text)
+        self._sizes: Dict[str, Tuple[int, int, int]] = {}
+        self._totals = [0, 0, 0]
 
     def index_document(
         self,
@@ -48,10 +118,35 @@ class CorpusIndexer:
         paragraphs: Iterable[Paragraph],
         alignments: Iterable[SentenceAlignment],
     ) -> None:
+        paragraphs = list(paragraphs)
+        alignments = list(alignments)
         self._documents[document.identifier] = document
-        self._paragraphs[document.identifier] = list(paragraphs)
-        self._alignments[document.identifier] = list(alignments)
+        self._paragraphs[document.identifier] = paragraphs
+        self._alignments[document.identifier] = alignments
+        self._normalized[document.identifier] = (
+            [normalize_with_offsets(paragraph.text, self.options) for paragraph in paragraphs],
+            [alignment_text(alignment, self.options) for alignment in alignments],
+        )
+        size = (
+            len(paragraphs),
+            len(alignments),
+            sum(len(paragraph.text.encode("utf-8")) for paragraph in paragraphs)
+            + sum(
+                len(alignment.source_sentence.encode("utf-8")) + len(alignment.target_sentence.encode("utf-8"))
+                for alignment in alignments
+            ),
+        )
+        previous = self._sizes.get(document.identifier, (0, 0, 0))
+        self._sizes[document.identifier] = size
+        self._totals = [total + new - old for total, new, old in zip(self._totals, size, previous)]
+
+    def update_document(self, document: Document) -> None:
+        """Replace the metadata of an indexed document without touching its text."""
+
+        if document.identifier in self._documents:
+            self._documents[document.identifier] = document
 
+    @timed()
     def search(
         self,
         query: str,
@@ -60,67 +155,138 @@ class CorpusIndexer:
         year: Optional[int] = None,
         page: int = 1,
         page_size: int = 10,
+        deadline: Optional[Deadline] = None,
+        profile: Optional[QueryProfile] = None,
     ) -> dict:
-        hits: List[SearchHit] = []
-        query_lower = query.lower()
-        for document_id, document in self._documents.items():
-            if category and category not in document.categories:
-                continue
-            if year and document.publication_date and document.publication_date.year != year:
-                continue
-            paragraphs = self._paragraphs.get(document_id, [])
-            alignments = self._alignments.get(document_id, [])
-            for paragraph in paragraphs:
-                text = paragraph.text.lower()
-                if query_lower in text:
-                    hits.append(
-                        SearchHit(
-                            document=document,
-                            paragraph=paragraph,
-                            alignment=None,
-                            score=text.count(query_lower),
-                        )
-                    )
-            for alignment in alignments:
-                text = f"{alignment.source_sentence} {alignment.target_sentence}".lower()
-                if query_lower in text:
-                    hits.append(
-                        SearchHit(
-                            document=document,
-                            paragraph=None,
-                            alignment=alignment,
-                            score=text.count(query_lower) + 0.5,
-                        )
-                    )
-        hits.sort(key=lambda hit: hit.score, reverse=True)
+        hits = self.collect_hits(query, category=category, year=year, deadline=deadline, profile=profile)
+        with phase(profile, "sort"):
+            hits.sort(key=lambda hit: hit.score, reverse=True)
         total = len(hits)
         start = (page - 1) * page_size
         end = start + page_size
         paginated = hits[start:end]
+        with phase(profile, "serialize"):
+            items = [render_hit(hit) for hit in paginated]
+        if profile is not None:
+            profile.count("objects_materialized", len(items))
         return {
             "total": total,
             "page": page,
             "page_size": page_size,
-            "items": [
-                {
-                    "document_id": hit.document.identifier,
-                    "title": hit.document.title,
-                    "language_pair": f"{hit.document.source_language}-{hit.document.target_language}",
-                    "paragraph_id": hit.paragraph.identifier if hit.paragraph else None,
-                    "alignment_id": hit.alignment.identifier if hit.alignment else None,
-                    "text": hit.paragraph.text if hit.paragraph else None,
-                    "source_sentence": hit.alignment.source_sentence if hit.alignment else None,
-                    "target_sentence": hit.alignment.target_sentence if hit.alignment else None,
-                    "score": hit.score,
-                    "official_url": hit.document.official_url,
-                    "publication_date": hit.document.publication_date.isoformat() if hit.document.publication_date else None,
-                }
-                for hit in paginated
-            ],
+            "items": items,
         }
 
+    def collect_hits(
+        self,
+        query: str,
+        *,
+        category: Optional[str] = None,
+        year: Optional[int] = None,
+        deadline: Optional[Deadline] = None,
+        profile: Optional[QueryProfile] = None,
+    ) -> List[SearchHit]:
+        """Return unsorted hits in document insertion order.
+
+        Raises :class:`~backend.app.core.workers.DeadlineExceeded` once ``deadline`` passes.
+        """
+
+        normalized_query = normalize(query, self.options)
+        hits: List[SearchHit] = []
+        candidates = postings = 0
+        # Filtering, matching and scoring share one pass, so a profile times them together as "match".
+        with phase(profile, "match"):
+            for document_id, document in self._documents.items():
+                if deadline is not None:
+                    deadline.check()
+                if category and category not in document.categories:
+                    continue
+                if year and document.publication_date and document.publication_date.year != year:
+                    continue
+                paragraph_texts, alignment_texts = self._normalized.get(document_id, ([], []))
+                if profile is not None:
+                    candidates += 1
+                    postings += len(paragraph_texts) + len(alignment_texts)
+                for paragraph, normalized in zip(self._paragraphs.get(document_id, []), paragraph_texts):
+                    if normalized_query in normalized.text:
+                        hits.append(
+                            SearchHit(
+                                document=document,
+                                paragraph=paragraph,
+                                alignment=None,
+                                score=normalized.text.count(normalized_query),
+                                normalized=normalized,
+                                query=normalized_query,
+                            )
+                        )
+                for alignment, normalized in zip(self._alignments.get(document_id, []), alignment_texts):
+                    if normalized_query in normalized.text:
+                        hits.append(
+                            SearchHit(
+                                document=document,
+                                paragraph=None,
+                                alignment=alignment,
+                                score=normalized.text.count(normalized_query) + 0.5,
+                                normalized=normalized,
+                                query=normalized_query,
+                            )
+                        )
+        if profile is not None:
+            profile.count("candidates_examined", candidates)
+            profile.count("postings_read", postings)
+            profile.count("hits_scored", len(hits))
+        return hits
+
     def get_document(self, document_id: str) -> Optional[Document]:
         return self._documents.get(document_id)
 
     def get_alignments(self, document_id: str) -> List[SentenceAlignment]:
         return list(self._alignments.get(document_id, []))
+
+    def get_documents(self, document_ids: Iterable[str]) -> Dict[str, Tuple[Document, List[SentenceAlignment]]]:
+        """Return the documents found among ``document_ids`` with their alignments, keyed by id."""
+
+        found = {}
+        for document_id in dict.fromkeys(document_ids):
+            document = self._documents.get(document_id)
+            if document is not None:
+                found[document_id] = (document, list(self._alignments.get(document_id, [])))
+        return found
+
+    def iter_documents(self) -> Iterator[Document]:
+        """Yield indexed documents in insertion order."""
+
+        yield from list(self._documents.values())
+
+    def iter_entries(self) -> Iterator[Tuple[Document, List[Paragraph], List[SentenceAlignment]]]:
+        """Yield each document with its paragraphs and alignments, in insertion order."""
+
+        for document_id, document in list(self._documents.items()):
+            yield document, list(self._paragraphs.get(document_id, [])), list(self._alignments.get(document_id, []))
+
+    def stats(self) -> Dict[str, int]:
+        paragraphs, alignments, text_bytes = self._totals
+        return {"documents": len(self._documents), "paragraphs": paragraphs, "alignments": alignments, "bytes": text_bytes}
+
+
+def create_indexer(settings: Optional["Settings"] = None):
+    """Build the search backend selected by ``Settings.search_backend``."""
+
+    if settings is None:
+        from backend.app.config import get_settings
+
+        settings = get_settings()
+    if settings.shared_index_dir:
+        from backend.app.search.shared import SharedCorpusIndexer
+
+        # Normalization options come from the published files, not from these settings.
+        return SharedCorpusIndexer(settings.shared_index_dir, settings.shared_index_refresh_seconds)
+    options = NormalizationOptions.from_settings(settings)
+    if settings.search_backend == "sqlite":
+        from backend.app.search.sqlite import SqliteCorpusIndexer
+
+        return SqliteCorpusIndexer(settings.search_sqlite_path, options=options)
+    if settings.search_shards > 1:
+        from backend.app.search.sharded import ShardedCorpusIndexer
+
+        return ShardedCorpusIndexer(settings.search_shards, options=options)
+    return CorpusIndexer(options)
@@ -0,0 +1,115 @@
+"""JSON record encoding shared by the persistent corpus index backends.
+
+The SQLite and shared-file indexes store each document, paragraph and alignment as the
+same JSON payload, tag entries as :data:`PARAGRAPH` or :data:`ALIGNMENT`, and render
+stored entries exactly as :func:`~backend.app.search.indexer.render_hit` renders a hit.
+"""
+from __future__ import annotations
+
+import json
+from datetime import date
+
+from backend.app.core.normalization import NormalizationOptions, normalize_with_offsets
+from backend.app.models.corpus import Document, Paragraph, SentenceAlignment
+from backend.app.search.indexer import alignment_text, highlight_spans
+
+PARAGRAPH = 0
+ALIGNMENT = 1
+
+
+def document_payload(document: Document) -> str:
+    return json.dumps(
+        {
+            "identifier": document.identifier,
+            "title": document.title,
+            "source_language": document.source_language,
+            "target_language": document.target_language,
+            "source": document.source,
+            "publication_date": document.publication_date.isoformat() if document.publication_date else None,
+            "official_url": document.official_url,
+            "categories": list(document.categories),
+        },
+        ensure_ascii=False,
+    )
+
+
+def load_document(payload: str) -> Document:
+    data = json.loads(payload)
+    publication_date = data.pop("publication_date")
+    return Document(
+        **data,
+        publication_date=date.fromisoformat(publication_date) if publication_date else None,
+    )
+
+
+def alignment_payload(alignment: SentenceAlignment) -> str:
+    return json.dumps(
+        {
+            "identifier": alignment.identifier,
+            "document_id": alignment.document_id,
+            "source_sentence": alignment.source_sentence,
+            "target_sentence": alignment.target_sentence,
+            "source_language": alignment.source_language,
+            "target_language": alignment.target_language,
+            "score": alignment.score,
+            "source_paragraph": alignment.source_paragraph,
+            "target_paragraph": alignment.target_paragraph,
+        },
+        ensure_ascii=False,
+    )
+
+
+def paragraph_payload(paragraph: Paragraph) -> str:
+    return json.dumps(
+        {
+            "identifier": paragraph.identifier,
+            "document_id": paragraph.document_id,
+            "order": paragraph.order,
+            "language": paragraph.language,
+            "text": paragraph.text,
+        },
+        ensure_ascii=False,
+    )
+
+
+def render_entry(
+    document: dict,
+    entry: dict,
+    kind: int,
+    score: float,
+    normalized_query: str,
+    options: NormalizationOptions,
+) -> dict:
+    """Render a stored paragraph or alignment payload the way ``render_hit`` renders a hit."""
+
+    is_alignment = kind == ALIGNMENT
+    if is_alignment:
+        alignment = SentenceAlignment(**entry)
+        highlights = highlight_spans(alignment_text(alignment, options), normalized_query, alignment)
+    else:
+        highlights = highlight_spans(normalize_with_offsets(entry["text"], options), normalized_query)
+    return {
+        "document_id": document["identifier"],
+        "title": document["title"],
+        "language_pair": f"{document['source_language']}-{document['target_language']}",
+        "paragraph_id": None if is_alignment else entry["identifier"],
+        "alignment_id": entry["identifier"] if is_alignment else None,
+        "text": None if is_alignment else entry["text"],
+        "source_sentence": entry["source_sentence"] if is_alignment else None,
+        "target_sentence": entry["target_sentence"] if is_alignment else None,
+        "score": score,
+        "official_url": document["official_url"],
+        "publication_date": document["publication_date"],
+        "highlights": highlights,
+    }
+
+
+__all__ = [
+    "ALIGNMENT",
+    "PARAGRAPH",
+    "alignment_payload",
+    "document_payload",
+    "load_document",
+    "paragraph_payload",
+    "render_entry",
+]
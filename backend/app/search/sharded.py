@@ -0,0 +1,359 @@
+"""Corpus index partitioned across worker processes."""
+from __future__ import annotations
+
+import heapq
+import itertools
+import multiprocessing
+import threading
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from multiprocessing.connection import Connection
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from backend.app.core.metrics import timed
+from backend.app.core.normalization import DEFAULT_OPTIONS, NormalizationOptions
+from backend.app.core.profiling import QueryProfile, phase
+from backend.app.core.workers import Deadline
+from backend.app.models.corpus import Document, Paragraph, SentenceAlignment
+from backend.app.search.indexer import CorpusIndex, CorpusIndexer, render_hit
+
+# (negated score, global document sequence, hit ordinal within the shard, rendered item)
+ShardHit = Tuple[float, int, int, dict]
+DEFAULT_THREADS_PER_SHARD = 4
+
+
+class _Shard:
+    """Worker-side state: one in-memory index plus the global order of its documents."""
+
+    def __init__(self, options: NormalizationOptions) -> None:
+        self.indexer = CorpusIndexer(options)
+        self.sequence: Dict[str, int] = {}
+
+    def index(self, document: Document, paragraphs: List[Paragraph], alignments: List[SentenceAlignment], sequence: int) -> None:
+        self.sequence.setdefault(document.identifier, sequence)
+        self.indexer.index_document(document, paragraphs, alignments)
+
+    def search(
+        self,
+        query: str,
+        category: Optional[str],
+        year: Optional[int],
+        limit: int,
+        deadline: Optional[Deadline] = None,
+        profiled: bool = False,
+    ) -> Tuple[int, List[ShardHit], Optional[QueryProfile]]:
+        profile = QueryProfile() if profiled else None
+        hits = self.indexer.collect_hits(query, category=category, year=year, deadline=deadline, profile=profile)
+        with phase(profile, "sort"):
+            keyed = (
+                (-hit.score, self.sequence[hit.document.identifier], ordinal, hit)
+                for ordinal, hit in enumerate(hits)
+            )
+            top = heapq.nsmallest(limit, keyed, key=lambda entry: entry[:3])
+        with phase(profile, "serialize"):
+            rendered = [(score, sequence, ordinal, render_hit(hit)) for score, sequence, ordinal, hit in top]
+        return len(hits), rendered, profile
+
+
+class _ReadWriteLock:
+    """Any number of readers or one writer; a waiting writer holds back new readers."""
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def reading(self) -> Iterator[None]:
+        with self._condition:
+            while self._writing or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writing or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+_WRITES = {"index", "update"}
+
+
+def _serve(connection: Connection, options: NormalizationOptions, threads: int) -> None:
+    shard = _Shard(options)
+    handlers = {
+        "index": shard.index,
+        "update": shard.indexer.update_document,
+        "search": shard.search,
+        "get_document": shard.indexer.get_document,
+        "get_alignments": shard.indexer.get_alignments,
+        "get_documents": shard.indexer.get_documents,
+        "size": lambda: len(shard.sequence),
+        "stats": shard.indexer.stats,
+        "documents": lambda: sorted(shard.sequence.items(), key=lambda item: item[1]),
+    }
+    guard = _ReadWriteLock()
+    send_lock = threading.Lock()
+
+    def reply(request_id: int, status: str, result: Any) -> None:
+        with send_lock:
+            connection.send((request_id, status, result))
+
+    def handle(request_id: int, operation: str, args: Tuple[Any, ...]) -> None:
+        try:
+            with guard.writing() if operation in _WRITES else guard.reading():
+                result = handlers[operation](*args)
+        except Exception as exc:  # pragma: no cover - forwarded to the coordinator
+            reply(request_id, "error", exc)
+        else:
+            reply(request_id, "ok", result)
+
+    # Requests run on a few threads, so a light query is not queued behind a heavy one.
+    with ThreadPoolExecutor(threads, thread_name_prefix="shard") as pool:
+        while True:
+            try:
+                request_id, operation, args = connection.recv()
+            except EOFError:
+                return
+            if operation == "stop":
+                pool.shutdown(wait=True)
+                reply(request_id, "ok", None)
+                return
+            pool.submit(handle, request_id, operation, args)
+
+
+class ShardedCorpusIndexer:
+    """Hash-partitions documents across worker processes and merges their search results.
+
+    Each query is scattered to every shard, which returns its hit count and local top-k;
+    the coordinator merges those into the same result the single-process indexer returns.
+    Requests carry ids and a reader thread per shard hands each reply to its caller, so
+    many queries can be in flight on every shard at once.
+    """
+
+    def __init__(
+        self,
+        shards: int,
+        *,
+        context: str = "spawn",
+        options: NormalizationOptions = DEFAULT_OPTIONS,
+        threads_per_shard: int = DEFAULT_THREADS_PER_SHARD,
+    ) -> None:
+        if shards < 1:
+            raise ValueError("At least one shard is required")
+        self.index = CorpusIndex(
+            name="corpus",
+            mappings={
+                "document_id": "keyword",
+                "language": "keyword",
+                "category": "keyword",
+                "text": "text",
+                "year": "integer",
+            },
+            settings={"analysis": "standard", "shards": str(shards), **options.as_metadata()},
+        )
+        self.options = options
+        mp_context = multiprocessing.get_context(context)
+        self._connections: List[Connection] = []
+        self._processes = []
+        self._readers: List[threading.Thread] = []
+        self._send_locks = [threading.Lock() for _ in range(shards)]
+        # shard -> request id -> caller waiting for the reply
+        self._pending: List[Dict[int, Future]] = [{} for _ in range(shards)]
+        self._pending_lock = threading.Lock()
+        self._request_ids = itertools.count()
+        self._sequence = itertools.count()
+        self._sequence_lock = threading.Lock()
+        for shard in range(shards):
+            parent, child = mp_context.Pipe()
+            process = mp_context.Process(target=_serve, args=(child, options, threads_per_shard), daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+            reader = threading.Thread(target=self._read_replies, args=(shard,), name=f"shard-{shard}-replies", daemon=True)
+            reader.start()
+            self._readers.append(reader)
+
+    @property
+    def shard_count(self) -> int:
+        return len(self._connections)
+
+    def shard_for(self, document_id: str) -> int:
+        return zlib.crc32(document_id.encode("utf-8")) % self.shard_count
+
+    def _read_replies(self, shard: int) -> None:
+        connection = self._connections[shard]
+        while True:
+            try:
+                request_id, status, result = connection.recv()
+            except (EOFError, OSError) as exc:
+                # The shard is gone; fail whoever is still waiting on it.
+                with self._pending_lock:
+                    waiting, self._pending[shard] = self._pending[shard], {}
+                for future in waiting.values():
+                    future.set_exception(ConnectionError(f"Shard {shard} stopped: {exc!r}"))
+                return
+            with self._pending_lock:
+                future = self._pending[shard].pop(request_id, None)
+            if future is None:  # pragma: no cover - the caller gave up after a failed send
+                continue
+            if status == "error":
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def _submit(self, shard: int, operation: str, *args: Any) -> Future:
+        future: Future = Future()
+        with self._pending_lock:
+            request_id = next(self._request_ids)
+            self._pending[shard][request_id] = future
+        try:
+            # Only the send is serialized; the shard may still be working on earlier requests.
+            with self._send_locks[shard]:
+                self._connections[shard].send((request_id, operation, args))
+        except BaseException:
+            with self._pending_lock:
+                self._pending[shard].pop(request_id, None)
+            raise
+        return future
+
+    def _call(self, shard: int, operation: str, *args: Any) -> Any:
+        return self._submit(shard, operation, *args).result()
+
+    def _exchange(self, requests: Dict[int, Tuple[str, Tuple[Any, ...]]]) -> Dict[int, Any]:
+        """Send each shard its ``(operation, args)`` request before waiting for any reply."""
+
+        futures = {shard: self._submit(shard, operation, *args) for shard, (operation, args) in sorted(requests.items())}
+        return {shard: future.result() for shard, future in futures.items()}
+
+    def _scatter(self, operation: str, *args: Any) -> List[Any]:
+        results = self._exchange({shard: (operation, args) for shard in range(self.shard_count)})
+        return [results[shard] for shard in range(self.shard_count)]
+
+    def index_document(
+        self,
+        document: Document,
+        paragraphs: Iterable[Paragraph],
+        alignments: Iterable[SentenceAlignment],
+    ) -> None:
+        with self._sequence_lock:
+            sequence = next(self._sequence)
+        self._call(self.shard_for(document.identifier), "index", document, list(paragraphs), list(alignments), sequence)
+
+    def update_document(self, document: Document) -> None:
+        self._call(self.shard_for(document.identifier), "update", document)
+
+    @timed()
+    def search(
+        self,
+        query: str,
+        *,
+        category: Optional[str] = None,
+        year: Optional[int] = None,
+        page: int = 1,
+        page_size: int = 10,
+        deadline: Optional[Deadline] = None,
+        profile: Optional[QueryProfile] = None,
+    ) -> dict:
+        start = (page - 1) * page_size
+        # Deadlines are absolute monotonic instants, which every shard process shares.
+        with phase(profile, "scatter"):
+            partials = self._scatter("search", query, category, year, start + page_size, deadline, profile is not None)
+        with phase(profile, "merge"):
+            total = sum(count for count, _, _ in partials)
+            merged = heapq.merge(*(hits for _, hits, _ in partials), key=lambda entry: entry[:3])
+            items = [item for _, _, _, item in itertools.islice(merged, start, start + page_size)]
+        if profile is not None:
+            self._merge_profiles(profile, [shard_profile for _, _, shard_profile in partials])
+            profile.count("objects_materialized", len(items))
+        return {"total": total, "page": page, "page_size": page_size, "items": items}
+
+    @staticmethod
+    def _merge_profiles(profile: QueryProfile, shard_profiles: List[QueryProfile]) -> None:
+        # Shards run in parallel, so each shard phase reports its slowest shard; counters add up.
+        for shard_profile in shard_profiles:
+            for name, seconds in shard_profile.phases.items():
+                key = f"shard_{name}"
+                profile.phases[key] = max(profile.phases.get(key, 0.0), seconds)
+            for name, amount in shard_profile.counters.items():
+                profile.count(name, amount)
+
+    def get_document(self, document_id: str) -> Optional[Document]:
+        return self._call(self.shard_for(document_id), "get_document", document_id)
+
+    def get_alignments(self, document_id: str) -> List[SentenceAlignment]:
+        return self._call(self.shard_for(document_id), "get_alignments", document_id)
+
+    def get_documents(self, document_ids: Iterable[str]) -> Dict[str, Tuple[Document, List[SentenceAlignment]]]:
+        """Look the ids up with one concurrent request per shard, each shard receiving only its own ids."""
+
+        by_shard: Dict[int, List[str]] = {}
+        for document_id in dict.fromkeys(document_ids):
+            by_shard.setdefault(self.shard_for(document_id), []).append(document_id)
+        replies = self._exchange({shard: ("get_documents", (shard_ids,)) for shard, shard_ids in by_shard.items()})
+        found: Dict[str, Tuple[Document, List[SentenceAlignment]]] = {}
+        for shard in sorted(replies):
+            found.update(replies[shard])
+        return found
+
+    def iter_documents(self) -> Iterator[Document]:
+        """Yield documents in global insertion order, fetching each from its shard."""
+
+        ordered = heapq.merge(*self._scatter("documents"), key=lambda item: item[1])
+        for document_id, _ in ordered:
+            document = self.get_document(document_id)
+            if document is not None:
+                yield document
+
+    def stats(self) -> Dict[str, int]:
+        totals: Dict[str, int] = {}
+        for shard_stats in self._scatter("stats"):
+            for key, value in shard_stats.items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def shard_sizes(self) -> List[int]:
+        return self._scatter("size")
+
+    def close(self) -> None:
+        for shard, connection in enumerate(self._connections):
+            try:
+                self._call(shard, "stop")
+            except (ConnectionError, EOFError, OSError):
+                pass
+            self._readers[shard].join(timeout=5)
+            connection.close()
+        for process in self._processes:
+            process.join(timeout=5)
+        self._connections = []
+        self._processes = []
+        self._readers = []
+
+    def __enter__(self) -> "ShardedCorpusIndexer":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+__all__ = ["ShardedCorpusIndexer"]
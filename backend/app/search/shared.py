@@ -0,0 +1,683 @@
+"""Immutable corpus and terms indexes shared between worker processes through mapped files.
+
+A builder publishes each build as a new generation: ``corpus-<n>.idx`` and ``terms-<n>.idx``
+in ``Settings.shared_index_dir``, after which ``CURRENT`` is atomically replaced with ``n``.
+Workers map the files read-only, so the operating system keeps a single copy of the pages
+however many processes attach, and switch to a newer generation when ``CURRENT`` changes.
+
+Each file is a sequence of 8-byte aligned sections followed by a JSON table of contents and
+a fixed trailer. Searchable text is stored normalized, UTF-8 encoded and separated by NUL
+bytes, and is scanned in place with ``mmap.find``; a match is mapped to its record by
+bisecting the record start offsets. Only the records on the returned page are decoded.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import suppress
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from backend.app.core.metrics import timed
+from backend.app.core.normalization import DEFAULT_OPTIONS, NormalizationOptions, normalize
+from backend.app.core.profiling import QueryProfile, phase
+from backend.app.core.workers import Deadline
+from backend.app.models.corpus import Document, Paragraph, SentenceAlignment
+from backend.app.models.terms import FIELD_SEPARATOR, Term, term_search_text
+from backend.app.search.indexer import CorpusIndex, alignment_text
+from backend.app.search.records import (
+    ALIGNMENT,
+    PARAGRAPH,
+    alignment_payload,
+    document_payload,
+    load_document,
+    paragraph_payload,
+    render_entry,
+)
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+CURRENT_FILE = "CURRENT"
+DEFAULT_KEEP_GENERATIONS = 2
+_MAGIC = b"ZBSHIDX1"
+_TRAILER = struct.Struct("<QQ8s")
+_SEPARATOR = b"\x00"
+# Deadline checks happen every this many matches while scanning.
+_CHECK_INTERVAL = 256
+
+
+class ReadOnlyIndexError(RuntimeError):
+    """Raised when a worker tries to modify an index that only the builder may write."""
+
+
+class _FileWriter:
+    def __init__(self) -> None:
+        self._sections: List[Tuple[str, str, bytes]] = []
+
+    def add(self, name: str, data: Union[bytes, bytearray, array]) -> None:
+        typecode = data.typecode if isinstance(data, array) else "B"
+        self._sections.append((name, typecode, data.tobytes() if isinstance(data, array) else bytes(data)))
+
+    def write(self, path: Path, meta: dict) -> None:
+        """Write all sections to ``path`` atomically."""
+
+        temp_path: Optional[Path] = None
+        try:
+            with tempfile.NamedTemporaryFile("wb", dir=path.parent, delete=False) as fp:
+                temp_path = Path(fp.name)
+                sections = {}
+                offset = 0
+                for name, typecode, data in self._sections:
+                    padding = -offset % 8
+                    fp.write(b"\x00" * padding)
+                    offset += padding
+                    sections[name] = [offset, len(data), typecode]
+                    fp.write(data)
+                    offset += len(data)
+                table = json.dumps(dict(meta, sections=sections), ensure_ascii=False).encode("utf-8")
+                fp.write(table)
+                fp.write(_TRAILER.pack(offset, len(table), _MAGIC))
+                fp.flush()
+                os.fsync(fp.fileno())
+            temp_path.replace(path)
+        except Exception:
+            if temp_path is not None:
+                with suppress(OSError):
+                    temp_path.unlink(missing_ok=True)
+            raise
+
+
+class _MappedFile:
+    """A published index file mapped read-only, with zero-copy views of its sections."""
+
+    def __init__(self, path: Path) -> None:
+        with path.open("rb") as fp:
+            self.size = os.fstat(fp.fileno()).st_size
+            self.map = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        offset, length, magic = _TRAILER.unpack_from(self.map, self.size - _TRAILER.size)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a shared index file")
+        self.meta = json.loads(self.map[offset : offset + length])
+        if self.meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path} has unsupported format version {self.meta.get('version')}")
+        self._view = memoryview(self.map)
+
+    def span(self, name: str) -> Tuple[int, int]:
+        offset, length, _ = self.meta["sections"][name]
+        return offset, offset + length
+
+    def array(self, name: str) -> memoryview:
+        offset, length, typecode = self.meta["sections"][name]
+        return self._view[offset : offset + length].cast(typecode)
+
+    def read(self, name: str, start: int, end: int) -> bytes:
+        """Bytes ``[start, end)`` of section ``name``."""
+
+        base = self.meta["sections"][name][0]
+        return self.map[base + start : base + end]
+
+
+class _SortedKeys(Sequence[bytes]):
+    """Identifiers in byte order, read from the mapped file so ``bisect`` can search them."""
+
+    def __init__(self, file: _MappedFile, order: memoryview, starts: memoryview, ends: memoryview) -> None:
+        self._file = file
+        self._order = order
+        self._starts = starts
+        self._ends = ends
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __getitem__(self, index):  # type: ignore[override]
+        ordinal = self._order[index]
+        return self._file.read("identifiers", self._starts[ordinal], self._ends[ordinal])
+
+
+def _scan(
+    file: _MappedFile,
+    needle: bytes,
+    starts: memoryview,
+    ends: memoryview,
+    deadline: Optional[Deadline] = None,
+) -> Iterator[Tuple[int, int]]:
+    """Yield ``(record, match position)`` for every record whose text contains ``needle``, in order."""
+
+    find = file.map.find
+    # Record offsets are relative to the text section.
+    base, text_end = file.span("text")
+    position = find(needle, base, text_end)
+    scanned = 0
+    while position != -1:
+        record = bisect_right(starts, position - base) - 1
+        yield record, position
+        scanned += 1
+        if deadline is not None and scanned % _CHECK_INTERVAL == 0:
+            deadline.check()
+        # Records are NUL separated and the needle has no NUL, so the next match starts later.
+        position = find(needle, base + ends[record] + 1, text_end)
+
+
+def _text_section(texts: Iterable[bytes], starts: array, ends: array) -> bytearray:
+    blob = bytearray(_SEPARATOR)
+    for text in texts:
+        starts.append(len(blob))
+        blob += text
+        ends.append(len(blob))
+        blob += _SEPARATOR
+    return blob
+
+
+def write_corpus(
+    path: Path,
+    entries: Iterable[Tuple[Document, Sequence[Paragraph], Sequence[SentenceAlignment]]],
+    options: NormalizationOptions = DEFAULT_OPTIONS,
+    generation: int = 0,
+) -> Dict[str, int]:
+    """Write documents, paragraphs and alignments as a shared corpus index file."""
+
+    writer = _FileWriter()
+    payloads = bytearray()
+    record_texts: List[bytes] = []
+    lengths, kinds, owners = array("I"), array("B"), array("I")
+    payload_starts, payload_ends = array("Q"), array("Q")
+    document_starts, document_ends, document_records, years = array("Q"), array("Q"), array("Q"), array("i")
+    identifiers = bytearray()
+    identifier_starts, identifier_ends = array("Q"), array("Q")
+    keys: List[bytes] = []
+    totals = {"documents": 0, "paragraphs": 0, "alignments": 0}
+
+    def add_payload(payload: str, starts: array, ends: array) -> None:
+        starts.append(len(payloads))
+        payloads.extend(payload.encode("utf-8"))
+        ends.append(len(payloads))
+
+    for ordinal, (document, paragraphs, alignments) in enumerate(entries):
+        add_payload(document_payload(document), document_starts, document_ends)
+        document_records.append(len(record_texts))
+        years.append(document.publication_date.year if document.publication_date else 0)
+        key = document.identifier.encode("utf-8")
+        keys.append(key)
+        identifier_starts.append(len(identifiers))
+        identifiers.extend(key)
+        identifier_ends.append(len(identifiers))
+        records = [(PARAGRAPH, paragraph_payload(paragraph), normalize(paragraph.text, options)) for paragraph in paragraphs]
+        records += [
+            (ALIGNMENT, alignment_payload(alignment), alignment_text(alignment, options).text) for alignment in alignments
+        ]
+        for kind, payload, text in records:
+            record_texts.append(text.encode("utf-8"))
+            lengths.append(len(text))
+            kinds.append(kind)
+            owners.append(ordinal)
+            add_payload(payload, payload_starts, payload_ends)
+        totals["documents"] += 1
+        totals["paragraphs"] += len(paragraphs)
+        totals["alignments"] += len(alignments)
+    document_records.append(len(record_texts))
+
+    text_starts, text_ends = array("Q"), array("Q")
+    text = _text_section(record_texts, text_starts, text_ends)
+    writer.add("text", text)
+    writer.add("text_starts", text_starts)
+    writer.add("text_ends", text_ends)
+    for name, data in (
+        ("lengths", lengths),
+        ("kinds", kinds),
+        ("owners", owners),
+        ("payload_starts", payload_starts),
+        ("payload_ends", payload_ends),
+        ("document_starts", document_starts),
+        ("document_ends", document_ends),
+        ("document_records", document_records),
+        ("years", years),
+        ("identifier_starts", identifier_starts),
+        ("identifier_ends", identifier_ends),
+        ("identifier_order", array("I", sorted(range(len(keys)), key=keys.__getitem__))),
+        ("payloads", payloads),
+        ("identifiers", identifiers),
+    ):
+        writer.add(name, data)
+    writer.write(
+        path,
+        {"version": FORMAT_VERSION, "kind": "corpus", "generation": generation, "options": asdict(options), **totals},
+    )
+    return totals
+
+
+def write_terms(
+    path: Path, terms: Iterable[Term], options: NormalizationOptions = DEFAULT_OPTIONS, generation: int = 0
+) -> int:
+    """Write terms as a shared dictionary file, returning how many were written."""
+
+    writer = _FileWriter()
+    payloads = bytearray()
+    blobs: List[bytes] = []
+    payload_starts, payload_ends = array("Q"), array("Q")
+    for term in terms:
+        blobs.append(term_search_text(term, options).encode("utf-8"))
+        payload_starts.append(len(payloads))
+        payloads.extend(term.model_dump_json().encode("utf-8"))
+        payload_ends.append(len(payloads))
+    text_starts, text_ends = array("Q"), array("Q")
+    writer.add("text", _text_section(blobs, text_starts, text_ends))
+    writer.add("text_starts", text_starts)
+    writer.add("text_ends", text_ends)
+    writer.add("payload_starts", payload_starts)
+    writer.add("payload_ends", payload_ends)
+    writer.add("payloads", payloads)
+    writer.write(
+        path,
+        {"version": FORMAT_VERSION, "kind": "terms", "generation": generation, "options": asdict(options), "terms": len(blobs)},
+    )
+    return len(blobs)
+
+
+class SharedIndexDirectory:
+    """Directory of published generations and the ``CURRENT`` pointer to the live one."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+
+    def generation(self) -> int:
+        """The live generation, or 0 before anything was published."""
+
+        try:
+            return int((self.path / CURRENT_FILE).read_text(encoding="ascii").strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def path_for(self, kind: str, generation: int) -> Path:
+        return self.path / f"{kind}-{generation:08d}.idx"
+
+    def _generations(self) -> List[int]:
+        found = set()
+        for kind in ("corpus", "terms"):
+            for path in self.path.glob(f"{kind}-*.idx"):
+                with suppress(ValueError):
+                    found.add(int(path.stem.split("-", 1)[1]))
+        return sorted(found)
+
+    def publish(
+        self,
+        entries: Iterable[Tuple[Document, Sequence[Paragraph], Sequence[SentenceAlignment]]],
+        terms: Iterable[Term],
+        options: NormalizationOptions = DEFAULT_OPTIONS,
+        keep: int = DEFAULT_KEEP_GENERATIONS,
+    ) -> int:
+        """Write a new generation, make it live and prune old ones; returns its number."""
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        generation = max([self.generation(), *self._generations()]) + 1
+        write_corpus(self.path_for("corpus", generation), entries, options, generation)
+        write_terms(self.path_for("terms", generation), terms, options, generation)
+        # Both files are complete before CURRENT names them, so readers never see half a build.
+        temp_path = self.path / f"{CURRENT_FILE}.{generation}.tmp"
+        with temp_path.open("w", encoding="ascii") as fp:
+            fp.write(f"{generation}\n")
+            fp.flush()
+            os.fsync(fp.fileno())
+        temp_path.replace(self.path / CURRENT_FILE)
+        for old in self._generations():
+            if old <= generation - max(1, keep):
+                for kind in ("corpus", "terms"):
+                    # Workers still mapping an old file keep their pages; deletion fails on Windows.
+                    with suppress(OSError):
+                        self.path_for(kind, old).unlink(missing_ok=True)
+        return generation
+
+
+class _SharedReader:
+    """Attaches to the live generation of one file kind, re-checking ``CURRENT`` periodically."""
+
+    kind = ""
+
+    def __init__(self, directory: Union[str, Path, SharedIndexDirectory], refresh_interval: float = 1.0) -> None:
+        self.directory = directory if isinstance(directory, SharedIndexDirectory) else SharedIndexDirectory(directory)
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._file: Optional[_MappedFile] = None
+        self._generation = 0
+        self._checked: Optional[float] = None
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def refresh(self) -> int:
+        """Attach to the live generation if it changed; returns the attached generation."""
+
+        with self._lock:
+            self._checked = time.monotonic()
+            try:
+                generation = self.directory.generation()
+                if generation != self._generation:
+                    path = self.directory.path_for(self.kind, generation)
+                    # The previous mapping is released once in-flight queries drop their reference.
+                    self._file = _MappedFile(path) if generation else None
+                    self._generation = generation
+            except (OSError, ValueError, struct.error) as exc:
+                # A pruned, missing or unreadable generation must not fail every query: keep
+                # serving the attached one and try again at the next refresh.
+                logger.warning("Keeping shared %s generation %d: %s", self.kind, self._generation, exc)
+            return self._generation
+
+    def _snapshot(self) -> Optional[_MappedFile]:
+        checked = self._checked
+        if checked is None or time.monotonic() - checked >= self.refresh_interval:
+            self.refresh()
+        return self._file
+
+    def _read_only(self, *_: object, **__: object) -> None:
+        raise ReadOnlyIndexError(f"The shared {self.kind} index is read-only; publish a new generation instead")
+
+
+class SharedCorpusIndexer(_SharedReader):
+    """Read-only corpus index attached to the builder's published files.
+
+    Results, ordering and scores match :class:`~backend.app.search.indexer.CorpusIndexer`
+    built from the same documents. Queries are normalized with the options the index
+    was built with.
+    """
+
+    kind = "corpus"
+    index_document = update_document = _SharedReader._read_only
+
+    def __init__(self, directory: Union[str, Path, SharedIndexDirectory], refresh_interval: float = 1.0) -> None:
+        super().__init__(directory, refresh_interval)
+        self.index = CorpusIndex(
+            name="corpus",
+            mappings={
+                "document_id": "keyword",
+                "language": "keyword",
+                "category": "keyword",
+                "text": "text",
+                "year": "integer",
+            },
+            settings={"analysis": "standard", "engine": "shared-mmap", "path": str(self.directory.path)},
+        )
+
+    @staticmethod
+    def _options(file: _MappedFile) -> NormalizationOptions:
+        return NormalizationOptions(**file.meta["options"])
+
+    def _document(self, file: _MappedFile, ordinal: int) -> dict:
+        return json.loads(file.read("payloads", file.array("document_starts")[ordinal], file.array("document_ends")[ordinal]))
+
+    def _payload(self, file: _MappedFile, record: int) -> dict:
+        return json.loads(file.read("payloads", file.array("payload_starts")[record], file.array("payload_ends")[record]))
+
+    @timed()
+    def search(
+        self,
+        query: str,
+        *,
+        category: Optional[str] = None,
+        year: Optional[int] = None,
+        page: int = 1,
+        page_size: int = 10,
+        deadline: Optional[Deadline] = None,
+        profile: Optional[QueryProfile] = None,
+    ) -> dict:
+        file = self._snapshot()
+        if file is None:
+            return {"total": 0, "page": page, "page_size": page_size, "items": []}
+        options = self._options(file)
+        normalized_query = normalize(query, options)
+        if deadline is not None:
+            deadline.check()
+        hits = self._collect(file, normalized_query, category, year, deadline, profile)
+        with phase(profile, "sort"):
+            # Records are stored in insertion order, so a stable sort gives the in-memory order.
+            hits.sort(key=lambda hit: hit[0], reverse=True)
+        start = (page - 1) * page_size
+        kinds, owners = file.array("kinds"), file.array("owners")
+        with phase(profile, "serialize"):
+            items = [
+                render_entry(
+                    self._document(file, owners[record]),
+                    self._payload(file, record),
+                    kinds[record],
+                    score,
+                    normalized_query,
+                    options,
+                )
+                for score, record in hits[start : start + page_size]
+            ]
+        if profile is not None:
+            profile.count("objects_materialized", len(items))
+        return {"total": len(hits), "page": page, "page_size": page_size, "items": items}
+
+    def _collect(
+        self,
+        file: _MappedFile,
+        normalized_query: str,
+        category: Optional[str],
+        year: Optional[int],
+        deadline: Optional[Deadline],
+        profile: Optional[QueryProfile],
+    ) -> List[Tuple[float, int]]:
+        needle = normalized_query.encode("utf-8")
+        if _SEPARATOR in needle:
+            return []
+        starts, ends = file.array("text_starts"), file.array("text_ends")
+        kinds, owners, years = file.array("kinds"), file.array("owners"), file.array("years")
+        admitted: Dict[int, bool] = {}
+
+        def admits(ordinal: int) -> bool:
+            allowed = admitted.get(ordinal)
+            if allowed is None:
+                allowed = not (year and years[ordinal] and years[ordinal] != year)
+                if allowed and category:
+                    allowed = category in self._document(file, ordinal)["categories"]
+                admitted[ordinal] = allowed
+            return allowed
+
+        hits: List[Tuple[float, int]] = []
+        examined = 0
+        with phase(profile, "match"):
+            if not needle:
+                # Every text contains the empty string once per character boundary.
+                lengths = file.array("lengths")
+                for record in range(len(starts)):
+                    if (not category and not year) or admits(owners[record]):
+                        hits.append((lengths[record] + 1 + (0.5 if kinds[record] == ALIGNMENT else 0), record))
+                examined = len(starts)
+            else:
+                data = file.map
+                base, _ = file.span("text")
+                for record, position in _scan(file, needle, starts, ends, deadline):
+                    examined += 1
+                    if (category or year) and not admits(owners[record]):
+                        continue
+                    # UTF-8 matches are character aligned, so byte counts equal character counts.
+                    count = data[position : base + ends[record]].count(needle)
+                    hits.append((count + 0.5 if kinds[record] == ALIGNMENT else count, record))
+        if profile is not None:
+            profile.count("candidates_examined", len(admitted) if (category or year) else examined)
+            profile.count("postings_read", examined)
+            profile.count("hits_scored", len(hits))
+        return hits
+
+    def _ordinal(self, file: _MappedFile, document_id: str) -> Optional[int]:
+        order = file.array("identifier_order")
+        keys = _SortedKeys(file, order, file.array("identifier_starts"), file.array("identifier_ends"))
+        key = document_id.encode("utf-8")
+        position = bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            return order[position]
+        return None
+
+    def get_document(self, document_id: str) -> Optional[Document]:
+        file = self._snapshot()
+        ordinal = self._ordinal(file, document_id) if file is not None else None
+        if file is None or ordinal is None:
+            return None
+        starts, ends = file.array("document_starts"), file.array("document_ends")
+        return load_document(file.read("payloads", starts[ordinal], ends[ordinal]).decode("utf-8"))
+
+    def get_alignments(self, document_id: str) -> List[SentenceAlignment]:
+        file = self._snapshot()
+        ordinal = self._ordinal(file, document_id) if file is not None else None
+        if file is None or ordinal is None:
+            return []
+        return self._alignments(file, ordinal)
+
+    def _alignments(self, file: _MappedFile, ordinal: int) -> List[SentenceAlignment]:
+        kinds, records = file.array("kinds"), file.array("document_records")
+        return [
+            SentenceAlignment(**self._payload(file, record))
+            for record in range(records[ordinal], records[ordinal + 1])
+            if kinds[record] == ALIGNMENT
+        ]
+
+    def get_documents(self, document_ids: Iterable[str]) -> Dict[str, Tuple[Document, List[SentenceAlignment]]]:
+        """Return the documents found among ``document_ids`` with their alignments, all from one generation."""
+
+        file = self._snapshot()
+        if file is None:
+            return {}
+        starts, ends = file.array("document_starts"), file.array("document_ends")
+        found = {}
+        for document_id in dict.fromkeys(document_ids):
+            ordinal = self._ordinal(file, document_id)
+            if ordinal is not None:
+                document = load_document(file.read("payloads", starts[ordinal], ends[ordinal]).decode("utf-8"))
+                found[document_id] = (document, self._alignments(file, ordinal))
+        return found
+
+    def alignment_snapshot(self) -> Tuple[int, Iterator[Tuple[str, List[SentenceAlignment]]]]:
+        """The live generation, and each of its document ids with their alignments in published order."""
+
+        file = self._snapshot()
+        if file is None:
+            return 0, iter(())
+        starts, ends = file.array("document_starts"), file.array("document_ends")
+
+        def entries() -> Iterator[Tuple[str, List[SentenceAlignment]]]:
+            for ordinal in range(len(starts)):
+                payload = json.loads(file.read("payloads", starts[ordinal], ends[ordinal]))
+                yield payload["identifier"], self._alignments(file, ordinal)
+
+        return file.meta["generation"], entries()
+
+    def iter_documents(self) -> Iterator[Document]:
+        """Yield documents in the order they were published."""
+
+        file = self._snapshot()
+        if file is None:
+            return
+        starts, ends = file.array("document_starts"), file.array("document_ends")
+        for ordinal in range(len(starts)):
+            yield load_document(file.read("payloads", starts[ordinal], ends[ordinal]).decode("utf-8"))
+
+    def stats(self) -> Dict[str, int]:
+        file = self._snapshot()
+        if file is None:
+            return {"documents": 0, "paragraphs": 0, "alignments": 0, "bytes": 0}
+        meta = file.meta
+        return {
+            "documents": meta["documents"],
+            "paragraphs": meta["paragraphs"],
+            "alignments": meta["alignments"],
+            "bytes": file.size,
+        }
+
+
+class SharedTermsRepository(_SharedReader):
+    """Read-only counterpart of :class:`~backend.app.models.terms.TermsRepository` over a shared dictionary."""
+
+    kind = "terms"
+    save_terms = merge_terms = _SharedReader._read_only
+
+    def _terms(self, file: _MappedFile, records: Iterable[int]) -> List[Term]:
+        starts, ends = file.array("payload_starts"), file.array("payload_ends")
+        return [Term.model_validate_json(file.read("payloads", starts[record], ends[record])) for record in records]
+
+    def preload(self) -> int:
+        self.refresh()
+        return self.stats()["terms"]
+
+    def stats(self) -> Dict[str, int]:
+        file = self._snapshot()
+        if file is None:
+            return {"terms": 0, "bytes": 0}
+        return {"terms": file.meta["terms"], "bytes": file.size}
+
+    @timed()
+    def load_terms(self) -> List[Term]:
+        file = self._snapshot()
+        if file is None:
+            return []
+        return self._terms(file, range(file.meta["terms"]))
+
+    @timed()
+    def search(self, query: Optional[str], profile: Optional[QueryProfile] = None) -> List[Term]:
+        """Normalized substring search with the same results as ``TermsRepository.search``."""
+
+        with phase(profile, "load"):
+            file = self._snapshot()
+        if file is None:
+            return []
+        if not query:
+            return self._terms(file, range(file.meta["terms"]))
+        with phase(profile, "normalize"):
+            normalized = normalize(query, NormalizationOptions(**file.meta["options"]))
+        needle = normalized.encode("utf-8")
+        if not needle or FIELD_SEPARATOR in normalized or _SEPARATOR in needle:
+            return []
+        with phase(profile, "match"):
+            records = [record for record, _ in _scan(file, needle, file.array("text_starts"), file.array("text_ends"))]
+            matches = self._terms(file, records)
+        if profile is not None:
+            profile.count("postings_read", len(records))
+            profile.count("hits_scored", len(matches))
+        return matches
+
+    @timed()
+    def search_many(self, queries: Iterable[Optional[str]]) -> Dict[Optional[str], List[Term]]:
+        """Search every distinct query against one generation, keyed by query like ``TermsRepository.search_many``."""
+
+        file = self._snapshot()
+        queries = list(dict.fromkeys(queries))
+        if file is None:
+            return {query: [] for query in queries}
+        options = NormalizationOptions(**file.meta["options"])
+        text_starts, text_ends = file.array("text_starts"), file.array("text_ends")
+        # Queries that normalize alike share one scan; None stands for "no query", which lists every term.
+        by_normalized: Dict[Optional[str], List[Term]] = {}
+        results: Dict[Optional[str], List[Term]] = {}
+        for query in queries:
+            normalized = normalize(query, options) if query else None
+            if normalized not in by_normalized:
+                if normalized is None:
+                    by_normalized[normalized] = self._terms(file, range(file.meta["terms"]))
+                else:
+                    needle = normalized.encode("utf-8")
+                    if not needle or FIELD_SEPARATOR in normalized or _SEPARATOR in needle:
+                        by_normalized[normalized] = []
+                    else:
+                        records = [record for record, _ in _scan(file, needle, text_starts, text_ends)]
+                        by_normalized[normalized] = self._terms(file, records)
+            results[query] = by_normalized[normalized]
+        return results
+
+
+__all__ = [
+    "ReadOnlyIndexError",
+    "SharedCorpusIndexer",
+    "SharedIndexDirectory",
+    "SharedTermsRepository",
+    "write_corpus",
+    "write_terms",
+]
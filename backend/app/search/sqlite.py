@@ -0,0 +1,398 @@
+"""SQLite FTS5 implementation of the corpus indexer interface."""
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from backend.app.core.metrics import timed
+from backend.app.core.normalization import DEFAULT_OPTIONS, NormalizationOptions, normalize
+from backend.app.core.profiling import QueryProfile, phase
+from backend.app.core.workers import Deadline, DeadlineExceeded
+from backend.app.models.corpus import Document, Paragraph, SentenceAlignment
+from backend.app.search.indexer import CorpusIndex, alignment_text
+from backend.app.search.records import (
+    ALIGNMENT,
+    PARAGRAPH,
+    alignment_payload,
+    document_payload,
+    load_document,
+    paragraph_payload,
+    render_entry,
+)
+
+# The trigram tokenizer can only answer substring queries of at least three characters.
+_MIN_MATCH_LENGTH = 3
+_PROGRESS_INTERVAL = 10_000
+# Stay well below SQLite's limit on bound parameters per statement.
+_LOOKUP_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    rowid INTEGER PRIMARY KEY,
+    identifier TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    year INTEGER
+);
+CREATE TABLE IF NOT EXISTS document_categories (
+    document_rowid INTEGER NOT NULL REFERENCES documents(rowid) ON DELETE CASCADE,
+    category TEXT NOT NULL,
+    PRIMARY KEY (category, document_rowid)
+);
+CREATE TABLE IF NOT EXISTS entries (
+    rowid INTEGER PRIMARY KEY,
+    document_rowid INTEGER NOT NULL REFERENCES documents(rowid) ON DELETE CASCADE,
+    kind INTEGER NOT NULL,
+    identifier TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_entries_document ON entries(document_rowid, kind);
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    text, content='entries', content_rowid='rowid', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts(rowid, text) VALUES (new.rowid, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts(entries_fts, rowid, text) VALUES ('delete', old.rowid, old.text);
+END;
+"""
+
+
+class SqliteCorpusIndexer:
+    """Persistent corpus index stored in SQLite with an FTS5 trigram table.
+
+    Results, ordering and scores match :class:`~backend.app.search.indexer.CorpusIndexer`.
+    The ``text`` column holds the normalized form; highlights are mapped back for the
+    returned page only. The normalization options are stored in the ``meta`` table, and a
+    database built with other options is re-normalized when it is opened.
+    """
+
+    def __init__(self, path: str = ":memory:", *, options: NormalizationOptions = DEFAULT_OPTIONS) -> None:
+        self.index = CorpusIndex(
+            name="corpus",
+            mappings={
+                "document_id": "keyword",
+                "language": "keyword",
+                "category": "keyword",
+                "text": "text",
+                "year": "integer",
+            },
+            settings={"analysis": "trigram", "engine": "sqlite-fts5", **options.as_metadata()},
+        )
+        self.options = options
+        self.path = path
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA foreign_keys=ON")
+        self._connection.executescript(_SCHEMA)
+        self._sync_options()
+
+    def _sync_options(self) -> None:
+        expected = self.options.as_metadata()
+        with self.batch():
+            stored = dict(self._connection.execute("SELECT key, value FROM meta WHERE key LIKE 'normalization.%'"))
+            if stored == expected:
+                return
+            # Databases without stored options predate them and were lowercased only, so they are rebuilt too.
+            self._renormalize()
+            self._connection.execute("DELETE FROM meta WHERE key LIKE 'normalization.%'")
+            self._connection.executemany("INSERT INTO meta(key, value) VALUES (?, ?)", list(expected.items()))
+
+    def _renormalize(self, batch_size: int = 1000) -> None:
+        last_rowid = 0
+        renormalized = False
+        while True:
+            rows = self._connection.execute(
+                "SELECT rowid, kind, payload FROM entries WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (last_rowid, batch_size),
+            ).fetchall()
+            if not rows:
+                break
+            updates = []
+            for rowid, kind, payload in rows:
+                data = json.loads(payload)
+                if kind == ALIGNMENT:
+                    text = alignment_text(SentenceAlignment(**data), self.options).text
+                else:
+                    text = normalize(data["text"], self.options)
+                updates.append((text, rowid))
+            self._connection.executemany("UPDATE entries SET text = ? WHERE rowid = ?", updates)
+            last_rowid = rows[-1][0]
+            renormalized = True
+        if renormalized:
+            # The FTS table mirrors ``entries`` through insert and delete triggers only.
+            self._connection.execute("INSERT INTO entries_fts(entries_fts) VALUES ('rebuild')")
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group several ``index_document`` calls into a single transaction."""
+
+        with self._lock:
+            if self._batch_depth == 0:
+                self._connection.execute("BEGIN")
+            self._batch_depth += 1
+            try:
+                yield
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._connection.execute("ROLLBACK")
+                raise
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._connection.execute("COMMIT")
+
+    def index_document(
+        self,
+        document: Document,
+        paragraphs: Iterable[Paragraph],
+        alignments: Iterable[SentenceAlignment],
+    ) -> None:
+        with self.batch():
+            cursor = self._connection.cursor()
+            # Upsert so a re-indexed document keeps its rowid, and therefore its result order.
+            cursor.execute(
+                "INSERT INTO documents(identifier, payload, year) VALUES (?, ?, ?) "
+                "ON CONFLICT(identifier) DO UPDATE SET payload = excluded.payload, year = excluded.year",
+                (
+                    document.identifier,
+                    document_payload(document),
+                    document.publication_date.year if document.publication_date else None,
+                ),
+            )
+            document_rowid = cursor.execute(
+                "SELECT rowid FROM documents WHERE identifier = ?", (document.identifier,)
+            ).fetchone()[0]
+            cursor.execute("DELETE FROM document_categories WHERE document_rowid = ?", (document_rowid,))
+            cursor.executemany(
+                "INSERT OR IGNORE INTO document_categories(document_rowid, category) VALUES (?, ?)",
+                [(document_rowid, category) for category in document.categories],
+            )
+            cursor.execute("DELETE FROM entries WHERE document_rowid = ?", (document_rowid,))
+            cursor.executemany(
+                "INSERT INTO entries(document_rowid, kind, identifier, payload, text) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        document_rowid,
+                        PARAGRAPH,
+                        paragraph.identifier,
+                        paragraph_payload(paragraph),
+                        normalize(paragraph.text, self.options),
+                    )
+                    for paragraph in paragraphs
+                ],
+            )
+            cursor.executemany(
+                "INSERT INTO entries(document_rowid, kind, identifier, payload, text) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        document_rowid,
+                        ALIGNMENT,
+                        alignment.identifier,
+                        alignment_payload(alignment),
+                        alignment_text(alignment, self.options).text,
+                    )
+                    for alignment in alignments
+                ],
+            )
+
+    def update_document(self, document: Document) -> None:
+        """Replace the metadata of an indexed document without touching its text."""
+
+        with self.batch():
+            cursor = self._connection.cursor()
+            row = cursor.execute("SELECT rowid FROM documents WHERE identifier = ?", (document.identifier,)).fetchone()
+            if row is None:
+                return
+            cursor.execute(
+                "UPDATE documents SET payload = ?, year = ? WHERE rowid = ?",
+                (
+                    document_payload(document),
+                    document.publication_date.year if document.publication_date else None,
+                    row[0],
+                ),
+            )
+            cursor.execute("DELETE FROM document_categories WHERE document_rowid = ?", (row[0],))
+            cursor.executemany(
+                "INSERT OR IGNORE INTO document_categories(document_rowid, category) VALUES (?, ?)",
+                [(row[0], category) for category in document.categories],
+            )
+
+    @timed()
+    def search(
+        self,
+        query: str,
+        *,
+        category: Optional[str] = None,
+        year: Optional[int] = None,
+        page: int = 1,
+        page_size: int = 10,
+        deadline: Optional[Deadline] = None,
+        profile: Optional[QueryProfile] = None,
+    ) -> dict:
+        normalized_query = normalize(query, self.options)
+        conditions: List[str] = []
+        parameters: List[object] = []
+        source = "entries AS e"
+        if not normalized_query:
+            score = "length(e.text) + 1"
+        else:
+            score = "(length(e.text) - length(replace(e.text, :q, ''))) / length(:q)"
+            conditions.append("instr(e.text, :q) > 0")
+            if len(normalized_query) >= _MIN_MATCH_LENGTH:
+                source = "entries_fts JOIN entries AS e ON e.rowid = entries_fts.rowid"
+                conditions.append("entries_fts MATCH :phrase")
+        if category:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM document_categories AS c "
+                "WHERE c.category = :category AND c.document_rowid = e.document_rowid)"
+            )
+        if year:
+            conditions.append("(d.year IS NULL OR d.year = :year)")
+        sql = (
+            f"SELECT {score} + 0.5 * e.kind AS score, count(*) OVER () AS total, "
+            "e.kind, e.identifier, e.payload, d.payload "
+            f"FROM {source} JOIN documents AS d ON d.rowid = e.document_rowid"
+            + (" WHERE " + " AND ".join(conditions) if conditions else "")
+            + " ORDER BY score DESC, e.document_rowid, e.kind, e.rowid LIMIT :limit OFFSET :offset"
+        )
+        parameters_map = {
+            "q": normalized_query,
+            "phrase": '"' + normalized_query.replace('"', '""') + '"',
+            "category": category,
+            "year": year,
+            "limit": page_size,
+            "offset": (page - 1) * page_size,
+        }
+        with self._lock:
+            if deadline is not None:
+                deadline.check()
+                # SQLite calls the handler every N virtual machine instructions; True aborts the query.
+                self._connection.set_progress_handler(deadline.expired, _PROGRESS_INTERVAL)
+            try:
+                # Filtering, matching, scoring and sorting all happen inside this one statement.
+                with phase(profile, "query"):
+                    rows = self._connection.execute(sql, parameters_map).fetchall()
+                    total = rows[0][1] if rows else self._count(sql, parameters_map)
+            except sqlite3.OperationalError as exc:
+                if deadline is not None and deadline.expired():
+                    raise DeadlineExceeded("Request deadline exceeded") from exc
+                raise
+            finally:
+                if deadline is not None:
+                    self._connection.set_progress_handler(None, 0)
+        with phase(profile, "serialize"):
+            items = [
+                render_entry(
+                    json.loads(document_json), json.loads(entry_json), kind, score_value, normalized_query, self.options
+                )
+                for score_value, _, kind, _, entry_json, document_json in rows
+            ]
+        if profile is not None:
+            profile.count("postings_read", len(rows))
+            profile.count("hits_scored", total)
+            profile.count("objects_materialized", len(items))
+        return {"total": total, "page": page, "page_size": page_size, "items": items}
+
+    def _count(self, sql: str, parameters: dict) -> int:
+        # A page past the last hit returns no rows, so the windowed total must be computed separately.
+        if parameters["offset"] == 0:
+            return 0
+        counted = dict(parameters, limit=1, offset=0)
+        row = self._connection.execute(sql, counted).fetchone()
+        return row[1] if row else 0
+
+    def get_document(self, document_id: str) -> Optional[Document]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT payload FROM documents WHERE identifier = ?", (document_id,)
+            ).fetchone()
+        return load_document(row[0]) if row else None
+
+    def get_alignments(self, document_id: str) -> List[SentenceAlignment]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT e.payload FROM entries AS e JOIN documents AS d ON d.rowid = e.document_rowid "
+                "WHERE d.identifier = ? AND e.kind = ? ORDER BY e.rowid",
+                (document_id, ALIGNMENT),
+            ).fetchall()
+        return [SentenceAlignment(**json.loads(payload)) for (payload,) in rows]
+
+    def get_documents(self, document_ids: Iterable[str]) -> Dict[str, Tuple[Document, List[SentenceAlignment]]]:
+        """Return the documents found among ``document_ids`` with their alignments, keyed by id.
+
+        All lookups run under one lock hold, so they see the same state of the index.
+        """
+
+        identifiers = list(dict.fromkeys(document_ids))
+        documents: Dict[int, Tuple[str, Document]] = {}
+        alignments: Dict[int, List[SentenceAlignment]] = {}
+        with self._lock:
+            for offset in range(0, len(identifiers), _LOOKUP_BATCH):
+                batch = identifiers[offset : offset + _LOOKUP_BATCH]
+                placeholders = ", ".join("?" * len(batch))
+                rows = self._connection.execute(
+                    f"SELECT rowid, identifier, payload FROM documents WHERE identifier IN ({placeholders})", batch
+                ).fetchall()
+                for rowid, identifier, payload in rows:
+                    documents[rowid] = (identifier, load_document(payload))
+                    alignments[rowid] = []
+            rowids = list(documents)
+            for offset in range(0, len(rowids), _LOOKUP_BATCH):
+                batch = rowids[offset : offset + _LOOKUP_BATCH]
+                placeholders = ", ".join("?" * len(batch))
+                rows = self._connection.execute(
+                    f"SELECT document_rowid, payload FROM entries WHERE document_rowid IN ({placeholders}) AND kind = ? "
+                    "ORDER BY rowid",
+                    [*batch, ALIGNMENT],
+                ).fetchall()
+                for rowid, payload in rows:
+                    alignments[rowid].append(SentenceAlignment(**json.loads(payload)))
+        return {identifier: (document, alignments[rowid]) for rowid, (identifier, document) in documents.items()}
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            documents = self._connection.execute("SELECT count(*) FROM documents").fetchone()[0]
+            kinds = dict(self._connection.execute("SELECT kind, count(*) FROM entries GROUP BY kind").fetchall())
+            page_count = self._connection.execute("PRAGMA page_count").fetchone()[0]
+            page_size = self._connection.execute("PRAGMA page_size").fetchone()[0]
+        return {
+            "documents": documents,
+            "paragraphs": kinds.get(PARAGRAPH, 0),
+            "alignments": kinds.get(ALIGNMENT, 0),
+            "bytes": page_count * page_size,
+        }
+
+    def iter_documents(self, batch_size: int = 500) -> Iterator[Document]:
+        """Yield indexed documents in insertion order, paging by rowid."""
+
+        last_rowid = 0
+        while True:
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT rowid, payload FROM documents WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                    (last_rowid, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for _, payload in rows:
+                yield load_document(payload)
+            last_rowid = rows[-1][0]
+
+
+__all__ = ["SqliteCorpusIndexer"]
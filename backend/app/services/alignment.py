@@ -1,39 +1,161 @@
 """Sentence alignment service for the bilingual corpus."""
 from __future__ import annotations
 
+import hashlib
 import itertools
 import math
 import re
+import unicodedata
 import uuid
 from dataclasses import dataclass
-from typing import Iterable, List, Sequence
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, TextIO
 
-from backend.app.models.corpus import Document, SentenceAlignment
+from backend.app.core.metrics import timed
+from backend.app.models.corpus import Document, Paragraph, SentenceAlignment
 
-_SENTENCE_SPLIT_RE = re.compile(r"(?<=[。！？.!?])\s+")
+# A run of terminators (Chinese and full-width stops, the Bengali danda and double danda, full
+# stops) plus any closing quotes or brackets. A single character class keeps the scan fast.
+_TERMINATORS = "。！？!?।॥．｡."
+_CLOSERS = "\"'”’」』）)]】〕》〉}»"
+_SENTENCE_END_RE = re.compile(f"[{re.escape(_TERMINATORS)}]+[{re.escape(_CLOSERS)}]*")
+# Characters before a full stop searched for an abbreviation, which iter_stream keeps across sentences.
+_ABBREVIATION_LOOKBACK = 16
+# A full stop directly followed by one of these is a decimal point or part of a token like "e.g".
+_INNER_FULL_STOP_FOLLOWERS = frozenset("0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ০১২৩৪৫৬৭৮৯")
+DEFAULT_ABBREVIATIONS: Dict[str, tuple[str, ...]] = {
+    "en": (
+        "mr.", "mrs.", "ms.", "dr.", "no.", "nos.", "art.", "arts.", "sec.", "cl.", "ch.", "para.", "vol.",
+        "p.", "pp.", "co.", "ltd.", "inc.", "govt.", "dept.", "e.g.", "i.e.", "etc.", "vs.", "viz.",
+    ),
+    "bn": ("ড.", "ডা.", "মো.", "মোসা.", "নং.", "খ্রি.", "খ্রিস্টাব্দ.", "পৃ.", "সং.", "প্রা.", "লি."),
+    "zh": (),
+}
+STREAM_CHUNK_SIZE = 1 << 16
+_ALIGNMENT_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "zh-bn-legal-corpus:alignment")
+
+
+def alignment_identifier(document_id: str, position: int, source_sentence: str, target_sentence: str) -> str:
+    """Deterministic alignment id derived from the document, position and sentence content."""
+
+    name = "\x1f".join((document_id, str(position), source_sentence, target_sentence))
+    return str(uuid.uuid5(_ALIGNMENT_NAMESPACE, name))
+
+
+def content_fingerprint(source_text: str, target_text: str) -> str:
+    """Fingerprint of a document's source and target text used to detect unchanged documents."""
+
+    digest = hashlib.sha256()
+    digest.update(source_text.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(target_text.encode("utf-8"))
+    return digest.hexdigest()
 
 
 @dataclass
 class AlignmentResult:
     document: Document
     alignments: List[SentenceAlignment]
+    fingerprint: Optional[str] = None
+
+
+def _is_word_character(character: str) -> bool:
+    return unicodedata.category(character)[0] in "LMN"
 
 
 class SentenceSplitter:
-    """Utility for splitting paragraphs into sentences."""
+    """Single-pass sentence tokenizer for Bengali, Chinese and English legal text.
+
+    Splits after Chinese and full-width stops, the danda and double danda, and full stops
+    that do not end a known abbreviation, keeping trailing closing quotes and brackets
+    with their sentence. Sentences are produced lazily from strings or text streams.
+    """
+
+    def __init__(self, abbreviations: Optional[Mapping[str, Iterable[str]]] = None) -> None:
+        abbreviations = DEFAULT_ABBREVIATIONS if abbreviations is None else abbreviations
+        self._abbreviations = {
+            language: frozenset(entry.lower() for entry in entries) for language, entries in abbreviations.items()
+        }
+        self._all_abbreviations = frozenset().union(*self._abbreviations.values())
+
+    def split(self, text: str, language: Optional[str] = None) -> List[str]:
+        return list(self.iter_sentences(text, language))
+
+    def iter_sentences(self, text: str, language: Optional[str] = None) -> Iterator[str]:
+        """Yield the stripped, non-empty sentences of ``text``."""
 
-    def split(self, text: str) -> List[str]:
         if not text:
-            return []
-        sentences: List[str] = []
+            return
         start = 0
-        for match in re.finditer(r"[。！？.!?]", text):
-            end = match.end()
-            sentences.append(text[start:end].strip())
+        for end in self._ends(text, 0, len(text), self._abbreviations_for(language)):
+            sentence = text[start:end].strip()
+            if sentence:
+                yield sentence
             start = end
-        if start < len(text):
-            sentences.append(text[start:].strip())
-        return [s for s in sentences if s]
+        tail = text[start:].strip()
+        if tail:
+            yield tail
+
+    def iter_stream(
+        self,
+        stream: TextIO,
+        language: Optional[str] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> Iterator[str]:
+        """Yield sentences from a text stream, holding only the unfinished sentence in memory."""
+
+        abbreviations = self._abbreviations_for(language)
+        buffer = ""
+        position = start = 0
+        while True:
+            chunk = stream.read(chunk_size)
+            final = not chunk
+            buffer += chunk
+            # A trailing run of terminators and closers may continue in the next chunk.
+            scan_end = len(buffer) if final else len(buffer.rstrip(_TERMINATORS + _CLOSERS))
+            for end in self._ends(buffer, position, scan_end, abbreviations):
+                sentence = buffer[start:end].strip()
+                if sentence:
+                    yield sentence
+                start = end
+            if final:
+                tail = buffer[start:].strip()
+                if tail:
+                    yield tail
+                return
+            # Keep the end of the previous sentence, since the abbreviation check looks back across it as split() does.
+            cut = max(0, start - _ABBREVIATION_LOOKBACK)
+            buffer = buffer[cut:]
+            start -= cut
+            position = scan_end - cut
+
+    def _abbreviations_for(self, language: Optional[str]) -> frozenset[str]:
+        if language is None:
+            return self._all_abbreviations
+        return self._abbreviations.get(language, self._all_abbreviations)
+
+    @staticmethod
+    def _ends(text: str, position: int, scan_end: int, abbreviations: frozenset[str]) -> Iterator[int]:
+        """Yield the end offsets of sentences terminated within ``text[position:scan_end]``."""
+
+        limit = len(text)
+        for match in _SENTENCE_END_RE.finditer(text, position, scan_end):
+            end = match.end()
+            if text[end - 1] == ".":
+                if end < limit and text[end] in _INNER_FULL_STOP_FOLLOWERS:
+                    continue
+                if abbreviations and _ends_with_abbreviation(text, end - 1, abbreviations):
+                    continue
+            yield end
+
+
+def _ends_with_abbreviation(text: str, dot: int, abbreviations: frozenset[str]) -> bool:
+    if dot + 1 < len(text) and text[dot + 1] == ".":
+        return False
+    begin = dot
+    # Abbreviations are short; scan back over the word the full stop is attached to.
+    while begin > 0 and dot - begin < _ABBREVIATION_LOOKBACK and (_is_word_character(text[begin - 1]) or text[begin - 1] == "."):
+        begin -= 1
+    return text[begin : dot + 1].lower() in abbreviations
 
 
 class SimpleAlignmentEngine:
@@ -53,16 +175,38 @@ class SimpleAlignmentEngine:
 class AlignmentRepository:
     """In-memory persistence for alignments."""
 
+    # Whether saved alignments and fingerprints outlive the process that wrote them.
+    durable = False
+
     def __init__(self) -> None:
         self._storage: dict[str, List[SentenceAlignment]] = {}
+        self._fingerprints: dict[str, str] = {}
 
-    def save(self, document_id: str, alignments: Iterable[SentenceAlignment]) -> List[SentenceAlignment]:
+    def save_document(self, document: Document, paragraphs: Iterable[Paragraph]) -> None:
+        """Persist document metadata and paragraphs; the in-memory store leaves these to the indexer."""
+
+    def update_document(self, document: Document) -> None:
+        """Persist changed document metadata when the text, and so the paragraphs, are unchanged."""
+
+    def save(
+        self,
+        document_id: str,
+        alignments: Iterable[SentenceAlignment],
+        fingerprint: Optional[str] = None,
+    ) -> List[SentenceAlignment]:
         self._storage[document_id] = list(alignments)
+        if fingerprint is None:
+            self._fingerprints.pop(document_id, None)
+        else:
+            self._fingerprints[document_id] = fingerprint
         return self._storage[document_id]
 
     def get(self, document_id: str) -> List[SentenceAlignment]:
         return list(self._storage.get(document_id, []))
 
+    def get_fingerprint(self, document_id: str) -> Optional[str]:
+        return self._fingerprints.get(document_id)
+
 
 class AlignmentService:
     """Service orchestrating sentence alignment and persistence."""
@@ -72,13 +216,21 @@ class AlignmentService:
         self.engine = SimpleAlignmentEngine()
         self.repository = repository or AlignmentRepository()
 
-    def align_and_store(self, document: Document, source_text: str, target_text: str) -> AlignmentResult:
-        source_sentences = self.splitter.split(source_text)
-        target_sentences = self.splitter.split(target_text)
+    @timed()
+    def align_and_store(
+        self,
+        document: Document,
+        source_text: str,
+        target_text: str,
+        fingerprint: Optional[str] = None,
+    ) -> AlignmentResult:
+        source_sentences = self.splitter.split(source_text, document.source_language)
+        target_sentences = self.splitter.split(target_text, document.target_language)
         pairs = self.engine.align(source_sentences, target_sentences)
+        fingerprint = fingerprint or content_fingerprint(source_text, target_text)
         alignments = [
             SentenceAlignment(
-                identifier=str(uuid.uuid4()),
+                identifier=alignment_identifier(document.identifier, position, src, tgt),
                 document_id=document.identifier,
                 source_sentence=src,
                 target_sentence=tgt,
@@ -86,10 +238,15 @@ class AlignmentService:
                 target_language=document.target_language,
                 score=score,
             )
-            for src, tgt, score in pairs
+            for position, (src, tgt, score) in enumerate(pairs)
         ]
-        stored = self.repository.save(document.identifier, alignments)
-        return AlignmentResult(document=document, alignments=stored)
+        stored = self.repository.save(document.identifier, alignments, fingerprint=fingerprint)
+        return AlignmentResult(document=document, alignments=stored, fingerprint=fingerprint)
 
     def get_alignments(self, document_id: str) -> List[SentenceAlignment]:
         return self.repository.get(document_id)
+
+    def is_unchanged(self, document_id: str, fingerprint: str) -> bool:
+        """Return True when the stored alignments were built from text with this fingerprint."""
+
+        return self.repository.get_fingerprint(document_id) == fingerprint
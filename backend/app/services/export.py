@@ -0,0 +1,180 @@
+"""Streaming export of the parallel corpus as TMX, JSONL or TSV."""
+from __future__ import annotations
+
+import json
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+from backend.app.models.corpus import Document, SentenceAlignment
+
+CHUNK_SIZE = 1 << 16
+
+
+@dataclass
+class ExportFilter:
+    """Subset of the corpus to export; unset fields match everything.
+
+    Unlike search, a ``year`` filter excludes documents without a publication date.
+    """
+
+    category: Optional[str] = None
+    year: Optional[int] = None
+    source_language: Optional[str] = None
+    target_language: Optional[str] = None
+    min_score: Optional[float] = None
+
+    @classmethod
+    def from_language_pair(cls, language_pair: Optional[str], **kwargs: Any) -> "ExportFilter":
+        if not language_pair:
+            return cls(**kwargs)
+        source_language, separator, target_language = language_pair.partition("-")
+        if not separator or not source_language or not target_language:
+            raise ValueError("language_pair must look like 'bn-zh'")
+        return cls(source_language=source_language, target_language=target_language, **kwargs)
+
+    def accepts_document(self, document: Document) -> bool:
+        if self.category and self.category not in document.categories:
+            return False
+        if self.year and (document.publication_date is None or document.publication_date.year != self.year):
+            return False
+        if self.source_language and document.source_language != self.source_language:
+            return False
+        if self.target_language and document.target_language != self.target_language:
+            return False
+        return True
+
+    def accepts_alignment(self, alignment: SentenceAlignment) -> bool:
+        if not alignment.source_sentence or not alignment.target_sentence:
+            return False
+        if self.min_score is not None and (alignment.score is None or alignment.score < self.min_score):
+            return False
+        return True
+
+
+def iter_alignments(indexer: Any, filters: ExportFilter) -> Iterator[SentenceAlignment]:
+    """Lazily yield exportable alignments one document at a time."""
+
+    for document in indexer.iter_documents():
+        if not filters.accepts_document(document):
+            continue
+        for alignment in indexer.get_alignments(document.identifier):
+            if filters.accepts_alignment(alignment):
+                yield alignment
+
+
+def render_jsonl(alignments: Iterable[SentenceAlignment], filters: ExportFilter) -> Iterator[str]:
+    for alignment in alignments:
+        yield json.dumps(
+            {
+                "document_id": alignment.document_id,
+                "alignment_id": alignment.identifier,
+                "source_language": alignment.source_language,
+                "target_language": alignment.target_language,
+                "source": alignment.source_sentence,
+                "target": alignment.target_sentence,
+                "score": alignment.score,
+            },
+            ensure_ascii=False,
+        ) + "\n"
+
+
+def _tsv_field(value: object) -> str:
+    if value is None:
+        return ""
+    return str(value).replace("\t", " ").replace("\r", " ").replace("\n", " ")
+
+
+def render_tsv(alignments: Iterable[SentenceAlignment], filters: ExportFilter) -> Iterator[str]:
+    yield "document_id\talignment_id\tsource_language\ttarget_language\tscore\tsource\ttarget\n"
+    for alignment in alignments:
+        yield "\t".join(
+            _tsv_field(value)
+            for value in (
+                alignment.document_id,
+                alignment.identifier,
+                alignment.source_language,
+                alignment.target_language,
+                alignment.score,
+                alignment.source_sentence,
+                alignment.target_sentence,
+            )
+        ) + "\n"
+
+
+def render_tmx(alignments: Iterable[SentenceAlignment], filters: ExportFilter) -> Iterator[str]:
+    source_language = filters.source_language or "*all*"
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<tmx version="1.4">\n'
+        '  <header creationtool="zh-bn-legal-corpus" creationtoolversion="0.1.0" segtype="sentence" '
+        f'o-tmf="zh-bn-legal-corpus" adminlang="en" srclang={quoteattr(source_language)} datatype="plaintext"/>\n'
+        "  <body>\n"
+    )
+    for alignment in alignments:
+        properties = f'      <prop type="x-document">{escape(alignment.document_id)}</prop>\n'
+        if alignment.score is not None:
+            properties += f'      <prop type="x-score">{alignment.score:.4f}</prop>\n'
+        yield (
+            f"    <tu tuid={quoteattr(alignment.identifier)}>\n"
+            f"{properties}"
+            f"      <tuv xml:lang={quoteattr(alignment.source_language)}><seg>{escape(alignment.source_sentence)}</seg></tuv>\n"
+            f"      <tuv xml:lang={quoteattr(alignment.target_language)}><seg>{escape(alignment.target_sentence)}</seg></tuv>\n"
+            "    </tu>\n"
+        )
+    yield "  </body>\n</tmx>\n"
+
+
+Renderer = Callable[[Iterable[SentenceAlignment], ExportFilter], Iterator[str]]
+
+FORMATS: Dict[str, tuple[Renderer, str]] = {
+    "tmx": (render_tmx, "application/x-tmx+xml"),
+    "jsonl": (render_jsonl, "application/x-ndjson"),
+    "tsv": (render_tsv, "text/tab-separated-values"),
+}
+
+
+def encode_chunks(
+    pieces: Iterable[str], *, compress: bool = False, chunk_size: int = CHUNK_SIZE, level: int = 6
+) -> Iterator[bytes]:
+    """Coalesce rendered text into UTF-8 chunks of about ``chunk_size`` bytes, optionally gzipped at ``level``."""
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31) if compress else None
+    buffer: list[bytes] = []
+    size = 0
+    for piece in pieces:
+        data = piece.encode("utf-8")
+        buffer.append(data)
+        size += len(data)
+        if size >= chunk_size:
+            payload = b"".join(buffer)
+            buffer, size = [], 0
+            if compressor is not None:
+                payload = compressor.compress(payload)
+            if payload:
+                yield payload
+    payload = b"".join(buffer)
+    if compressor is not None:
+        payload = compressor.compress(payload) + compressor.flush()
+    if payload:
+        yield payload
+
+
+def export_corpus(indexer: Any, filters: ExportFilter, export_format: str, *, compress: bool = False) -> Iterator[bytes]:
+    """Stream the filtered corpus in ``export_format`` as encoded byte chunks."""
+
+    try:
+        renderer, _ = FORMATS[export_format]
+    except KeyError:
+        raise ValueError(f"Unsupported export format: {export_format}") from None
+    return encode_chunks(renderer(iter_alignments(indexer, filters), filters), compress=compress)
+
+
+__all__ = [
+    "ExportFilter",
+    "FORMATS",
+    "encode_chunks",
+    "export_corpus",
+    "iter_alignments",
+]
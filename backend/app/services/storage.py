@@ -0,0 +1,316 @@
+"""SQL-backed persistence for corpus documents, paragraphs and alignments."""
+from __future__ import annotations
+
+import csv
+import io
+from contextlib import AbstractContextManager
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import Table, and_, delete, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from backend.app.models.corpus import Document, Paragraph, SentenceAlignment
+from backend.app.models.tables import AlignmentRecord, DocumentRecord, ParagraphRecord
+from backend.app.services.alignment import AlignmentRepository
+
+SessionFactory = Callable[[], AbstractContextManager[Session]]
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _copy_rows(session: Session, table: Table, rows: Sequence[dict[str, Any]]) -> bool:
+    """Stream rows through PostgreSQL ``COPY FROM STDIN`` when the driver supports it."""
+
+    connection = session.connection()
+    if connection.dialect.name != "postgresql":
+        return False
+    columns = [column.name for column in table.columns]
+    statement = "COPY {} ({}) FROM STDIN".format(
+        table.name, ", ".join('"{}"'.format(column) for column in columns)
+    )
+    cursor = connection.connection.driver_connection.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                writer.writerow(["\\N" if row[column] is None else row[column] for column in columns])
+            buffer.seek(0)
+            cursor.copy_expert(statement + " WITH (FORMAT csv, NULL '\\N')", buffer)
+            return True
+        if hasattr(cursor, "copy"):  # psycopg 3
+            with cursor.copy(statement) as copy:
+                for row in rows:
+                    copy.write_row([row[column] for column in columns])
+            return True
+    finally:
+        cursor.close()
+    return False
+
+
+def bulk_insert(session: Session, table: Table, rows: Iterable[dict[str, Any]], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Insert rows in batches using ``COPY`` on PostgreSQL and ``executemany`` elsewhere."""
+
+    inserted = 0
+    batch: List[dict[str, Any]] = []
+
+    def flush() -> None:
+        if not batch:
+            return
+        if not _copy_rows(session, table, batch):
+            session.execute(insert(table), batch)
+
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            flush()
+            inserted += len(batch)
+            batch = []
+    flush()
+    return inserted + len(batch)
+
+
+def _document_row(document: Document) -> dict[str, Any]:
+    return {
+        "identifier": document.identifier,
+        "title": document.title,
+        "source_language": document.source_language,
+        "target_language": document.target_language,
+        "source": document.source,
+        "publication_date": document.publication_date,
+        "official_url": document.official_url,
+        "categories": list(document.categories),
+    }
+
+
+def _to_document(record: DocumentRecord) -> Document:
+    return Document(
+        identifier=record.identifier,
+        title=record.title,
+        source_language=record.source_language,
+        target_language=record.target_language,
+        source=record.source,
+        publication_date=record.publication_date,
+        official_url=record.official_url,
+        categories=list(record.categories or []),
+    )
+
+
+def _to_paragraph(record: ParagraphRecord) -> Paragraph:
+    return Paragraph(
+        identifier=record.identifier,
+        document_id=record.document_id,
+        order=record.order,
+        language=record.language,
+        text=record.text,
+    )
+
+
+def _to_alignment(record: AlignmentRecord) -> SentenceAlignment:
+    return SentenceAlignment(
+        identifier=record.identifier,
+        document_id=record.document_id,
+        source_sentence=record.source_sentence,
+        target_sentence=record.target_sentence,
+        source_language=record.source_language,
+        target_language=record.target_language,
+        score=record.score,
+        source_paragraph=record.source_paragraph,
+        target_paragraph=record.target_paragraph,
+    )
+
+
+class SqlCorpusRepository(AlignmentRepository):
+    """Alignment repository that also persists documents and paragraphs through SQLAlchemy.
+
+    Documents must be stored with :meth:`save_document` before their alignments are saved.
+    """
+
+    durable = True
+
+    def __init__(self, session_factory: SessionFactory | None = None, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        if session_factory is None:
+            from backend.app.db import get_sync_db
+
+            session_factory = get_sync_db
+        self._session_factory = session_factory
+        self.batch_size = batch_size
+
+    def save_document(self, document: Document, paragraphs: Iterable[Paragraph]) -> None:
+        row = _document_row(document)
+        with self._session_factory() as session:
+            with session.begin():
+                existing = session.get(DocumentRecord, document.identifier)
+                if existing is None:
+                    session.execute(insert(DocumentRecord.__table__), [row])
+                else:
+                    session.execute(
+                        update(DocumentRecord.__table__)
+                        .where(DocumentRecord.identifier == document.identifier)
+                        .values(**row)
+                    )
+                session.execute(delete(ParagraphRecord.__table__).where(ParagraphRecord.document_id == document.identifier))
+                bulk_insert(
+                    session,
+                    ParagraphRecord.__table__,
+                    (
+                        {
+                            "identifier": paragraph.identifier,
+                            "document_id": paragraph.document_id,
+                            "order": paragraph.order,
+                            "language": paragraph.language,
+                            "text": paragraph.text,
+                        }
+                        for paragraph in paragraphs
+                    ),
+                    self.batch_size,
+                )
+
+    def save(
+        self,
+        document_id: str,
+        alignments: Iterable[SentenceAlignment],
+        fingerprint: Optional[str] = None,
+    ) -> List[SentenceAlignment]:
+        stored = list(alignments)
+        with self._session_factory() as session:
+            with session.begin():
+                session.execute(delete(AlignmentRecord.__table__).where(AlignmentRecord.document_id == document_id))
+                bulk_insert(
+                    session,
+                    AlignmentRecord.__table__,
+                    (
+                        {
+                            "identifier": alignment.identifier,
+                            "document_id": document_id,
+                            "position": position,
+                            "source_sentence": alignment.source_sentence,
+                            "target_sentence": alignment.target_sentence,
+                            "source_language": alignment.source_language,
+                            "target_language": alignment.target_language,
+                            "score": alignment.score,
+                            "source_paragraph": alignment.source_paragraph,
+                            "target_paragraph": alignment.target_paragraph,
+                        }
+                        for position, alignment in enumerate(stored)
+                    ),
+                    self.batch_size,
+                )
+                session.execute(
+                    update(DocumentRecord.__table__)
+                    .where(DocumentRecord.identifier == document_id)
+                    .values(fingerprint=fingerprint)
+                )
+        return stored
+
+    def get(self, document_id: str) -> List[SentenceAlignment]:
+        return list(self.iter_alignments(document_id))
+
+    def get_fingerprint(self, document_id: str) -> Optional[str]:
+        with self._session_factory() as session:
+            return session.scalar(
+                select(DocumentRecord.fingerprint).where(DocumentRecord.identifier == document_id)
+            )
+
+    def get_document(self, document_id: str) -> Optional[Document]:
+        with self._session_factory() as session:
+            record = session.get(DocumentRecord, document_id)
+            return _to_document(record) if record is not None else None
+
+    def iter_documents(self, after: Optional[str] = None) -> Iterator[Document]:
+        """Yield all documents ordered by identifier using keyset pagination."""
+
+        while True:
+            with self._session_factory() as session:
+                statement = select(DocumentRecord).order_by(DocumentRecord.identifier).limit(self.batch_size)
+                if after is not None:
+                    statement = statement.where(DocumentRecord.identifier > after)
+                records = session.scalars(statement).all()
+            if not records:
+                return
+            for record in records:
+                yield _to_document(record)
+            after = records[-1].identifier
+
+    def update_document(self, document: Document) -> None:
+        """Update the stored metadata of a document, leaving its paragraphs and alignments alone."""
+
+        row = _document_row(document)
+        with self._session_factory() as session:
+            with session.begin():
+                session.execute(
+                    update(DocumentRecord.__table__).where(DocumentRecord.identifier == document.identifier).values(**row)
+                )
+
+    def iter_paragraphs(self, document_id: str) -> Iterator[Paragraph]:
+        """Yield a document's paragraphs ordered by ``(order, identifier)`` using keyset pagination."""
+
+        after: Optional[tuple[int, str]] = None
+        while True:
+            with self._session_factory() as session:
+                statement = (
+                    select(ParagraphRecord)
+                    .where(ParagraphRecord.document_id == document_id)
+                    .order_by(ParagraphRecord.order, ParagraphRecord.identifier)
+                    .limit(self.batch_size)
+                )
+                if after is not None:
+                    last_order, last_identifier = after
+                    statement = statement.where(
+                        or_(
+                            ParagraphRecord.order > last_order,
+                            and_(ParagraphRecord.order == last_order, ParagraphRecord.identifier > last_identifier),
+                        )
+                    )
+                records = session.scalars(statement).all()
+            if not records:
+                return
+            for record in records:
+                yield _to_paragraph(record)
+            after = (records[-1].order, records[-1].identifier)
+
+    def iter_alignments(
+        self,
+        document_id: Optional[str] = None,
+        after: Optional[tuple[str, int]] = None,
+    ) -> Iterator[SentenceAlignment]:
+        """Yield alignments ordered by ``(document_id, position)`` using keyset pagination.
+
+        ``after`` is the ``(document_id, position)`` key of the last row already seen.
+        """
+
+        while True:
+            with self._session_factory() as session:
+                statement = (
+                    select(AlignmentRecord)
+                    .order_by(AlignmentRecord.document_id, AlignmentRecord.position)
+                    .limit(self.batch_size)
+                )
+                if document_id is not None:
+                    statement = statement.where(AlignmentRecord.document_id == document_id)
+                if after is not None:
+                    last_document, last_position = after
+                    statement = statement.where(
+                        or_(
+                            AlignmentRecord.document_id > last_document,
+                            and_(AlignmentRecord.document_id == last_document, AlignmentRecord.position > last_position),
+                        )
+                    )
+                records = session.scalars(statement).all()
+            if not records:
+                return
+            for record in records:
+                yield _to_alignment(record)
+            after = (records[-1].document_id, records[-1].position)
+
+    def load_into(self, indexer: Any) -> int:
+        """Rebuild an in-memory index from the stored corpus, returning the number of documents."""
+
+        count = 0
+        for document in self.iter_documents():
+            indexer.index_document(document, self.iter_paragraphs(document.identifier), self.get(document.identifier))
+            count += 1
+        return count
+
+
+__all__ = ["SqlCorpusRepository", "bulk_insert"]
@@ -0,0 +1,307 @@
+"""Translation-memory fuzzy matching over aligned sentence pairs."""
+from __future__ import annotations
+
+import math
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from backend.app.core.normalization import DEFAULT_OPTIONS, NormalizationOptions, normalize
+from backend.app.core.workers import Deadline
+from backend.app.models.corpus import SentenceAlignment
+
+DEFAULT_NGRAM_SIZE = 2
+DEFAULT_THRESHOLD = 0.7
+DEFAULT_LIMIT = 5
+_EPSILON = 1e-9
+# Candidates verified between deadline checks.
+_DEADLINE_CHECK_INTERVAL = 1024
+
+
+@dataclass
+class TranslationMatch:
+    alignment: SentenceAlignment
+    matched_side: str
+    similarity: float
+
+    def to_dict(self) -> dict:
+        return {
+            "alignment_id": self.alignment.identifier,
+            "document_id": self.alignment.document_id,
+            "source_sentence": self.alignment.source_sentence,
+            "target_sentence": self.alignment.target_sentence,
+            "source_language": self.alignment.source_language,
+            "target_language": self.alignment.target_language,
+            "matched": self.matched_side,
+            "similarity": round(self.similarity * 100, 1),
+        }
+
+
+@dataclass
+class _Segment:
+    alignment: SentenceAlignment
+    side: str
+    language: str
+    text: str
+
+
+def _normalize(text: str, options: NormalizationOptions = DEFAULT_OPTIONS) -> str:
+    return " ".join(normalize(text, options).split())
+
+
+def _ngrams(text: str, size: int) -> Counter:
+    if len(text) < size:
+        return Counter([text]) if text else Counter()
+    return Counter(text[index : index + size] for index in range(len(text) - size + 1))
+
+
+def _pattern_masks(pattern: str) -> Dict[str, int]:
+    masks: Dict[str, int] = {}
+    for index, character in enumerate(pattern):
+        masks[character] = masks.get(character, 0) | (1 << index)
+    return masks
+
+
+def _bit_parallel_distance(masks: Dict[str, int], length: int, text: str, limit: int) -> Optional[int]:
+    """Myers/Hyyrö bit-vector Levenshtein distance with an early exit past ``limit``."""
+
+    if length == 0:
+        return len(text) if len(text) <= limit else None
+    full = (1 << length) - 1
+    high_bit = 1 << (length - 1)
+    positive, negative = full, 0
+    score = length
+    remaining = len(text)
+    for character in text:
+        equal = masks.get(character, 0)
+        vertical = equal | negative
+        horizontal = (((equal & positive) + positive) ^ positive) | equal
+        h_positive = negative | ~(horizontal | positive)
+        h_negative = positive & horizontal
+        if h_positive & high_bit:
+            score += 1
+        elif h_negative & high_bit:
+            score -= 1
+        remaining -= 1
+        # Each remaining text character can lower the final distance by at most one.
+        if score - remaining > limit:
+            return None
+        h_positive = (h_positive << 1) | 1
+        h_negative <<= 1
+        positive = (h_negative | ~(vertical | h_positive)) & full
+        negative = h_positive & vertical & full
+    return score if score <= limit else None
+
+
+def bounded_edit_distance(left: str, right: str, limit: int) -> Optional[int]:
+    """Levenshtein distance between two strings, or ``None`` when it exceeds ``limit``."""
+
+    if abs(len(left) - len(right)) > limit:
+        return None
+    return _bit_parallel_distance(_pattern_masks(left), len(left), right, limit)
+
+
+class TranslationMemory:
+    """Character n-gram index over both sides of the stored sentence alignments.
+
+    Lookups gather candidates from the rarest query n-grams, prune them by length and
+    shared n-gram count, and only compute edit distance for the survivors.
+    """
+
+    def __init__(self, ngram_size: int = DEFAULT_NGRAM_SIZE, options: NormalizationOptions = DEFAULT_OPTIONS) -> None:
+        self.ngram_size = ngram_size
+        self.options = options
+        self._segments: List[Optional[_Segment]] = []
+        self._lengths: List[int] = []
+        # language -> gram -> segment ids
+        self._postings: Dict[str, Dict[str, List[int]]] = {}
+        self._by_document: Dict[str, List[int]] = {}
+        self._removed = 0
+        self._lock = threading.RLock()
+        # Label of the contents last loaded with ``replace``, such as a shared-index generation.
+        self.generation: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._segments) - self._removed
+
+    def add_alignments(self, document_id: str, alignments: Iterable[SentenceAlignment]) -> None:
+        """Index the alignments of a document, replacing any previously stored ones."""
+
+        with self._lock:
+            self.remove_document(document_id)
+            segment_ids: List[int] = []
+            for alignment in alignments:
+                for side, sentence, language in (
+                    ("source", alignment.source_sentence, alignment.source_language),
+                    ("target", alignment.target_sentence, alignment.target_language),
+                ):
+                    text = _normalize(sentence, self.options)
+                    if not text:
+                        continue
+                    segment_id = len(self._segments)
+                    self._segments.append(_Segment(alignment=alignment, side=side, language=language, text=text))
+                    self._lengths.append(len(text))
+                    postings = self._postings.setdefault(language, {})
+                    for gram in _ngrams(text, self.ngram_size):
+                        postings.setdefault(gram, []).append(segment_id)
+                    segment_ids.append(segment_id)
+            self._by_document[document_id] = segment_ids
+
+    def replace(self, documents: Iterable[Tuple[str, Iterable[SentenceAlignment]]], generation: Optional[int] = None) -> None:
+        """Swap in a memory built from ``documents``; lookups use the old contents until the swap."""
+
+        fresh = TranslationMemory(self.ngram_size, self.options)
+        for document_id, alignments in documents:
+            fresh.add_alignments(document_id, alignments)
+        with self._lock:
+            self._segments, self._lengths, self._postings = fresh._segments, fresh._lengths, fresh._postings
+            self._by_document, self._removed = fresh._by_document, fresh._removed
+            self.generation = generation
+
+    def remove_document(self, document_id: str) -> None:
+        with self._lock:
+            for segment_id in self._by_document.pop(document_id, []):
+                self._segments[segment_id] = None
+                self._lengths[segment_id] = -1
+                self._removed += 1
+            if self._removed > len(self._segments) // 2:
+                self._compact()
+
+    def _compact(self) -> None:
+        live = [segment for segment in self._segments if segment is not None]
+        self._segments = []
+        self._lengths = []
+        self._postings = {}
+        self._by_document = {}
+        self._removed = 0
+        for segment in live:
+            segment_id = len(self._segments)
+            self._segments.append(segment)
+            self._lengths.append(len(segment.text))
+            postings = self._postings.setdefault(segment.language, {})
+            for gram in _ngrams(segment.text, self.ngram_size):
+                postings.setdefault(gram, []).append(segment_id)
+            self._by_document.setdefault(segment.alignment.document_id, []).append(segment_id)
+
+    def _candidates(
+        self,
+        grams: Counter,
+        min_shared: int,
+        min_length: int,
+        max_length: int,
+        language: Optional[str],
+    ) -> Iterable[int]:
+        lengths = self._lengths
+        if min_shared <= 0:
+            # The count filter cannot prune anything, so only the length filter applies.
+            return (
+                segment_id for segment_id, length in enumerate(lengths) if min_length <= length <= max_length
+            )
+        if language is not None:
+            indexes = [self._postings.get(language, {})]
+        else:
+            indexes = list(self._postings.values())
+
+        def postings_for(gram: str) -> List[List[int]]:
+            return [index[gram] for index in indexes if gram in index]
+
+        # A candidate sharing ``min_shared`` of the query grams must contain at least one of
+        # the rarest ``total - min_shared + 1`` gram occurrences.
+        needed = sum(grams.values()) - min_shared + 1
+        candidates: set[int] = set()
+        for gram in sorted(grams, key=lambda item: sum(map(len, postings_for(item)))):
+            for postings in postings_for(gram):
+                candidates.update(
+                    segment_id for segment_id in postings if min_length <= lengths[segment_id] <= max_length
+                )
+            needed -= grams[gram]
+            if needed <= 0:
+                break
+        return candidates
+
+    def lookup(
+        self,
+        segment: str,
+        *,
+        limit: int = DEFAULT_LIMIT,
+        threshold: float = DEFAULT_THRESHOLD,
+        language: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> List[TranslationMatch]:
+        """Return the stored sentence pairs most similar to ``segment``, best first."""
+
+        query = _normalize(segment, self.options)
+        if not query:
+            return []
+        threshold = min(max(threshold, 0.0), 1.0)
+        size = self.ngram_size
+        query_length = len(query)
+        query_grams = _ngrams(query, size)
+        min_length = int(query_length * threshold)
+        max_length = int(query_length / threshold + _EPSILON) if threshold else 1 << 30
+        # Lower bound on shared grams over every admissible candidate length (q-gram lemma).
+        slope = 1 - (1 - threshold) * size
+        min_shared = 0
+        if query_length >= size and slope > 0:
+            min_shared = max(0, math.ceil(query_length * slope - size + 1 - _EPSILON))
+
+        distinct_grams = list(query_grams) if query_length >= size else []
+        masks = _pattern_masks(query)
+        best: Dict[str, TranslationMatch] = {}
+        with self._lock:
+            candidates = self._candidates(query_grams, min_shared, min_length, max_length, language)
+            for examined, segment_id in enumerate(candidates):
+                if deadline is not None and examined % _DEADLINE_CHECK_INTERVAL == 0:
+                    deadline.check()
+                candidate = self._segments[segment_id]
+                if language and candidate.language != language:
+                    continue
+                longest = max(query_length, len(candidate.text))
+                allowed = int((1 - threshold) * longest + _EPSILON)
+                # Each edit removes at most ``size`` distinct query grams from the candidate.
+                required = len(distinct_grams) - allowed * size
+                if required > 0:
+                    text = candidate.text
+                    if sum(1 for gram in distinct_grams if gram in text) < required:
+                        continue
+                if abs(query_length - len(candidate.text)) > allowed:
+                    continue
+                distance = _bit_parallel_distance(masks, query_length, candidate.text, allowed)
+                if distance is None:
+                    continue
+                similarity = 1 - distance / longest
+                if similarity + _EPSILON < threshold:
+                    continue
+                key = candidate.alignment.identifier
+                current = best.get(key)
+                if current is None or similarity > current.similarity:
+                    best[key] = TranslationMatch(
+                        alignment=candidate.alignment, matched_side=candidate.side, similarity=similarity
+                    )
+        return sorted(best.values(), key=lambda match: match.similarity, reverse=True)[:limit]
+
+    def lookup_many(
+        self,
+        segments: Sequence[str],
+        *,
+        limit: int = DEFAULT_LIMIT,
+        threshold: float = DEFAULT_THRESHOLD,
+        language: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> List[List[TranslationMatch]]:
+        """Look up a batch of segments, computing each distinct segment only once."""
+
+        cache: Dict[str, List[TranslationMatch]] = {}
+        results = []
+        for segment in segments:
+            key = _normalize(segment, self.options)
+            if key not in cache:
+                cache[key] = self.lookup(
+                    segment, limit=limit, threshold=threshold, language=language, deadline=deadline
+                )
+            results.append(cache[key])
+        return results
+
+
+__all__ = ["TranslationMatch", "TranslationMemory", "bounded_edit_distance"]
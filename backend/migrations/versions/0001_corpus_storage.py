@@ -0,0 +1,78 @@
+"""Create corpus storage tables.
+
+Revision ID: 0001_corpus_storage
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_corpus_storage"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "documents",
+        sa.Column("identifier", sa.String(length=255), primary_key=True),
+        sa.Column("title", sa.Text(), nullable=False),
+        sa.Column("source_language", sa.String(length=16), nullable=False),
+        sa.Column("target_language", sa.String(length=16), nullable=False),
+        sa.Column("source", sa.Text(), nullable=False),
+        sa.Column("publication_date", sa.Date(), nullable=True),
+        sa.Column("official_url", sa.Text(), nullable=True),
+        sa.Column("categories", sa.JSON(), nullable=False),
+        sa.Column("fingerprint", sa.String(length=64), nullable=True),
+    )
+    op.create_table(
+        "paragraphs",
+        sa.Column("identifier", sa.String(length=255), primary_key=True),
+        sa.Column(
+            "document_id",
+            sa.String(length=255),
+            sa.ForeignKey("documents.identifier", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("order", sa.Integer(), nullable=False),
+        sa.Column("language", sa.String(length=16), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+    )
+    op.create_index("ix_paragraphs_document_order", "paragraphs", ["document_id", "order"])
+    op.create_table(
+        "alignments",
+        sa.Column("identifier", sa.String(length=36), primary_key=True),
+        sa.Column(
+            "document_id",
+            sa.String(length=255),
+            sa.ForeignKey("documents.identifier", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("source_sentence", sa.Text(), nullable=False),
+        sa.Column("target_sentence", sa.Text(), nullable=False),
+        sa.Column("source_language", sa.String(length=16), nullable=False),
+        sa.Column("target_language", sa.String(length=16), nullable=False),
+        sa.Column("score", sa.Float(), nullable=True),
+        sa.Column("source_paragraph", sa.Integer(), nullable=True),
+        sa.Column("target_paragraph", sa.Integer(), nullable=True),
+    )
+    op.create_index(
+        "ix_alignments_document_position", "alignments", ["document_id", "position"], unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_alignments_document_position", table_name="alignments")
+    op.drop_table("alignments")
+    op.drop_index("ix_paragraphs_document_order", table_name="paragraphs")
+    op.drop_table("paragraphs")
+    op.drop_table("documents")
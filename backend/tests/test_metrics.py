@@ -0,0 +1,54 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.config import settings
+from backend.app.core.metrics import CONTENT_TYPE, Counter, GaugeCallback, Histogram, Registry
+
+
+def test_registry_renders_prometheus_text() -> None:
+    registry = Registry()
+    requests = Counter("demo_requests", "Requests.", ["cache", "result"], registry=registry)
+    latency = Histogram("demo_seconds", "Latency.", ["function"], buckets=(0.1, 1.0), registry=registry)
+    GaugeCallback("demo_size", "Size.", ["index"], lambda: [(("corpus",), 3)], registry=registry)
+
+    requests.labels("terms", "hit").inc()
+    requests.labels("terms", "hit").inc(2)
+    latency.labels("search").observe(0.05)
+    latency.labels("search").observe(0.5)
+    latency.labels("search").observe(5)
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE demo_requests counter" in lines
+    assert 'demo_requests_total{cache="terms",result="hit"} 3' in lines
+    assert 'demo_seconds_bucket{function="search",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{function="search",le="1"} 2' in lines
+    assert 'demo_seconds_bucket{function="search",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{function="search"} 3' in lines
+    assert 'demo_seconds_sum{function="search"} 5.55' in lines
+    assert 'demo_size{index="corpus"} 3' in lines
+
+
+def test_duplicate_metric_names_are_rejected() -> None:
+    registry = Registry()
+    Counter("demo_requests", "Requests.", registry=registry)
+
+    with pytest.raises(ValueError):
+        Counter("demo_requests", "Requests.", registry=registry)
+
+
+def test_metrics_endpoint_reports_requests_and_index_sizes(monkeypatch: pytest.MonkeyPatch) -> None:
+    from backend.app.main import app
+
+    monkeypatch.setattr(settings, "warmup_in_background", False)
+    with TestClient(app) as client:
+        client.get("/api/v1/healthz")
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CONTENT_TYPE
+    body = response.text
+    assert 'zhbn_http_request_duration_seconds_count{method="GET",handler="health_check",status="200"}' in body
+    assert 'zhbn_index_size{index="corpus",unit="documents"}' in body
+    assert 'zhbn_index_size{index="terms",unit="terms"}' in body
+    assert 'zhbn_cache_requests_total{cache="terms",result="miss"}' in body
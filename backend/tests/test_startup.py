@@ -0,0 +1,74 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app import db
+from backend.app.config import settings
+from backend.app.core.lifecycle import Readiness, lazy_singleton, run_warm_up
+
+
+def test_importing_the_app_does_not_create_engines() -> None:
+    from backend.app.main import app  # noqa: F401
+
+    assert db.get_engine.cache_info().currsize == 0
+    assert db.get_sync_engine.cache_info().currsize == 0
+    assert "asyncpg" not in sys.modules
+
+
+def test_readiness_reports_warm_up(monkeypatch: pytest.MonkeyPatch) -> None:
+    from backend.app.main import app
+
+    monkeypatch.setattr(settings, "warmup_in_background", False)
+    with TestClient(app) as client:
+        response = client.get("/api/v1/readyz")
+        assert response.status_code == 200
+        assert set(response.json()["warm_up_seconds"]) == {"corpus_index", "terms"}
+
+        app.state.readiness.state = "starting"
+        assert client.get("/api/v1/readyz").status_code == 503
+        assert client.get("/api/v1/healthz").status_code == 200
+
+
+def test_failed_warm_up_is_reported() -> None:
+    readiness = Readiness()
+
+    def broken() -> None:
+        raise RuntimeError("index unavailable")
+
+    run_warm_up([("corpus_index", broken), ("terms", lambda: None)], readiness)
+
+    assert readiness.state == "failed"
+    assert readiness.error == "corpus_index: index unavailable"
+    assert "terms" not in readiness.durations
+
+
+def test_lazy_singleton_builds_once_under_concurrent_first_use() -> None:
+    built = []
+    start = threading.Barrier(8)
+
+    @lazy_singleton
+    def get_index() -> object:
+        time.sleep(0.05)  # a slow build widens the window for a second construction
+        built.append(object())
+        return built[-1]
+
+    assert get_index.cache_info().currsize == 0
+
+    def first_use() -> object:
+        start.wait()
+        return get_index()
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda _: first_use(), range(8)))
+
+    assert len(built) == 1
+    assert all(result is built[0] for result in results)
+    assert get_index.cache_info().currsize == 1
+
+    get_index.cache_clear()
+    assert get_index.cache_info().currsize == 0
+    assert get_index() is built[1]
@@ -151,3 +151,126 @@ def test_save_terms_uses_atomic_write(tmp_path: Path, monkeypatch: pytest.Monkey
     repository.save_terms(terms)
     assert storage_path.exists()
     assert repository.load_terms() == terms
+
+
+def test_search_folds_width_and_traditional_forms(tmp_path: Path) -> None:
+    storage_path = tmp_path / "terms.json"
+    terms = [
+        build_term(
+            "海关税",
+            "进出口货物应缴纳的税款",
+            "Customs duty levied on imports and exports",
+            "আমদানি ও রপ্তানির উপর আরোপিত শুল্ক",
+            [
+                {
+                    "chinese": "征收海关税",
+                    "english": "levy customs duty",
+                    "bengali": "শুল্ক আরোপ",
+                }
+            ],
+        )
+    ]
+    write_terms(storage_path, terms)
+    repository = TermsRepository(storage_path)
+
+    assert repository.search("海關稅") == terms
+    assert repository.search("ＣＵＳＴＯＭＳ") == terms
+
+    repository.save_terms([])
+    assert repository.search("海关税") == []
+
+
+def test_search_profile_counts_cache_and_matches(tmp_path: Path) -> None:
+    from backend.app.core.profiling import QueryProfile
+
+    storage_path = tmp_path / "terms.json"
+    write_terms(
+        storage_path,
+        [
+            build_term("海关", "海关机关", "Customs authority", "কাস্টমস কর্তৃপক্ষ", []),
+            build_term("合同", "合同协议", "Contract", "চুক্তি", []),
+        ],
+    )
+    repository = TermsRepository(storage_path)
+    first, second = QueryProfile(), QueryProfile()
+
+    assert repository.search("海关", first) == repository.search("海关", second)
+    assert first.counters == {"cache_misses": 1, "candidates_examined": 2, "postings_read": 2, "hits_scored": 1}
+    assert second.counters["cache_hits"] == 1
+    assert list(first.phases) == ["load", "normalize", "match"]
+
+
+def test_search_many_dedupes_queries_against_one_snapshot(tmp_path: Path) -> None:
+    storage_path = tmp_path / "terms.json"
+    write_terms(
+        storage_path,
+        [
+            build_term("海关", "海关机关", "Customs authority", "কাস্টমস কর্তৃপক্ষ", []),
+            build_term("合同", "合同协议", "Contract", "চুক্তি", []),
+        ],
+    )
+    repository = TermsRepository(storage_path)
+
+    results = repository.search_many(["海关", "海關", "海关", None, "missing", "\x1f"])
+
+    assert list(results) == ["海关", "海關", None, "missing", "\x1f"]
+    assert [term.headword for term in results["海关"]] == ["海关"]
+    assert results["海關"] is results["海关"]
+    assert len(results[None]) == 2
+    assert results["missing"] == results["\x1f"] == []
+    for query, terms in results.items():
+        assert terms == repository.search(query)
+
+
+def test_shared_terms_match_repository_search(tmp_path: Path) -> None:
+    from backend.app.search.shared import ReadOnlyIndexError, SharedIndexDirectory, SharedTermsRepository
+
+    storage_path = tmp_path / "terms.json"
+    terms = [
+        build_term("海关", "海关机关", "Customs authority", "কাস্টমস কর্তৃপক্ষ", []),
+        build_term("合同", "合同协议", "Contract", "চুক্তি", []),
+    ]
+    write_terms(storage_path, terms)
+    repository = TermsRepository(storage_path)
+    SharedIndexDirectory(tmp_path / "shared").publish([], repository.load_terms())
+    shared = SharedTermsRepository(tmp_path / "shared")
+
+    queries = (None, "海關", "CONTRACT", "চুক্তি", "missing", "\x1f")
+    for query in queries:
+        assert [term.headword for term in shared.search(query)] == [term.headword for term in repository.search(query)]
+    shared_results, results = shared.search_many(queries), repository.search_many(queries)
+    assert list(shared_results) == list(results)
+    for query in queries:
+        assert [term.headword for term in shared_results[query]] == [term.headword for term in results[query]]
+    assert shared.stats()["terms"] == 2
+    with pytest.raises(ReadOnlyIndexError):
+        shared.merge_terms(terms)
+
+
+def test_batch_endpoint_streams_one_line_per_distinct_query(tmp_path: Path) -> None:
+    from fastapi.testclient import TestClient
+
+    from backend.app.api.terms import get_terms_repository
+    from backend.app.main import app
+
+    storage_path = tmp_path / "terms.json"
+    write_terms(
+        storage_path,
+        [
+            build_term("海关", "海关机关", "Customs authority", "কাস্টমস কর্তৃপক্ষ", []),
+            build_term("合同", "合同协议", "Contract", "চুক্তি", []),
+        ],
+    )
+    app.dependency_overrides[get_terms_repository] = lambda: TermsRepository(storage_path)
+    try:
+        with TestClient(app) as client:
+            response = client.post("/api/v1/terms/batch", json={"queries": ["海关", "contract", " 海关 ", "missing"]})
+    finally:
+        app.dependency_overrides.pop(get_terms_repository)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-encoding"] == "gzip"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["query"] for line in lines] == ["海关", "contract", "missing"]
+    assert [[item["headword"] for item in line["items"]] for line in lines] == [["海关"], ["合同"], []]
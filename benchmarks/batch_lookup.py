@@ -0,0 +1,114 @@
+"""Compare batch term and document lookups with the equivalent sequential requests.
+
+A page render or file pre-annotation is modelled as ``--lookups`` term queries and document
+fetches with Zipf-distributed repeats. Each workload is sent once as individual
+``GET /terms?q=`` and ``GET /corpus/{document_id}`` requests and once as a single
+``POST /terms/batch`` or ``POST /corpus/batch``, plain and gzip-encoded, through the
+in-process ASGI client. Run with ``python -m benchmarks.batch_lookup --lookups 100,500``.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from backend.app.api.terms import get_terms_repository
+from backend.app.api.v1.corpus import get_indexer
+from backend.app.config import settings
+from backend.app.models.terms import TermsRepository
+from benchmarks.synthetic import DEFAULT_SEED, generate_statutes, generate_terms
+
+
+def _zipf_sample(rng: random.Random, population: List[str], count: int) -> List[str]:
+    weights = [1 / rank for rank in range(1, len(population) + 1)]
+    return rng.choices(population, weights=weights, k=count)
+
+
+def _time(func: Callable[[], int], repeat: int) -> Tuple[float, int]:
+    samples, size = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), size
+
+
+# Both helpers return the bytes on the wire; the client decodes gzip transparently.
+def _get(client, path: str, params: Optional[dict]) -> int:
+    response = client.get(path, params=params)
+    response.raise_for_status()
+    return response.num_bytes_downloaded
+
+
+def _post(client, path: str, body: dict, encoding: str) -> int:
+    response = client.post(path, json=body, headers={"Accept-Encoding": encoding})
+    response.raise_for_status()
+    return response.num_bytes_downloaded
+
+
+def run(lookup_counts: Iterable[int], documents: int, terms: int, repeat: int, seed: int) -> None:
+    from fastapi.testclient import TestClient
+
+    from backend.app.main import app
+
+    rng = random.Random(seed)
+    statutes = list(generate_statutes(documents, seed=seed))
+    dictionary = generate_terms(terms, seed=seed)
+    settings.warmup_in_background = False
+    with tempfile.TemporaryDirectory() as directory:
+        repository = TermsRepository(Path(directory) / "terms.json")
+        repository.save_terms(dictionary)
+        app.dependency_overrides[get_terms_repository] = lambda: repository
+        with TestClient(app) as client:
+            indexer = get_indexer()
+            for statute in statutes:
+                indexer.index_document(statute.document, statute.paragraphs(), statute.alignments())
+            document_ids = [statute.document.identifier for statute in statutes]
+            term_queries = [term.headword for term in dictionary]
+            print(f"{documents} documents, {terms} terms, median of {repeat}")
+            print(f"{'workload':<10} {'lookups':>7} {'distinct':>8} {'mode':>12} {'time ms':>9} {'lookups/s':>10} {'KiB':>8}")
+            for count in lookup_counts:
+                workloads = {
+                    "documents": (
+                        _zipf_sample(rng, document_ids, count),
+                        lambda document_id: ("/api/v1/corpus/" + document_id, None),
+                        lambda keys: ("/api/v1/corpus/batch", {"document_ids": keys}),
+                    ),
+                    "terms": (
+                        _zipf_sample(rng, term_queries, count),
+                        lambda query: ("/api/v1/terms", {"q": query}),
+                        lambda keys: ("/api/v1/terms/batch", {"queries": keys}),
+                    ),
+                }
+                for workload, (keys, single, batch) in workloads.items():
+                    modes = {
+                        "sequential": lambda: sum(_get(client, *single(key)) for key in keys),
+                        "batch": lambda: _post(client, *batch(keys), "identity"),
+                        "batch gzip": lambda: _post(client, *batch(keys), "gzip"),
+                    }
+                    for mode, func in modes.items():
+                        elapsed, size = _time(func, repeat)
+                        print(
+                            f"{workload:<10} {count:>7} {len(set(keys)):>8} {mode:>12} {elapsed * 1000:>9.1f} "
+                            f"{count / elapsed:>10.0f} {size / 1024:>8.1f}"
+                        )
+        app.dependency_overrides.pop(get_terms_repository, None)
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lookups", default="100,500", help="Comma separated lookups per workload")
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--terms", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args(argv)
+    run([int(count) for count in args.lookups.split(",")], args.documents, args.terms, args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
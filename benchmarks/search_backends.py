@@ -0,0 +1,67 @@
+"""Compare the in-memory and SQLite FTS5 corpus search backends.
+
+Run with ``python -m benchmarks.search_backends --sizes 10000,100000,1000000``.
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Iterable
+
+from backend.app.search.indexer import CorpusIndexer
+from backend.app.search.sqlite import SqliteCorpusIndexer
+from benchmarks.synthetic import QUERIES, build_corpus
+
+
+def _time(func: Callable[[], object], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def run(sizes: Iterable[int], repeat: int) -> None:
+    print(f"{'sentences':>10} {'engine':>7} {'index s':>9} " + " ".join(f"{name:>11}" for name in QUERIES))
+    for size in sizes:
+        corpus = build_corpus(size)
+        with tempfile.TemporaryDirectory() as directory:
+            engines = {
+                "memory": CorpusIndexer(),
+                "sqlite": SqliteCorpusIndexer(str(Path(directory) / "bench.sqlite3")),
+            }
+            for name, engine in engines.items():
+                started = time.perf_counter()
+                if isinstance(engine, SqliteCorpusIndexer):
+                    with engine.batch():
+                        for document, paragraphs, alignments in corpus:
+                            engine.index_document(document, paragraphs, alignments)
+                else:
+                    for document, paragraphs, alignments in corpus:
+                        engine.index_document(document, paragraphs, alignments)
+                index_seconds = time.perf_counter() - started
+                latencies = [
+                    _time(lambda query=query: engine.search(query, page_size=10), repeat) * 1000
+                    for query in QUERIES.values()
+                ]
+                print(
+                    f"{size:>10} {name:>7} {index_seconds:>9.2f} "
+                    + " ".join(f"{latency:>9.1f}ms" for latency in latencies)
+                )
+            engines["sqlite"].close()
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma separated sentence counts")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions per query")
+    args = parser.parse_args(argv)
+    run([int(size) for size in args.sizes.split(",")], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
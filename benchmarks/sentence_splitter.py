@@ -0,0 +1,71 @@
+"""Measure sentence splitting throughput on a large synthetic statute.
+
+Run with ``python -m benchmarks.sentence_splitter --megabytes 8``.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import re
+import time
+from typing import Callable, Iterable
+
+from backend.app.services.alignment import SentenceSplitter
+from benchmarks.synthetic import generate_statutes
+
+
+def _statute(megabytes: float, language: str) -> str:
+    texts = []
+    size = 0
+    target = int(megabytes * (1 << 20))
+    for statute in generate_statutes(max(1, int(megabytes * 100))):
+        text = statute.source_text if language == "bn" else statute.target_text
+        texts.append(text)
+        size += len(text.encode("utf-8")) + 1
+        if size >= target:
+            break
+    text = "\n".join(texts)
+    while len(text.encode("utf-8")) < target:
+        text = f"{text}\n{text}"
+    return text
+
+
+def _legacy_split(text: str) -> list[str]:
+    sentences = []
+    start = 0
+    for match in re.finditer(r"[。！？.!?]", text):
+        sentences.append(text[start : match.end()].strip())
+        start = match.end()
+    if start < len(text):
+        sentences.append(text[start:].strip())
+    return [sentence for sentence in sentences if sentence]
+
+
+def _measure(label: str, megabytes: float, split: Callable[[], int]) -> None:
+    started = time.perf_counter()
+    count = split()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<22} {count:>9} sentences  {megabytes / elapsed:8.1f} MB/s")
+
+
+def run(megabytes: float, languages: Iterable[str]) -> None:
+    splitter = SentenceSplitter()
+    for language in languages:
+        text = _statute(megabytes, language)
+        size = len(text.encode("utf-8")) / (1 << 20)
+        print(f"{language}: {size:.1f} MB")
+        _measure("legacy split", size, lambda: len(_legacy_split(text)))
+        _measure("iter_sentences", size, lambda: sum(1 for _ in splitter.iter_sentences(text, language)))
+        _measure("iter_stream", size, lambda: sum(1 for _ in splitter.iter_stream(io.StringIO(text), language)))
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--megabytes", type=float, default=8.0)
+    parser.add_argument("--languages", default="bn,zh")
+    args = parser.parse_args(argv)
+    run(args.megabytes, args.languages.split(","))
+
+
+if __name__ == "__main__":
+    main()
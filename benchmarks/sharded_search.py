@@ -0,0 +1,53 @@
+"""Measure corpus query throughput as the number of search shards grows.
+
+Run with ``python -m benchmarks.sharded_search --sentences 200000 --shards 1,2,4,8``.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+from backend.app.search.indexer import CorpusIndexer
+from backend.app.search.sharded import ShardedCorpusIndexer
+from benchmarks.synthetic import QUERIES, build_corpus
+
+
+def _throughput(engine, queries: list[str], clients: int) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(lambda query: engine.search(query, page_size=10), queries))
+    return len(queries) / (time.perf_counter() - started)
+
+
+def run(sentences: int, shard_counts: Iterable[int], requests: int, clients: int) -> None:
+    corpus = build_corpus(sentences)
+    queries = [list(QUERIES.values())[index % len(QUERIES)] for index in range(requests)]
+    print(f"{sentences} sentences, {requests} queries, {clients} clients, {os.cpu_count()} CPUs")
+    baseline = CorpusIndexer()
+    for document, paragraphs, alignments in corpus:
+        baseline.index_document(document, paragraphs, alignments)
+    single = _throughput(baseline, queries, clients)
+    print(f"{'unsharded':>10} {single:>9.1f} q/s")
+    for shards in shard_counts:
+        with ShardedCorpusIndexer(shards) as engine:
+            for document, paragraphs, alignments in corpus:
+                engine.index_document(document, paragraphs, alignments)
+            rate = _throughput(engine, queries, clients)
+        print(f"{shards:>4} shards {rate:>9.1f} q/s  x{rate / single:.2f}")
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sentences", type=int, default=200000)
+    parser.add_argument("--shards", default="1,2,4,8", help="Comma separated shard counts")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=8)
+    args = parser.parse_args(argv)
+    run(args.sentences, [int(count) for count in args.shards.split(",")], args.requests, args.clients)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Compare the memory of worker processes that build private indexes with ones attached to a shared index.
+
+Each mode starts ``--workers`` processes that load the corpus and terms and run the standard
+queries, then reports their summed proportional set size (PSS, which splits shared pages
+between the processes mapping them), interpreter and imports included. Linux only. Run with
+``python -m benchmarks.shared_index --sentences 100000 --workers 1,2,4``.
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterable
+
+from backend.app.models.terms import TermsRepository
+from backend.app.search.indexer import CorpusIndexer
+from backend.app.search.shared import SharedCorpusIndexer, SharedIndexDirectory, SharedTermsRepository
+from benchmarks.synthetic import QUERIES, build_corpus, generate_terms
+
+TERM_QUERIES = ["海关", "合同法院", "কাস্টমস"]
+
+
+def _pss_bytes(pid: int) -> int:
+    with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as fp:
+        for line in fp:
+            if line.startswith("Pss:"):
+                return int(line.split()[1]) * 1024
+    raise RuntimeError("Pss not reported by the kernel")
+
+
+def _worker(mode: str, directory: str, sentences: int, ready, release) -> None:
+    if mode == "private":
+        indexer = CorpusIndexer()
+        for entry in build_corpus(sentences):
+            indexer.index_document(*entry)
+        repository = TermsRepository(Path(directory) / "terms.json")
+    else:
+        indexer = SharedCorpusIndexer(directory)
+        repository = SharedTermsRepository(directory)
+    for query in QUERIES.values():
+        indexer.search(query)
+    for query in TERM_QUERIES:
+        repository.search(query)
+    ready.put(multiprocessing.current_process().pid)
+    release.wait()
+
+
+def _measure(mode: str, workers: int, directory: str, sentences: int) -> tuple[float, int]:
+    context = multiprocessing.get_context("spawn")
+    ready, release = context.Queue(), context.Event()
+    started = time.perf_counter()
+    processes = [
+        context.Process(target=_worker, args=(mode, directory, sentences, ready, release)) for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    pids = [ready.get() for _ in processes]
+    elapsed = time.perf_counter() - started
+    # Measure while every worker is alive, so shared pages are split between all of them.
+    total = sum(_pss_bytes(pid) for pid in pids)
+    release.set()
+    for process in processes:
+        process.join()
+    return elapsed, total
+
+
+def run(sentences: int, terms: int, worker_counts: Iterable[int]) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = build_corpus(sentences)
+        dictionary = generate_terms(terms)
+        TermsRepository(Path(directory) / "terms.json").save_terms(dictionary)
+        builder = CorpusIndexer()
+        for entry in corpus:
+            builder.index_document(*entry)
+        SharedIndexDirectory(directory).publish(builder.iter_entries(), dictionary)
+        del corpus, builder
+        print(f"{sentences} sentences, {terms} terms")
+        print(f"{'workers':>7} {'mode':>8} {'load s':>8} {'total PSS MiB':>14} {'per worker':>11}")
+        for workers in worker_counts:
+            for mode in ("private", "shared"):
+                elapsed, total = _measure(mode, workers, directory, sentences)
+                mib = total / (1 << 20)
+                print(f"{workers:>7} {mode:>8} {elapsed:>8.2f} {mib:>14.1f} {mib / workers:>11.1f}")
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sentences", type=int, default=100000)
+    parser.add_argument("--terms", type=int, default=5000)
+    parser.add_argument("--workers", default="1,2,4", help="Comma separated worker counts")
+    args = parser.parse_args(argv)
+    run(args.sentences, args.terms, [int(count) for count in args.workers.split(",")])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Measure application import time and time to the first served and the first ready request.
+
+Each run starts a fresh interpreter so module caches do not carry over. Run with
+``python -m benchmarks.startup --runs 5``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Iterable
+
+_PROBE = """
+import json, time
+started = time.perf_counter()
+from backend.app.main import app
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app) as client:
+    client.get("/api/v1/healthz")
+    first = time.perf_counter()
+    while client.get("/api/v1/readyz").status_code != 200:
+        time.sleep(0.001)
+    ready = time.perf_counter()
+print(json.dumps({"import": imported - started, "first_request": first - started, "ready": ready - started}))
+"""
+
+
+def _probe() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", _PROBE], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(runs: int) -> None:
+    samples = [_probe() for _ in range(runs)]
+    for key in ("import", "first_request", "ready"):
+        values = [sample[key] * 1000 for sample in samples]
+        print(f"{key:<14} median {statistics.median(values):8.1f} ms  max {max(values):8.1f} ms")
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+    run(args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Benchmark suite over seeded synthetic corpora, with JSON results and regression checks.
+
+Run the suite and store the results::
+
+    python -m benchmarks.suite run --scales small,medium --output baseline.json
+
+Compare a later run against them; the command exits with status 1 on regressions::
+
+    python -m benchmarks.suite run --scales small,medium --output current.json
+    python -m benchmarks.suite compare baseline.json current.json
+
+Each benchmark is timed ``--repeat`` times and reports the median. Peak memory comes from
+one extra run under ``tracemalloc``, so tracing does not distort the timings.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from backend.app.models.terms import TermsRepository
+from backend.app.search.indexer import CorpusIndexer
+from backend.app.services.alignment import AlignmentService
+from benchmarks.synthetic import DEFAULT_SEED, QUERIES, Statute, generate_statutes, generate_terms
+
+DEFAULT_TIME_TOLERANCE = 0.10
+DEFAULT_MEMORY_TOLERANCE = 0.20
+TERM_QUERIES = ["海关", "合同", "劳动当事人", "ZB", "不存在的词语", "কাস্টমস", "arbitration"]
+
+
+@dataclass(frozen=True)
+class Scale:
+    documents: int
+    terms: int
+
+
+SCALES = {
+    "small": Scale(documents=20, terms=500),
+    "medium": Scale(documents=200, terms=5000),
+    "large": Scale(documents=2000, terms=50000),
+}
+
+
+@dataclass
+class Result:
+    benchmark: str
+    scale: str
+    items: int
+    repeat: int
+    median_seconds: float
+    min_seconds: float
+    peak_memory_bytes: int
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.median_seconds if self.median_seconds else 0.0
+
+
+# A case returns a fresh zero-argument callable per run, so untimed setup stays outside the timing.
+Case = Callable[[], Callable[[], object]]
+
+
+def measure(name: str, scale: str, items: int, case: Case, repeat: int) -> Result:
+    samples = []
+    for _ in range(repeat):
+        func = case()
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    func = case()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Result(name, scale, items, repeat, statistics.median(samples), min(samples), peak)
+
+
+def _indexed(statutes: List[Statute]) -> CorpusIndexer:
+    indexer = CorpusIndexer()
+    for statute in statutes:
+        indexer.index_document(statute.document, statute.paragraphs(), statute.alignments())
+    return indexer
+
+
+def _cases(scale: Scale, seed: int, directory: Path) -> Iterator[tuple[str, int, Case]]:
+    statutes = list(generate_statutes(scale.documents, seed=seed))
+    terms = generate_terms(scale.terms, seed=seed)
+    new_terms = generate_terms(max(1, scale.terms // 10), seed=seed + 1)
+
+    terms_path = directory / "terms.json"
+    TermsRepository(terms_path).save_terms(terms)
+    terms_snapshot = terms_path.read_bytes()
+    repository = TermsRepository(terms_path)
+    repository.preload()
+    yield "terms.search", len(TERM_QUERIES), lambda: lambda: [repository.search(query) for query in TERM_QUERIES]
+
+    def merge_case() -> Callable[[], object]:
+        path = directory / "merge.json"
+        path.write_bytes(terms_snapshot)
+        return lambda: TermsRepository(path).merge_terms(new_terms)
+
+    yield "terms.merge", len(new_terms), merge_case
+
+    indexed = [(statute.document, statute.paragraphs(), statute.alignments()) for statute in statutes]
+
+    def index_case() -> Callable[[], object]:
+        indexer = CorpusIndexer()
+        return lambda: [indexer.index_document(*entry) for entry in indexed]
+
+    yield "corpus.index_document", len(indexed), index_case
+
+    indexer = _indexed(statutes)
+    yield "corpus.search", len(QUERIES), lambda: lambda: [indexer.search(query) for query in QUERIES.values()]
+
+    def align_case() -> Callable[[], object]:
+        service = AlignmentService()
+        return lambda: [
+            service.align_and_store(statute.document, statute.source_text, statute.target_text) for statute in statutes
+        ]
+
+    yield "alignment.align_and_store", len(statutes), align_case
+
+    corpus_path = directory / "corpus.jsonl"
+    with corpus_path.open("w", encoding="utf-8") as fp:
+        for statute in statutes:
+            fp.write(json.dumps(statute.entry(), ensure_ascii=False) + "\n")
+
+    def load_case() -> Callable[[], object]:
+        from backend.app.api.v1 import corpus
+        from backend.app.management.load_corpus import ingest
+
+        # Start from empty services so every run ingests the documents instead of skipping them.
+        for factory in (corpus.get_indexer, corpus.get_alignment_service, corpus.get_translation_memory):
+            factory.cache_clear()
+        checkpoint = directory / "corpus.checkpoint"
+        checkpoint.unlink(missing_ok=True)
+        return lambda: ingest(corpus_path, checkpoint_path=checkpoint)
+
+    yield "load_corpus.ingest", len(statutes), load_case
+
+
+def run(scales: Iterable[str], repeat: int, seed: int, only: Optional[List[str]] = None) -> dict:
+    results: List[Result] = []
+    print(f"{'benchmark':<28} {'scale':<7} {'items':>7} {'median':>10} {'items/s':>11} {'peak MiB':>9}")
+    for scale_name in scales:
+        with tempfile.TemporaryDirectory() as directory:
+            for name, items, case in _cases(SCALES[scale_name], seed, Path(directory)):
+                if only and not any(name.startswith(prefix) for prefix in only):
+                    continue
+                result = measure(name, scale_name, items, case, repeat)
+                results.append(result)
+                print(
+                    f"{name:<28} {scale_name:<7} {items:>7} {result.median_seconds * 1000:>8.1f}ms "
+                    f"{result.items_per_second:>11.1f} {result.peak_memory_bytes / (1 << 20):>9.1f}"
+                )
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": [dict(asdict(result), items_per_second=result.items_per_second) for result in results],
+    }
+
+
+def compare(
+    baseline: dict,
+    current: dict,
+    time_tolerance: float = DEFAULT_TIME_TOLERANCE,
+    memory_tolerance: float = DEFAULT_MEMORY_TOLERANCE,
+) -> List[str]:
+    """Print a comparison table and return descriptions of the regressions found."""
+
+    previous: Dict[tuple, dict] = {(entry["benchmark"], entry["scale"]): entry for entry in baseline["results"]}
+    regressions = []
+    print(f"{'benchmark':<28} {'scale':<7} {'time':>8} {'memory':>8}")
+    for entry in current["results"]:
+        key = (entry["benchmark"], entry["scale"])
+        before = previous.get(key)
+        if before is None:
+            print(f"{key[0]:<28} {key[1]:<7} {'new':>8}")
+            continue
+        time_ratio = entry["median_seconds"] / before["median_seconds"] if before["median_seconds"] else 1.0
+        memory_ratio = entry["peak_memory_bytes"] / before["peak_memory_bytes"] if before["peak_memory_bytes"] else 1.0
+        flags = []
+        if time_ratio > 1 + time_tolerance:
+            flags.append("SLOWER")
+            regressions.append(f"{key[0]} [{key[1]}] is {time_ratio - 1:.0%} slower")
+        if memory_ratio > 1 + memory_tolerance:
+            flags.append("MORE MEMORY")
+            regressions.append(f"{key[0]} [{key[1]}] uses {memory_ratio - 1:.0%} more memory")
+        print(f"{key[0]:<28} {key[1]:<7} {time_ratio:>7.2f}x {memory_ratio:>7.2f}x  {' '.join(flags)}")
+    return regressions
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks and record the results as JSON")
+    run_parser.add_argument("--scales", default="small,medium", help=f"Comma separated scales from {', '.join(SCALES)}")
+    run_parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions per benchmark")
+    run_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    run_parser.add_argument("--only", default=None, help="Comma separated benchmark name prefixes to run")
+    run_parser.add_argument("--output", type=Path, default=None, help="Write the results to this JSON file")
+
+    compare_parser = commands.add_parser("compare", help="Flag regressions against a stored baseline")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--time-tolerance", type=float, default=DEFAULT_TIME_TOLERANCE)
+    compare_parser.add_argument("--memory-tolerance", type=float, default=DEFAULT_MEMORY_TOLERANCE)
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        unknown = set(args.scales.split(",")) - set(SCALES)
+        if unknown:
+            parser.error(f"Unknown scales: {', '.join(sorted(unknown))}")
+        only = args.only.split(",") if args.only else None
+        report = run(args.scales.split(","), args.repeat, args.seed, only)
+        if args.output is not None:
+            args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        return
+
+    regressions = compare(
+        json.loads(args.baseline.read_text(encoding="utf-8")),
+        json.loads(args.current.read_text(encoding="utf-8")),
+        args.time_tolerance,
+        args.memory_tolerance,
+    )
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
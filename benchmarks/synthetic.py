@@ -0,0 +1,266 @@
+"""Seeded generator of synthetic Bengali-Chinese statutes and term dictionaries.
+
+Statutes follow the layout of real bilingual acts: a title, articles numbered in Chinese
+(第十二条) and Bengali (ধারা ১২) and sentences drawn from a Zipf-weighted legal vocabulary,
+with the Bengali and Chinese articles sentence-for-sentence parallel. Every statute carries a
+unique registration code (``ZB-00042``) so benchmarks can also query for rare strings. The
+same seed always yields the same data, so results are comparable between runs.
+"""
+from __future__ import annotations
+
+import itertools
+import random
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterator, List, Sequence, Tuple
+
+from backend.app.models.corpus import Document, Paragraph, SentenceAlignment
+from backend.app.models.terms import Term, TermDefinition, TermUsage
+
+DEFAULT_SEED = 7
+ARTICLES_PER_STATUTE = (8, 30)
+SENTENCES_PER_ARTICLE = (1, 3)
+CATEGORIES = ("tax", "civil", "criminal", "administrative", "commercial")
+
+QUERIES = {
+    "common-bn": "ধারা",
+    "short-zh": "海关",
+    "phrase-zh": "海关税",
+    "rare": "ZB-00077",
+    "missing": "不存在的词语",
+}
+
+# Parallel legal vocabulary; entry i in each list translates entry i in the others.
+_ZH_WORDS = [
+    "海关", "税", "当事人", "合同", "法院", "仲裁", "行政", "许可", "权利", "义务", "申报", "货物",
+    "进口", "出口", "罚款", "审查", "登记", "主管部门", "规定", "条例", "程序", "期限", "证明", "责任",
+    "赔偿", "财产", "继承", "婚姻", "劳动", "工资", "刑罚", "犯罪", "证据", "判决", "上诉", "执行",
+]
+_BN_WORDS = [
+    "কাস্টমস", "শুল্ক", "পক্ষ", "চুক্তি", "আদালত", "সালিশি", "প্রশাসনিক", "লাইসেন্স", "অধিকার", "দায়িত্ব",
+    "ঘোষণা", "পণ্য", "আমদানি", "রপ্তানি", "জরিমানা", "পর্যালোচনা", "নিবন্ধন", "কর্তৃপক্ষ", "বিধান", "বিধিমালা",
+    "পদ্ধতি", "মেয়াদ", "প্রমাণপত্র", "দায়", "ক্ষতিপূরণ", "সম্পত্তি", "উত্তরাধিকার", "বিবাহ", "শ্রম", "মজুরি",
+    "দণ্ড", "অপরাধ", "সাক্ষ্য", "রায়", "আপিল", "কার্যকর",
+]
+_EN_WORDS = [
+    "customs", "tax", "party", "contract", "court", "arbitration", "administrative", "licence", "right",
+    "obligation", "declaration", "goods", "import", "export", "fine", "review", "registration", "authority",
+    "provision", "regulation", "procedure", "term", "certificate", "liability", "compensation", "property",
+    "inheritance", "marriage", "labour", "wages", "penalty", "offence", "evidence", "judgment", "appeal",
+    "enforcement",
+]
+_WEIGHTS = list(itertools.accumulate(1 / rank for rank in range(1, len(_ZH_WORDS) + 1)))
+_BENGALI_DIGITS = str.maketrans("0123456789", "০১২৩৪৫৬৭৮৯")
+_CHINESE_DIGITS = "零一二三四五六七八九"
+
+
+def chinese_numeral(number: int) -> str:
+    """Write 1-9999 the way statutes number their articles (十二, 一百零五)."""
+
+    if number < 10:
+        return _CHINESE_DIGITS[number]
+    parts = []
+    pending_zero = False
+    for value, unit in ((1000, "千"), (100, "百"), (10, "十"), (1, "")):
+        digit = number // value % 10
+        if digit:
+            if pending_zero:
+                parts.append("零")
+            parts.append(("" if value == 10 and number < 20 else _CHINESE_DIGITS[digit]) + unit)
+            pending_zero = False
+        elif parts:
+            pending_zero = True
+    return "".join(parts)
+
+
+def bengali_numeral(number: int) -> str:
+    return str(number).translate(_BENGALI_DIGITS)
+
+
+def _indexes(rng: random.Random, count: int) -> List[int]:
+    return rng.choices(range(len(_ZH_WORDS)), cum_weights=_WEIGHTS, k=count)
+
+
+def _sentence_pair(rng: random.Random) -> Tuple[str, str]:
+    words = _indexes(rng, rng.randint(6, 14))
+    clause = rng.randrange(3, len(words))
+    zh = "".join(_ZH_WORDS[index] for index in words[:clause]) + "，" + "".join(_ZH_WORDS[index] for index in words[clause:])
+    bn = " ".join(_BN_WORDS[index] for index in words[:clause]) + ", " + " ".join(_BN_WORDS[index] for index in words[clause:])
+    return bn + "।", zh + "。"
+
+
+@dataclass
+class Statute:
+    """A synthetic act with parallel Bengali (source) and Chinese (target) articles."""
+
+    document: Document
+    source_articles: List[List[str]]
+    target_articles: List[List[str]]
+
+    def _article_text(self, language: str, number: int, sentences: Sequence[str]) -> str:
+        if language == "zh":
+            return f"第{chinese_numeral(number)}条 " + "".join(sentences)
+        return f"ধারা {bengali_numeral(number)}: " + " ".join(sentences)
+
+    @property
+    def source_text(self) -> str:
+        return "\n".join(
+            self._article_text("bn", number, sentences) for number, sentences in enumerate(self.source_articles, 1)
+        )
+
+    @property
+    def target_text(self) -> str:
+        return "\n".join(
+            self._article_text("zh", number, sentences) for number, sentences in enumerate(self.target_articles, 1)
+        )
+
+    @property
+    def sentence_count(self) -> int:
+        return sum(len(sentences) for sentences in self.source_articles)
+
+    def paragraphs(self) -> List[Paragraph]:
+        """One paragraph per article and language, Bengali first."""
+
+        identifier = self.document.identifier
+        paragraphs = []
+        for language, articles in (("bn", self.source_articles), ("zh", self.target_articles)):
+            for number, sentences in enumerate(articles, 1):
+                paragraphs.append(
+                    Paragraph(
+                        identifier=f"{identifier}-{language}-{number}",
+                        document_id=identifier,
+                        order=len(paragraphs) + 1,
+                        language=language,
+                        text=self._article_text(language, number, sentences),
+                    )
+                )
+        return paragraphs
+
+    def alignments(self) -> List[SentenceAlignment]:
+        """The gold sentence alignment, without running the aligner."""
+
+        identifier = self.document.identifier
+        pairs = zip(itertools.chain.from_iterable(self.source_articles), itertools.chain.from_iterable(self.target_articles))
+        return [
+            SentenceAlignment(
+                identifier=f"{identifier}-{position}",
+                document_id=identifier,
+                source_sentence=source,
+                target_sentence=target,
+                source_language="bn",
+                target_language="zh",
+                score=1.0,
+            )
+            for position, (source, target) in enumerate(pairs)
+        ]
+
+    def entry(self) -> dict:
+        """The statute as a ``load_corpus`` input record."""
+
+        document = self.document
+        return {
+            "identifier": document.identifier,
+            "title": document.title,
+            "source_language": document.source_language,
+            "target_language": document.target_language,
+            "source": document.source,
+            "publication_date": document.publication_date.isoformat() if document.publication_date else None,
+            "categories": list(document.categories),
+            "source_text": self.source_text,
+            "target_text": self.target_text,
+        }
+
+
+def generate_statutes(
+    count: int,
+    *,
+    seed: int = DEFAULT_SEED,
+    articles: Tuple[int, int] = ARTICLES_PER_STATUTE,
+    prefix: str = "bench",
+) -> Iterator[Statute]:
+    rng = random.Random(seed)
+    for index in range(count):
+        topic = _indexes(rng, 1)[0]
+        year = rng.randint(1972, 2024)
+        document = Document(
+            identifier=f"{prefix}-{index}",
+            title=f"{_EN_WORDS[topic].title()} Act {year} ({index})",
+            source_language="bn",
+            target_language="zh",
+            source="synthetic",
+            publication_date=date(year, rng.randint(1, 12), rng.randint(1, 28)),
+            categories=[rng.choice(CATEGORIES)],
+        )
+        code = f"ZB-{index:05d}"
+        source_articles: List[List[str]] = []
+        target_articles: List[List[str]] = []
+        for number in range(rng.randint(*articles)):
+            pairs = [_sentence_pair(rng) for _ in range(rng.randint(*SENTENCES_PER_ARTICLE))]
+            if number == 0:
+                pairs.insert(0, (f"এই আইনের নিবন্ধন নম্বর {code}।", f"本法登记编号为{code}。"))
+            source_articles.append([source for source, _ in pairs])
+            target_articles.append([target for _, target in pairs])
+        yield Statute(document, source_articles, target_articles)
+
+
+def build_corpus(
+    sentences: int, seed: int = DEFAULT_SEED
+) -> List[Tuple[Document, List[Paragraph], List[SentenceAlignment]]]:
+    """Statutes totalling at least ``sentences`` aligned sentences, ready for ``index_document``."""
+
+    corpus = []
+    total = 0
+    for statute in generate_statutes(max(1, sentences), seed=seed):
+        corpus.append((statute.document, statute.paragraphs(), statute.alignments()))
+        total += statute.sentence_count
+        if total >= sentences:
+            break
+    return corpus
+
+
+def generate_terms(count: int, *, seed: int = DEFAULT_SEED, usages: Tuple[int, int] = (1, 4)) -> List[Term]:
+    """``count`` terms with unique headwords and tri-lingual definitions and usages."""
+
+    rng = random.Random(seed)
+    terms = []
+    seen = set()
+    for index in range(count):
+        words = _indexes(rng, rng.randint(2, 3))
+        headword = "".join(_ZH_WORDS[word] for word in words)
+        if headword in seen:
+            headword = f"{headword}第{chinese_numeral(index % 9999 + 1)}号"
+        seen.add(headword)
+        english = " ".join(_EN_WORDS[word] for word in words)
+        bengali = " ".join(_BN_WORDS[word] for word in words)
+        term_usages = []
+        for _ in range(rng.randint(*usages)):
+            bn, zh = _sentence_pair(rng)
+            term_usages.append(
+                TermUsage(
+                    chinese=headword + zh,
+                    english=f"{english} {' '.join(rng.choices(_EN_WORDS, k=6))}.",
+                    bengali=f"{bengali} {bn}",
+                    article=f"第{chinese_numeral(rng.randint(1, 120))}条",
+                )
+            )
+        terms.append(
+            Term(
+                headword=headword,
+                definitions=TermDefinition(
+                    zh=_sentence_pair(rng)[1], en=f"The {english} as defined by statute.", bn=_sentence_pair(rng)[0]
+                ),
+                usages=term_usages,
+            )
+        )
+    return terms
+
+
+__all__ = [
+    "QUERIES",
+    "Statute",
+    "bengali_numeral",
+    "build_corpus",
+    "chinese_numeral",
+    "generate_statutes",
+    "generate_terms",
+]
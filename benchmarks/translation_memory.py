@@ -0,0 +1,77 @@
+"""Time translation-memory batch lookups against a synthetic alignment store.
+
+Run with ``python -m benchmarks.translation_memory --pairs 1000000 --batch 500``.
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import random
+import time
+from typing import Iterable
+
+from backend.app.models.corpus import SentenceAlignment
+from backend.app.services.translation_memory import TranslationMemory
+
+# Zipf-distributed draws over the most common CJK ideographs approximate legal prose.
+_CHARACTERS = [chr(code) for code in range(0x4E00, 0x4E00 + 3500)]
+_CUMULATIVE_WEIGHTS = list(itertools.accumulate(1 / rank for rank in range(1, len(_CHARACTERS) + 1)))
+
+
+def _sentence(rng: random.Random) -> str:
+    return "".join(rng.choices(_CHARACTERS, cum_weights=_CUMULATIVE_WEIGHTS, k=rng.randint(12, 40))) + "。"
+
+
+def _perturb(sentence: str, rng: random.Random) -> str:
+    characters = list(sentence)
+    for _ in range(max(1, len(characters) // 10)):
+        characters[rng.randrange(len(characters))] = rng.choice(_CHARACTERS[:50])
+    return "".join(characters)
+
+
+def run(pairs: int, batch: int, threshold: float, per_document: int = 50) -> None:
+    rng = random.Random(11)
+    memory = TranslationMemory()
+    targets = []
+    build_seconds = 0.0
+    for document_index in range(max(1, pairs // per_document)):
+        document_id = f"tm-{document_index}"
+        alignments = []
+        for position in range(per_document):
+            source = _sentence(rng)
+            alignments.append(
+                SentenceAlignment(
+                    identifier=f"{document_id}-{position}",
+                    document_id=document_id,
+                    source_sentence=source,
+                    target_sentence=f"বাক্য {document_index}-{position}।",
+                    source_language="zh",
+                    target_language="bn",
+                )
+            )
+            targets.append(source)
+        started = time.perf_counter()
+        memory.add_alignments(document_id, alignments)
+        build_seconds += time.perf_counter() - started
+    segments = [_perturb(rng.choice(targets), rng) for _ in range(batch)]
+    started = time.perf_counter()
+    results = memory.lookup_many(segments, threshold=threshold, language="zh")
+    lookup_seconds = time.perf_counter() - started
+    hit_rate = sum(1 for matches in results if matches) / len(results)
+    print(
+        f"{pairs} pairs: index {build_seconds:.1f}s, {batch} segments in {lookup_seconds:.2f}s "
+        f"({batch / lookup_seconds:.0f} segments/s), {hit_rate:.0%} with a match >= {threshold:.0%}"
+    )
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pairs", type=int, default=100000)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--threshold", type=float, default=0.7)
+    args = parser.parse_args(argv)
+    run(args.pairs, args.batch, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+from datetime import date
+from typing import Callable
+
+import pytest
+
+from backend.app.api.v1.corpus import sync_document
+from backend.app.models.corpus import Document, Paragraph
+from backend.app.services.alignment import AlignmentService
+
+SAMPLE_CORPUS = [
+    ("fts-1", ["tax"], date(2021, 5, 20), "ধারা ১। কাস্টমস শুল্ক।", "第一条。海关税。海关申报。"),
+    ("fts-2", ["civil"], date(2018, 1, 1), "ধারা ১। চুক্তি আইন।", "第一条。合同法。"),
+    ("fts-3", ["tax"], None, "ধারা ২। Customs Duty.", "第二条。海关关税条例。"),
+]
+
+
+def _populate(indexer) -> None:
+    service = AlignmentService()
+    for identifier, categories, published, source_text, target_text in SAMPLE_CORPUS:
+        document = Document(
+            identifier=identifier,
+            title=f"Act {identifier}",
+            source_language="bn",
+            target_language="zh",
+            source="gazette",
+            publication_date=published,
+            categories=list(categories),
+        )
+        paragraphs = [
+            Paragraph(identifier=f"{identifier}-src", document_id=identifier, order=1, language="bn", text=source_text),
+            Paragraph(identifier=f"{identifier}-tgt", document_id=identifier, order=2, language="zh", text=target_text),
+        ]
+        result = service.align_and_store(document, source_text, target_text)
+        indexer.index_document(document, paragraphs, result.alignments)
+
+
+@pytest.fixture
+def populate() -> Callable[[object], None]:
+    """Index three small bilingual acts, shared by the search backend tests, into any indexer."""
+
+    return _populate
+
+
+@pytest.fixture
+def synced_document() -> Document:
+    """Sync one customs regulation through the API module's shared index and return it."""
+
+    document = Document(
+        identifier="doc-2",
+        title="Customs Regulation",
+        source_language="bn",
+        target_language="zh",
+        source="parliament",
+        publication_date=date(2021, 5, 20),
+        official_url="https://example.com/doc-2",
+        categories=["tax"],
+    )
+    sync_document(
+        document,
+        source_text="ধারা ১। কাস্টমস শুল্ক নির্ধারণ।",
+        target_text="第一条。海关税的确定。",
+        category="tax",
+    )
+    return document
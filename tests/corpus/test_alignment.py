@@ -1,7 +1,9 @@
+import io
+import random
 from datetime import date
 
 from backend.app.models.corpus import Document
-from backend.app.services.alignment import AlignmentService
+from backend.app.services.alignment import AlignmentService, SentenceSplitter
 
 
 def test_alignment_pairs_sentences() -> None:
@@ -23,3 +25,49 @@ def test_alignment_pairs_sentences() -> None:
     assert len(result.alignments) == 3
     assert result.alignments[0].source_sentence.startswith("ধারা ১")
     assert result.alignments[0].target_sentence.startswith("第一条")
+
+
+def test_alignment_identifiers_are_deterministic() -> None:
+    document = Document(
+        identifier="doc-3",
+        title="Determinism Act",
+        source_language="bn",
+        target_language="zh",
+        source="gazette",
+    )
+    source_text = "ধারা ১। ধারা ২।"
+    target_text = "第一条。第二条。"
+
+    first = AlignmentService().align_and_store(document, source_text, target_text)
+    second = AlignmentService().align_and_store(document, source_text, target_text)
+
+    assert [a.identifier for a in first.alignments] == [a.identifier for a in second.alignments]
+    assert len({a.identifier for a in first.alignments}) == len(first.alignments)
+    assert first.fingerprint == second.fingerprint
+
+
+def test_splitter_handles_danda_quotes_and_abbreviations() -> None:
+    splitter = SentenceSplitter()
+
+    assert splitter.split("ধারা ১। ড. রহমান সম্মত হন॥ শেষ", "bn") == ["ধারা ১।", "ড. রহমান সম্মত হন॥", "শেষ"]
+    assert splitter.split("他说：“第一条。”（见附件！）第二条", "zh") == ["他说：“第一条。”", "（见附件！）", "第二条"]
+    assert splitter.split("See Art. 5 at 1.5 percent. Done", "en") == ["See Art. 5 at 1.5 percent.", "Done"]
+
+
+def test_splitter_streams_across_chunk_boundaries() -> None:
+    text = "第一条。海关税“确定。”ধারা ১। Mr. Rahman agreed... যথা" * 3
+
+    for chunk_size in (1, 2, 5, 64):
+        assert list(SentenceSplitter().iter_stream(io.StringIO(text), chunk_size=chunk_size)) == SentenceSplitter().split(text)
+
+
+def test_stream_matches_split_on_random_chunkings() -> None:
+    splitter = SentenceSplitter()
+    pieces = ["r", "M", "ড", "ড.", "e.g.", "Mr.", "Art.", "১", "5", ".", "।", "॥", "。", "”", ")", " ", "  ", "第一条", "ধারা"]
+    rng = random.Random(34)
+    texts = ["r Mড.ড. e.g."] + ["".join(rng.choice(pieces) for _ in range(rng.randint(1, 40))) for _ in range(300)]
+
+    for text in texts:
+        expected = splitter.split(text)
+        for chunk_size in (1, 2, 3, rng.randint(4, 20)):
+            assert list(splitter.iter_stream(io.StringIO(text), chunk_size=chunk_size)) == expected, (text, chunk_size)
@@ -0,0 +1,29 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.api.v1.corpus import get_document
+from backend.app.config import settings
+from backend.app.models.corpus import Document
+
+
+def test_document_batch_streams_ndjson(monkeypatch: pytest.MonkeyPatch, synced_document: Document) -> None:
+    from backend.app.main import app
+
+    monkeypatch.setattr(settings, "warmup_in_background", False)
+    requested = [synced_document.identifier, "missing", synced_document.identifier]
+    with TestClient(app) as client:
+        compressed = client.post("/api/v1/corpus/batch", json={"document_ids": requested})
+        plain = client.post(
+            "/api/v1/corpus/batch", json={"document_ids": requested}, headers={"Accept-Encoding": "identity"}
+        )
+
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in plain.headers
+    assert compressed.text == plain.text
+    lines = [json.loads(line) for line in plain.text.splitlines()]
+    assert lines == [
+        {"document_id": synced_document.identifier, **get_document(synced_document.identifier)},
+        {"document_id": "missing", "error": "Document not found"},
+    ]
@@ -0,0 +1,53 @@
+import gzip
+import json
+import xml.etree.ElementTree as ET
+from datetime import date
+
+from backend.app.models.corpus import Document
+from backend.app.search.indexer import CorpusIndexer
+from backend.app.services.alignment import AlignmentService
+from backend.app.services.export import ExportFilter, export_corpus
+
+
+def build_indexer() -> CorpusIndexer:
+    indexer = CorpusIndexer()
+    service = AlignmentService()
+    for identifier, category, published in (("exp-1", "tax", date(2020, 1, 1)), ("exp-2", "civil", date(2021, 1, 1))):
+        document = Document(
+            identifier=identifier,
+            title=f"Export Act {identifier}",
+            source_language="bn",
+            target_language="zh",
+            source="gazette",
+            publication_date=published,
+            categories=[category],
+        )
+        result = service.align_and_store(document, "ধারা ১. শুল্ক <হার>.", "第一条。税率 & 关税。")
+        indexer.index_document(document, [], result.alignments)
+    return indexer
+
+
+def test_jsonl_export_applies_filters() -> None:
+    filters = ExportFilter.from_language_pair("bn-zh", category="tax", min_score=0.9)
+
+    body = b"".join(export_corpus(build_indexer(), filters, "jsonl")).decode("utf-8")
+
+    rows = [json.loads(line) for line in body.splitlines()]
+    assert [(row["document_id"], row["source"], row["target"]) for row in rows] == [("exp-1", "ধারা ১.", "第一条。")]
+
+
+def test_tmx_export_is_valid_gzipped_xml() -> None:
+    body = gzip.decompress(b"".join(export_corpus(build_indexer(), ExportFilter(year=2021), "tmx", compress=True)))
+
+    root = ET.fromstring(body)
+    units = root.findall("./body/tu")
+    assert len(units) == 2
+    segments = [seg.text for seg in units[1].iter("seg")]
+    assert segments == ["শুল্ক <হার>.", "税率 & 关税。"]
+
+
+def test_tsv_export_has_header_and_rows() -> None:
+    lines = b"".join(export_corpus(build_indexer(), ExportFilter(), "tsv")).decode("utf-8").splitlines()
+
+    assert lines[0].split("\t")[-2:] == ["source", "target"]
+    assert len(lines) == 5
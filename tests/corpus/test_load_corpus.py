@@ -0,0 +1,153 @@
+import io
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from backend.app.api.v1.corpus import indexer
+from backend.app.management import load_corpus
+from backend.app.management.load_corpus import Checkpoint, _iter_json_array, ingest, iter_entries
+
+
+def make_entry(index: int) -> dict:
+    return {
+        "identifier": f"stream-{index}",
+        "title": f"Streaming Act {index}",
+        "source_language": "bn",
+        "target_language": "zh",
+        "publication_date": "2022-03-01",
+        "source_text": f"ধারা {index}। প্রবাহ পরীক্ষা।",
+        "target_text": f"第{index}条。流式测试。",
+    }
+
+
+def test_json_array_is_decoded_incrementally() -> None:
+    entries = [make_entry(index) for index in range(5)]
+    text = json.dumps(entries, ensure_ascii=False, indent=2)
+
+    decoded = list(_iter_json_array(io.StringIO(text), chunk_size=7))
+
+    assert [entry for _, entry in decoded] == entries
+    data = text.encode("utf-8")
+    decoder = json.JSONDecoder()
+    for position, entry in decoded:
+        assert decoder.raw_decode(data[position:].decode("utf-8"))[0] == entry
+
+
+def test_jsonl_and_array_files_yield_same_entries(tmp_path: Path) -> None:
+    entries = [make_entry(index) for index in range(3)]
+    array_path = tmp_path / "corpus.json"
+    array_path.write_text(json.dumps(entries, ensure_ascii=False), encoding="utf-8")
+    jsonl_path = tmp_path / "corpus.jsonl"
+    jsonl_path.write_text("\n".join(json.dumps(entry, ensure_ascii=False) for entry in entries), encoding="utf-8")
+
+    assert list(iter_entries(array_path)) == entries
+    assert list(iter_entries(jsonl_path)) == entries
+
+
+def test_resume_continues_after_checkpoint(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    entries = [make_entry(index) for index in range(4)]
+    path = tmp_path / "corpus.jsonl"
+    path.write_text("\n".join(json.dumps(entry, ensure_ascii=False) for entry in entries), encoding="utf-8")
+    checkpoint_path = tmp_path / "corpus.checkpoint"
+    Checkpoint(offset=2, identifier="stream-1").save(checkpoint_path)
+
+    synced: list[str] = []
+    original_sync = load_corpus.sync_document
+
+    def recording_sync(document, **kwargs):
+        synced.append(document.identifier)
+        original_sync(document, **kwargs)
+
+    monkeypatch.setattr(load_corpus, "sync_document", recording_sync)
+
+    ingested = ingest(path, checkpoint_path=checkpoint_path, resume=True, batch_size=1)
+
+    assert ingested == 2
+    assert synced == ["stream-2", "stream-3"]
+    checkpoint = Checkpoint.load(checkpoint_path)
+    assert (checkpoint.offset, checkpoint.identifier) == (4, "stream-3")
+    assert path.read_bytes()[checkpoint.position :].startswith(b'{"identifier": "stream-3"')
+    assert indexer.get_document("stream-3") is not None
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".json"])
+def test_resume_seeks_past_committed_documents(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, suffix: str) -> None:
+    entries = [make_entry(index) for index in range(10, 14)]
+    path = tmp_path / f"corpus{suffix}"
+    if suffix == ".jsonl":
+        path.write_text("\n".join(json.dumps(entry, ensure_ascii=False) for entry in entries), encoding="utf-8")
+    else:
+        path.write_text(json.dumps(entries, ensure_ascii=False, indent=1), encoding="utf-8")
+    checkpoint_path = tmp_path / "corpus.checkpoint"
+    original_sync = load_corpus.sync_document
+
+    def failing_sync(document, **kwargs):
+        if document.identifier == "stream-12":
+            raise RuntimeError("interrupted")
+        original_sync(document, **kwargs)
+
+    monkeypatch.setattr(load_corpus, "sync_document", failing_sync)
+    with pytest.raises(RuntimeError):
+        ingest(path, checkpoint_path=checkpoint_path, batch_size=1)
+    checkpoint = Checkpoint.load(checkpoint_path)
+    assert (checkpoint.offset, checkpoint.identifier) == (2, "stream-11")
+
+    # Garble the documents before the last committed one (keeping the opening bracket): a resumed run must not read them.
+    data = path.read_bytes()
+    path.write_bytes(data[:1] + b"#" * (checkpoint.position - 1) + data[checkpoint.position :])
+    monkeypatch.setattr(load_corpus, "sync_document", original_sync)
+
+    assert ingest(path, checkpoint_path=checkpoint_path, resume=True, batch_size=1) == 2
+    assert Checkpoint.load(checkpoint_path).identifier == "stream-13"
+    assert indexer.get_document("stream-13") is not None
+
+
+def test_resume_rejects_mismatched_checkpoint(tmp_path: Path) -> None:
+    path = tmp_path / "corpus.jsonl"
+    path.write_text("\n".join(json.dumps(make_entry(index)) for index in range(2)), encoding="utf-8")
+    checkpoint_path = tmp_path / "corpus.checkpoint"
+    Checkpoint(offset=1, identifier="other-document").save(checkpoint_path)
+
+    with pytest.raises(ValueError, match="does not match"):
+        ingest(path, checkpoint_path=checkpoint_path, resume=True)
+
+
+_INGEST_AND_REPORT = """
+import sys
+from pathlib import Path
+
+from backend.app.core.metrics import CACHE_REQUESTS
+from backend.app.management.load_corpus import ingest
+
+ingest(Path(sys.argv[1]))
+print(*(CACHE_REQUESTS.labels("unchanged_documents", result).value for result in ("hit", "miss")))
+"""
+
+
+def test_separate_runs_skip_documents_stored_by_earlier_runs(tmp_path: Path) -> None:
+    from sqlalchemy import create_engine
+
+    from backend.app.models.tables import Base
+
+    database = tmp_path / "corpus.db"
+    Base.metadata.create_all(create_engine(f"sqlite:///{database}"))
+    path = tmp_path / "corpus.jsonl"
+    path.write_text("\n".join(json.dumps(make_entry(index), ensure_ascii=False) for index in range(10)), encoding="utf-8")
+    environment = dict(
+        os.environ,
+        APP_CORPUS_STORAGE="sql",
+        APP_SYNC_DATABASE_URL=f"sqlite:///{database}",
+        PYTHONPATH=str(Path(__file__).resolve().parents[2]),
+    )
+
+    def run_in_new_process() -> list[float]:
+        command = [sys.executable, "-c", _INGEST_AND_REPORT, str(path)]
+        output = subprocess.run(command, env=environment, capture_output=True, text=True, check=True).stdout
+        return [float(value) for value in output.split()]
+
+    assert run_in_new_process() == [0, 10]
+    assert run_in_new_process() == [10, 0]
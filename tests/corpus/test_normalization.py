@@ -0,0 +1,67 @@
+from backend.app.core.normalization import NormalizationOptions, normalize, normalize_with_offsets
+from backend.app.models.corpus import Document, Paragraph, SentenceAlignment
+from backend.app.search.indexer import CorpusIndexer
+from backend.app.search.sqlite import SqliteCorpusIndexer
+
+
+def build_indexer(indexer):
+    document = Document(
+        identifier="norm-1",
+        title="Customs Act",
+        source_language="bn",
+        target_language="zh",
+        source="gazette",
+    )
+    paragraphs = [
+        Paragraph(identifier="norm-1-tgt", document_id="norm-1", order=1, language="zh", text="第一條　海關稅ＡＢＣ規則"),
+    ]
+    alignments = [
+        SentenceAlignment(
+            identifier="norm-1-a1",
+            document_id="norm-1",
+            source_sentence="\u0986\u09dc\u09be\u0987 শতাংশ শুল্ক",
+            target_sentence="海關稅",
+            source_language="bn",
+            target_language="zh",
+            score=1.0,
+        )
+    ]
+    indexer.index_document(document, paragraphs, alignments)
+    return indexer
+
+
+def test_pipeline_folds_width_case_and_script_variants() -> None:
+    assert normalize("ＡＢＣ１２３") == "abc123"
+    assert normalize("海關稅") == "海关税"
+    # Decomposed DDA + NUKTA and the precomposed RRA fold to the same form.
+    assert normalize("\u09a1\u09bc") == normalize("\u09dc")
+    assert normalize("ABC", NormalizationOptions(casefold=False)) == "ABC"
+
+
+def test_offsets_map_normalized_spans_to_original_text() -> None:
+    normalized = normalize_with_offsets("Straße ＡＢＣ")
+    assert normalized.text == "strasse abc"
+    assert normalized.find_spans("ss") == [(4, 5)]
+    assert normalized.find_spans("abc") == [(7, 10)]
+
+
+def test_traditional_and_full_width_queries_match_with_highlights() -> None:
+    indexer = build_indexer(CorpusIndexer())
+
+    results = indexer.search("海关税abc")
+    assert results["total"] == 1
+    assert results["items"][0]["highlights"] == {"text": [[4, 10]]}
+
+    results = indexer.search("海關稅")
+    highlights = {item["paragraph_id"] or item["alignment_id"]: item["highlights"] for item in results["items"]}
+    assert highlights["norm-1-a1"] == {"source_sentence": [], "target_sentence": [[0, 3]]}
+    assert indexer.index.settings["normalization.chinese_variants"] == "true"
+
+
+def test_bengali_nukta_forms_match_across_backends() -> None:
+    memory = build_indexer(CorpusIndexer())
+    sqlite = build_indexer(SqliteCorpusIndexer())
+
+    query = "\u0986\u09a1\u09bc\u09be\u0987"
+    assert memory.search(query) == sqlite.search(query)
+    assert memory.search(query)["items"][0]["highlights"]["source_sentence"] == [[0, 4]]
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+from backend.app.core.profiling import QueryProfile, phase
+from backend.app.search.indexer import CorpusIndexer
+from backend.app.search.sqlite import SqliteCorpusIndexer
+
+
+def test_profile_reports_phases_and_counters(populate) -> None:
+    indexer = CorpusIndexer()
+    populate(indexer)
+    profile = QueryProfile()
+
+    results = indexer.search("海关", category="tax", page_size=2, profile=profile)
+
+    assert results == indexer.search("海关", category="tax", page_size=2)
+    assert list(profile.phases) == ["match", "sort", "serialize"]
+    assert profile.counters["candidates_examined"] == 2
+    assert profile.counters["hits_scored"] == results["total"]
+    assert profile.counters["objects_materialized"] == 2
+    assert profile.counters["postings_read"] >= profile.counters["hits_scored"]
+
+
+def test_sqlite_profile_counts_rows(tmp_path: Path, populate) -> None:
+    indexer = SqliteCorpusIndexer(str(tmp_path / "index.sqlite3"))
+    populate(indexer)
+    profile = QueryProfile()
+
+    results = indexer.search("海关", page_size=2, profile=profile)
+
+    assert list(profile.phases) == ["query", "serialize"]
+    assert profile.counters == {"postings_read": 2, "hits_scored": results["total"], "objects_materialized": 2}
+    indexer.close()
+
+
+def test_server_timing_lists_phases_and_total() -> None:
+    profile = QueryProfile()
+    with profile.phase("match"):
+        pass
+    with phase(None, "ignored"):
+        pass
+
+    header = profile.server_timing()
+
+    assert header.startswith("match;dur=")
+    assert header.split(", ")[-1].startswith("total;dur=")
+    assert profile.as_dict()["total_ms"] == round(profile.total_seconds() * 1000, 3)
@@ -0,0 +1,145 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+
+from backend.app.core.lifecycle import lazy_singleton
+from backend.app.core.profiling import QueryProfile
+from backend.app.models.corpus import Document, Paragraph
+from backend.app.search.indexer import CorpusIndexer
+from backend.app.search.sharded import ShardedCorpusIndexer
+from backend.app.services.alignment import AlignmentService
+
+
+@pytest.fixture(scope="module")
+def indexes():
+    memory = CorpusIndexer()
+    sharded = ShardedCorpusIndexer(3)
+    service = AlignmentService()
+    for index in range(12):
+        document = Document(
+            identifier=f"shard-{index}",
+            title=f"Sharded Act {index}",
+            source_language="bn",
+            target_language="zh",
+            source="gazette",
+            publication_date=date(2015 + index % 4, 1, 1),
+            categories=["tax" if index % 2 else "civil"],
+        )
+        source_text = "ধারা ১। " * (index % 3 + 1) + "শুল্ক।"
+        target_text = "第一条。" + "海关。" * (index % 4) + "税。"
+        paragraphs = [
+            Paragraph(identifier=f"shard-{index}-tgt", document_id=document.identifier, order=1, language="zh", text=target_text)
+        ]
+        alignments = service.align_and_store(document, source_text, target_text).alignments
+        memory.index_document(document, paragraphs, alignments)
+        sharded.index_document(document, paragraphs, alignments)
+    yield memory, sharded
+    sharded.close()
+
+
+@pytest.mark.parametrize(
+    "query, options",
+    [
+        ("海关", {}),
+        ("ধারা", {"page": 2, "page_size": 7}),
+        ("税", {"category": "tax", "year": 2016}),
+        ("missing", {}),
+    ],
+)
+def test_sharded_search_matches_single_index(indexes, query: str, options: dict) -> None:
+    memory, sharded = indexes
+    assert sharded.search(query, **options) == memory.search(query, **options)
+
+
+def test_documents_are_routed_to_their_shard(indexes) -> None:
+    memory, sharded = indexes
+    assert sum(sharded.shard_sizes()) == 12
+    assert sharded.get_document("shard-5") == memory.get_document("shard-5")
+    assert sharded.get_alignments("shard-5") == memory.get_alignments("shard-5")
+    requested = ["shard-7", "shard-0", "missing", "shard-7", "shard-11"]
+    assert sharded.get_documents(requested) == memory.get_documents(requested)
+
+
+def test_sharded_profile_merges_shard_counters(indexes) -> None:
+    memory, sharded = indexes
+    memory_profile, sharded_profile = QueryProfile(), QueryProfile()
+
+    assert sharded.search("海关", profile=sharded_profile) == memory.search("海关", profile=memory_profile)
+    assert sharded_profile.counters == memory_profile.counters
+    assert {"scatter", "merge", "shard_match", "shard_serialize"} <= set(sharded_profile.phases)
+
+
+def test_failed_send_leaves_the_other_shards_usable(indexes, monkeypatch: pytest.MonkeyPatch) -> None:
+    memory, sharded = indexes
+
+    def broken_send(message):
+        raise OSError("send failed")
+
+    monkeypatch.setattr(sharded._connections[1], "send", broken_send)
+    with pytest.raises(OSError, match="send failed"):
+        sharded.shard_sizes()
+    monkeypatch.undo()
+
+    assert sum(sharded.shard_sizes()) == 12
+    assert sharded.search("海关") == memory.search("海关")
+    assert all(not pending for pending in sharded._pending)
+
+
+def test_concurrent_requests_get_their_own_replies(indexes) -> None:
+    memory, sharded = indexes
+    queries = [("海关", {}), ("ধারা", {"page": 2, "page_size": 3}), ("税", {"category": "tax"}), ("missing", {})]
+
+    def run(index: int):
+        query, options = queries[index % len(queries)]
+        requested = [f"shard-{(index + offset) % 12}" for offset in range(3)]
+        return sharded.search(query, **options), sharded.get_documents(requested), query, options, requested
+
+    with ThreadPoolExecutor(8) as pool:
+        for results, documents, query, options, requested in pool.map(run, range(40)):
+            assert results == memory.search(query, **options)
+            assert documents == memory.get_documents(requested)
+
+
+def test_batch_lookup_sends_every_shard_request_before_waiting(indexes, monkeypatch: pytest.MonkeyPatch) -> None:
+    memory, sharded = indexes
+    events = []
+    submit = sharded._submit
+
+    def recording_submit(shard, operation, *args):
+        future = submit(shard, operation, *args)
+        events.append(("send", shard))
+        result = future.result
+
+        def recording_result(timeout=None):
+            events.append(("wait", shard))
+            return result(timeout)
+
+        future.result = recording_result
+        return future
+
+    monkeypatch.setattr(sharded, "_submit", recording_submit)
+
+    requested = [f"shard-{index}" for index in range(12)]
+    assert sharded.get_documents(requested) == memory.get_documents(requested)
+
+    sends = [event for event in events if event[0] == "send"]
+    assert sorted(shard for _, shard in sends) == list(range(sharded.shard_count))
+    assert events[: len(sends)] == sends
+
+
+def test_app_shutdown_stops_the_shard_processes(monkeypatch: pytest.MonkeyPatch) -> None:
+    from fastapi.testclient import TestClient
+
+    from backend.app.api.v1 import corpus
+    from backend.app.config import settings
+    from backend.app.main import app
+
+    sharded = ShardedCorpusIndexer(2)
+    processes = list(sharded._processes)
+    monkeypatch.setattr(settings, "warmup_in_background", False)
+    monkeypatch.setattr(corpus, "get_indexer", lazy_singleton(lambda: sharded))
+    with TestClient(app) as client:
+        assert client.get("/api/v1/readyz").status_code == 200
+
+    assert not any(process.is_alive() for process in processes)
@@ -0,0 +1,164 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from backend.app.api.v1 import corpus
+from backend.app.config import settings
+from backend.app.core.profiling import QueryProfile
+from backend.app.management.publish_index import publish
+from backend.app.search.indexer import CorpusIndexer
+from backend.app.search.shared import ReadOnlyIndexError, SharedCorpusIndexer, SharedIndexDirectory
+from backend.app.services.translation_memory import TranslationMemory
+
+
+@pytest.fixture
+def published(tmp_path: Path, populate):
+    memory = CorpusIndexer()
+    populate(memory)
+    SharedIndexDirectory(tmp_path).publish(memory.iter_entries(), [])
+    return memory, SharedCorpusIndexer(tmp_path)
+
+
+@pytest.mark.parametrize(
+    "query, options",
+    [
+        ("海关", {}),
+        ("海關稅", {}),
+        ("customs", {"category": "tax"}),
+        ("ধারা", {"year": 2021}),
+        ("ধারা", {"page": 2, "page_size": 2}),
+        ("", {"page_size": 3}),
+        ("missing", {}),
+        ("海关", {"page": 9}),
+    ],
+)
+def test_shared_results_match_in_memory_index(published, query: str, options: dict) -> None:
+    memory, shared = published
+    assert shared.search(query, **options) == memory.search(query, **options)
+
+
+def test_shared_index_serves_documents_read_only(published) -> None:
+    memory, shared = published
+
+    assert shared.get_document("fts-1") == memory.get_document("fts-1")
+    assert shared.get_alignments("fts-2") == memory.get_alignments("fts-2")
+    assert shared.get_document("missing") is None
+    assert shared.get_documents(["fts-3", "missing", "fts-1"]) == memory.get_documents(["fts-3", "missing", "fts-1"])
+    assert list(shared.iter_documents()) == list(memory.iter_documents())
+    assert shared.stats()["alignments"] == memory.stats()["alignments"]
+    with pytest.raises(ReadOnlyIndexError):
+        shared.index_document(*next(memory.iter_entries()))
+
+
+def test_workers_switch_to_a_new_generation(tmp_path: Path, populate) -> None:
+    directory = SharedIndexDirectory(tmp_path)
+    shared = SharedCorpusIndexer(tmp_path, refresh_interval=0)
+    assert shared.search("海关")["total"] == 0
+
+    memory = CorpusIndexer()
+    populate(memory)
+    first = directory.publish(memory.iter_entries(), [])
+    assert shared.search("海关")["total"] == memory.search("海关")["total"]
+    assert shared.generation == first
+
+    single = CorpusIndexer()
+    single.index_document(*next(memory.iter_entries()))
+    for _ in range(3):
+        latest = directory.publish(single.iter_entries(), [], keep=2)
+    assert shared.search("海关") == single.search("海关")
+    assert shared.generation == latest == directory.generation()
+    assert sorted(path.name for path in tmp_path.glob("corpus-*.idx")) == [
+        f"corpus-{latest - 1:08d}.idx",
+        f"corpus-{latest:08d}.idx",
+    ]
+
+
+def test_missing_generation_keeps_the_attached_one(tmp_path: Path, populate) -> None:
+    directory = SharedIndexDirectory(tmp_path)
+    memory = CorpusIndexer()
+    populate(memory)
+    first = directory.publish(memory.iter_entries(), [])
+    shared = SharedCorpusIndexer(tmp_path, refresh_interval=0)
+    expected = memory.search("海关")
+    assert shared.search("海关") == expected
+
+    # CURRENT names a generation whose file was pruned, then one that is not a valid index.
+    (tmp_path / "CURRENT").write_text(f"{first + 5}\n", encoding="ascii")
+    assert shared.search("海关") == expected
+    directory.path_for("corpus", first + 6).write_bytes(b"truncated")
+    (tmp_path / "CURRENT").write_text(f"{first + 6}\n", encoding="ascii")
+    assert shared.search("海关") == expected
+    assert shared.generation == first
+
+    latest = directory.publish(memory.iter_entries(), [])
+    assert shared.search("海关") == expected
+    assert shared.generation == latest
+
+
+def test_shared_profile_counts_scan(published) -> None:
+    _, shared = published
+    profile = QueryProfile()
+
+    results = shared.search("海关", page_size=1, profile=profile)
+
+    assert profile.counters["hits_scored"] == results["total"]
+    assert profile.counters["objects_materialized"] == 1
+    assert set(profile.phases) == {"match", "sort", "serialize"}
+
+
+def test_translation_memory_follows_published_generations(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, populate
+) -> None:
+    shared = SharedCorpusIndexer(tmp_path, refresh_interval=0)
+    translation_memory = TranslationMemory()
+    monkeypatch.setattr(settings, "shared_index_dir", str(tmp_path))
+    monkeypatch.setattr(corpus, "get_indexer", lambda: shared)
+    monkeypatch.setattr(corpus, "get_translation_memory", lambda: translation_memory)
+
+    # Nothing is published when the worker starts, so its memory starts empty.
+    assert corpus.restore_index() == 0
+    assert len(translation_memory) == 0
+
+    memory = CorpusIndexer()
+    populate(memory)
+    directory = SharedIndexDirectory(tmp_path)
+    first = directory.publish(memory.iter_entries(), [])
+    expected = TranslationMemory()
+    for document, _, alignments in memory.iter_entries():
+        expected.add_alignments(document.identifier, alignments)
+    assert corpus.refresh_translation_memory() is translation_memory
+    assert translation_memory.generation == first
+    assert len(translation_memory) == len(expected)
+    assert translation_memory.lookup("海关税") == expected.lookup("海关税")
+
+    single = CorpusIndexer()
+    single.index_document(*next(memory.iter_entries()))
+    directory.publish(single.iter_entries(), [])
+    assert corpus._lookup_translation_memory("合同法") == []
+    assert {match.alignment.document_id for match in translation_memory.lookup("海关税")} == {"fts-1"}
+
+
+def test_publish_builds_its_own_index(tmp_path: Path) -> None:
+    corpus_path = tmp_path / "corpus.jsonl"
+    entry = {
+        "identifier": "published-1",
+        "title": "Published Act",
+        "source_language": "bn",
+        "target_language": "zh",
+        "source_text": "ধারা ১। কাস্টমস শুল্ক।",
+        "target_text": "第一条。海关税。",
+    }
+    corpus_path.write_text(json.dumps(entry, ensure_ascii=False) + "\n", encoding="utf-8")
+    (tmp_path / "shared").mkdir()
+    before = settings.model_dump()
+    built = corpus.get_indexer.cache_info().currsize
+
+    generation = publish(tmp_path / "shared", corpus_path, tmp_path / "terms.json")
+
+    assert settings.model_dump() == before
+    assert corpus.get_indexer.cache_info().currsize == built
+    shared = SharedCorpusIndexer(tmp_path / "shared")
+    assert shared.get_document("published-1").title == "Published Act"
+    assert shared.generation == generation
+    assert not (tmp_path / "shared" / "publish.checkpoint").exists()
@@ -0,0 +1,64 @@
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from backend.app.search.indexer import CorpusIndexer
+from backend.app.search.sqlite import SqliteCorpusIndexer
+
+
+@pytest.mark.parametrize(
+    "query, options",
+    [
+        ("海关", {}),
+        ("海关关税", {}),
+        ("customs", {"category": "tax"}),
+        ("ধারা", {"year": 2021}),
+        ("ধারা", {"page": 2, "page_size": 2}),
+        ("", {"page_size": 3}),
+        ("missing", {}),
+        ("海关", {"page": 9}),
+    ],
+)
+def test_sqlite_results_match_in_memory_index(tmp_path: Path, query: str, options: dict, populate) -> None:
+    memory = CorpusIndexer()
+    sqlite = SqliteCorpusIndexer(str(tmp_path / "index.sqlite3"))
+    populate(memory)
+    populate(sqlite)
+
+    assert sqlite.search(query, **options) == memory.search(query, **options)
+
+
+def test_sqlite_index_persists_documents(tmp_path: Path, populate) -> None:
+    path = str(tmp_path / "index.sqlite3")
+    indexer = SqliteCorpusIndexer(path)
+    populate(indexer)
+    indexer.close()
+
+    reopened = SqliteCorpusIndexer(path)
+    assert reopened.get_document("fts-1").publication_date == date(2021, 5, 20)
+    assert [alignment.target_sentence for alignment in reopened.get_alignments("fts-2")] == ["第一条。", "合同法。"]
+    assert reopened.search("合同")["total"] == 2
+
+    memory = CorpusIndexer()
+    populate(memory)
+    requested = ["fts-2", "missing", "fts-1", "fts-2"]
+    assert reopened.get_documents(requested) == memory.get_documents(requested)
+    assert list(memory.get_documents(requested)) == ["fts-2", "fts-1"]
+
+
+def test_reopening_with_other_options_renormalizes(tmp_path: Path, populate) -> None:
+    from backend.app.core.normalization import NormalizationOptions
+
+    path = str(tmp_path / "index.sqlite3")
+    case_sensitive = SqliteCorpusIndexer(path, options=NormalizationOptions(casefold=False))
+    populate(case_sensitive)
+    assert case_sensitive.search("customs")["total"] == 0
+    case_sensitive.close()
+
+    reopened = SqliteCorpusIndexer(path)
+    memory = CorpusIndexer()
+    populate(memory)
+    assert reopened.search("customs") == memory.search("customs")
+    stored = dict(reopened._connection.execute("SELECT key, value FROM meta"))
+    assert stored["normalization.casefold"] == "true"
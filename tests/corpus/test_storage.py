@@ -0,0 +1,107 @@
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models.corpus import Document, Paragraph
+from backend.app.models.tables import Base
+from backend.app.search.indexer import CorpusIndexer
+from backend.app.services.alignment import AlignmentService
+from backend.app.services.storage import SqlCorpusRepository
+
+
+@pytest.fixture()
+def repository(tmp_path: Path) -> SqlCorpusRepository:
+    engine = create_engine(f"sqlite:///{tmp_path / 'corpus.db'}", future=True)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+
+    @contextmanager
+    def session_scope():
+        session = factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    return SqlCorpusRepository(session_scope, batch_size=2)
+
+
+def make_document(identifier: str) -> Document:
+    return Document(
+        identifier=identifier,
+        title=f"Act {identifier}",
+        source_language="bn",
+        target_language="zh",
+        source="gazette",
+        publication_date=date(2019, 7, 1),
+        categories=["civil"],
+    )
+
+
+def test_alignments_round_trip_with_keyset_pagination(repository: SqlCorpusRepository) -> None:
+    service = AlignmentService(repository)
+    for identifier in ("doc-a", "doc-b"):
+        document = make_document(identifier)
+        repository.save_document(
+            document,
+            [Paragraph(identifier=f"{identifier}-src", document_id=identifier, order=1, language="bn", text="ধারা ১।")],
+        )
+        service.align_and_store(document, "ধারা ১। ধারা ২। ধারা ৩।", "第一条。第二条。第三条。")
+
+    alignments = repository.get("doc-a")
+    assert [alignment.target_sentence for alignment in alignments] == ["第一条。", "第二条。", "第三条。"]
+    assert [alignment.document_id for alignment in repository.iter_alignments()] == ["doc-a"] * 3 + ["doc-b"] * 3
+    assert len(list(repository.iter_alignments(after=("doc-a", 1)))) == 4
+    assert [document.identifier for document in repository.iter_documents()] == ["doc-a", "doc-b"]
+    assert repository.get_fingerprint("doc-a") is not None
+
+
+def test_load_into_restores_index(repository: SqlCorpusRepository) -> None:
+    document = make_document("doc-c")
+    paragraphs = [Paragraph(identifier="doc-c-tgt", document_id="doc-c", order=2, language="zh", text="第一条。仲裁。")]
+    repository.save_document(document, paragraphs)
+    AlignmentService(repository).align_and_store(document, "ধারা ১। সালিশি।", "第一条。仲裁。")
+
+    indexer = CorpusIndexer()
+    assert repository.load_into(indexer) == 1
+
+    assert indexer.get_document("doc-c") == document
+    assert indexer.search("仲裁")["total"] == 2
+
+
+def test_paragraph_pages_keep_paragraphs_sharing_an_order(repository: SqlCorpusRepository) -> None:
+    repository.batch_size = 1
+    paragraphs = [
+        Paragraph(identifier=f"doc-p-{suffix}", document_id="doc-p", order=order, language="zh", text=suffix)
+        for order, suffix in ((1, "b"), (1, "a"), (2, "d"), (1, "c"))
+    ]
+    repository.save_document(make_document("doc-p"), paragraphs)
+
+    assert [paragraph.identifier for paragraph in repository.iter_paragraphs("doc-p")] == [
+        "doc-p-a",
+        "doc-p-b",
+        "doc-p-c",
+        "doc-p-d",
+    ]
+
+
+def test_metadata_only_sync_survives_restore(repository: SqlCorpusRepository, monkeypatch: pytest.MonkeyPatch) -> None:
+    from backend.app.api.v1 import corpus
+
+    service = AlignmentService(repository)
+    monkeypatch.setattr(corpus, "get_alignment_service", lambda: service)
+    assert corpus.sync_document(make_document("doc-m"), source_text="ধারা ১। সালিশি।", target_text="第一条。仲裁。")
+
+    renamed = make_document("doc-m")
+    renamed.title = "Renamed Act"
+    renamed.official_url = "https://example.com/doc-m"
+    assert not corpus.sync_document(renamed, source_text="ধারা ১। সালিশি।", target_text="第一条。仲裁。", category="tax")
+
+    restored = CorpusIndexer()
+    repository.load_into(restored)
+    assert restored.get_document("doc-m") == renamed
+    assert restored.get_document("doc-m").categories == ["civil", "tax"]
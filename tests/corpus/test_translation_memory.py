@@ -0,0 +1,91 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from backend.app.api.v1 import corpus
+from backend.app.api.v1.corpus import translation_memory_batch, translation_memory_lookup, TranslationMemoryBatchRequest
+from backend.app.models.corpus import SentenceAlignment
+from backend.app.search.sqlite import SqliteCorpusIndexer
+from backend.app.services.translation_memory import TranslationMemory, bounded_edit_distance
+
+
+def make_alignment(identifier: str, source: str, target: str) -> SentenceAlignment:
+    return SentenceAlignment(
+        identifier=identifier,
+        document_id="tm-doc",
+        source_sentence=source,
+        target_sentence=target,
+        source_language="zh",
+        target_language="bn",
+    )
+
+
+def test_bounded_edit_distance_stops_past_limit() -> None:
+    assert bounded_edit_distance("当事人应当履行合同", "当事人必须履行合同", 3) == 2
+    assert bounded_edit_distance("当事人应当履行合同", "人民法院", 3) is None
+
+
+def test_lookup_ranks_fuzzy_matches() -> None:
+    memory = TranslationMemory()
+    memory.add_alignments(
+        "tm-doc",
+        [
+            make_alignment("a", "当事人应当履行合同义务。", "পক্ষগণ চুক্তির দায়িত্ব পালন করবে।"),
+            make_alignment("b", "当事人应当全面履行合同义务。", "পক্ষগণ সম্পূর্ণভাবে চুক্তির দায়িত্ব পালন করবে।"),
+            make_alignment("c", "人民法院依法独立行使审判权。", "জনগণের আদালত স্বাধীনভাবে বিচার করে।"),
+        ],
+    )
+
+    matches = memory.lookup("当事人必须履行合同义务。", threshold=0.6, language="zh")
+
+    assert [match.alignment.identifier for match in matches] == ["a", "b"]
+    assert matches[0].similarity > matches[1].similarity
+    assert matches[0].to_dict()["similarity"] == 83.3
+
+    memory.add_alignments("tm-doc", [])
+    assert memory.lookup("当事人必须履行合同义务。", threshold=0.6) == []
+
+
+def test_lookup_follows_normalization_options() -> None:
+    from backend.app.core.normalization import NormalizationOptions
+
+    alignments = [make_alignment("t", "海關稅的確定。", "কাস্টমস শুল্ক নির্ধারণ।")]
+    folding, literal = TranslationMemory(), TranslationMemory(options=NormalizationOptions(fold_chinese_variants=False))
+    folding.add_alignments("tm-doc", alignments)
+    literal.add_alignments("tm-doc", alignments)
+
+    assert folding.lookup("海关税的确定。", threshold=0.95)
+    assert literal.lookup("海关税的确定。", threshold=0.95) == []
+
+
+def test_endpoints_use_synced_alignments(synced_document) -> None:
+
+    single = asyncio.run(translation_memory_lookup(segment="海关税的确定", limit=5, threshold=0.8, language=None))
+    batch = asyncio.run(
+        translation_memory_batch(
+            TranslationMemoryBatchRequest(segments=["海关税的确定", "完全无关的句子"], threshold=0.8)
+        )
+    )
+
+    assert single["matches"][0]["target_sentence"] == "海关税的确定。"
+    assert batch["results"][0]["matches"] == single["matches"]
+    assert batch["results"][1]["matches"] == []
+
+
+def test_restart_with_sqlite_index_restores_the_memory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, populate) -> None:
+    path = str(tmp_path / "index.sqlite3")
+    previous_run = SqliteCorpusIndexer(path)
+    populate(previous_run)
+    previous_run.close()
+
+    reopened = SqliteCorpusIndexer(path)
+    memory = TranslationMemory()
+    monkeypatch.setattr(corpus, "get_indexer", lambda: reopened)
+    monkeypatch.setattr(corpus, "get_translation_memory", lambda: memory)
+    monkeypatch.setattr(corpus, "get_alignment_service", lambda: corpus.AlignmentService())
+
+    assert corpus.restore_index() == 3
+    matches = memory.lookup("合同法。")
+    assert matches and matches[0].alignment.document_id == "fts-2"
+    reopened.close()
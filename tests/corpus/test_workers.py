@@ -0,0 +1,84 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.config import settings
+from backend.app.core.workers import Deadline, DeadlineExceeded, Overloaded, WorkerPool
+from backend.app.search.indexer import CorpusIndexer
+from backend.app.search.sqlite import SqliteCorpusIndexer
+
+
+def test_pool_rejects_work_beyond_its_queue() -> None:
+    pool = WorkerPool(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario() -> None:
+        running = asyncio.ensure_future(pool.run(release.wait))
+        queued = asyncio.ensure_future(pool.run(lambda: "queued"))
+        await asyncio.sleep(0.01)
+        with pytest.raises(Overloaded) as rejected:
+            await pool.run(lambda: "rejected")
+        assert rejected.value.retry_after >= 1
+        release.set()
+        assert await queued == "queued"
+        await running
+
+    asyncio.run(scenario())
+    assert pool.pending == 0
+    pool.shutdown()
+
+
+def test_pool_gives_up_at_the_deadline() -> None:
+    pool = WorkerPool(max_workers=1, max_queue=0)
+    release = threading.Event()
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(pool.run(release.wait, Deadline.after(0.05)))
+    release.set()
+    pool.shutdown()
+
+
+@pytest.mark.parametrize("factory", [CorpusIndexer, SqliteCorpusIndexer])
+def test_search_stops_at_an_expired_deadline(factory, populate) -> None:
+    indexer = factory()
+    populate(indexer)
+
+    with pytest.raises(DeadlineExceeded):
+        indexer.search("海关", deadline=Deadline.after(-1))
+    assert indexer.search("海关", deadline=Deadline.after(60))["total"] > 0
+
+
+def test_corpus_routes_are_mounted_with_deadlines(monkeypatch: pytest.MonkeyPatch, synced_document) -> None:
+    from backend.app.main import app
+
+    monkeypatch.setattr(settings, "warmup_in_background", False)
+    with TestClient(app) as client:
+        response = client.get("/api/v1/corpus/", params={"query": "海关"})
+        assert response.status_code == 200
+        assert response.json()["total"] >= 1
+
+        monkeypatch.setattr(settings, "request_deadline_seconds", 0)
+        response = client.get("/api/v1/corpus/", params={"query": "海关"})
+        assert response.status_code == 503
+        assert int(response.headers["Retry-After"]) >= 1
+
+
+@pytest.mark.parametrize(
+    ("path", "body"),
+    [("/api/v1/corpus/batch", {"document_ids": ["doc-2"]}), ("/api/v1/terms/batch", {"queries": ["海关"]})],
+)
+def test_batch_routes_run_under_the_request_deadline(
+    monkeypatch: pytest.MonkeyPatch, synced_document, path: str, body: dict
+) -> None:
+    from backend.app.main import app
+
+    monkeypatch.setattr(settings, "warmup_in_background", False)
+    with TestClient(app) as client:
+        assert client.post(path, json=body).status_code == 200
+
+        monkeypatch.setattr(settings, "request_deadline_seconds", 0)
+        response = client.post(path, json=body)
+        assert response.status_code == 503
+        assert int(response.headers["Retry-After"]) >= 1
@@ -0,0 +1,57 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from benchmarks.suite import compare, main
+from benchmarks.synthetic import generate_statutes, generate_terms
+
+
+def _report(seconds: float, memory: int) -> dict:
+    return {
+        "results": [
+            {"benchmark": "corpus.search", "scale": "small", "median_seconds": seconds, "peak_memory_bytes": memory},
+        ]
+    }
+
+
+def test_same_seed_yields_identical_data() -> None:
+    first = [statute.entry() for statute in generate_statutes(5, seed=11)]
+    again = [statute.entry() for statute in generate_statutes(5, seed=11)]
+    other = [statute.entry() for statute in generate_statutes(5, seed=12)]
+
+    assert first == again
+    assert first != other
+    assert generate_terms(50, seed=11) == generate_terms(50, seed=11)
+    assert generate_terms(50, seed=11) != generate_terms(50, seed=12)
+
+
+@pytest.mark.parametrize(
+    ("seconds", "memory", "expected"),
+    [
+        (1.5, 1000, ["corpus.search [small] is 50% slower"]),
+        (1.0, 1500, ["corpus.search [small] uses 50% more memory"]),
+        (1.5, 1500, ["corpus.search [small] is 50% slower", "corpus.search [small] uses 50% more memory"]),
+    ],
+)
+def test_compare_flags_changes_beyond_tolerance(seconds: float, memory: int, expected: list) -> None:
+    assert compare(_report(1.0, 1000), _report(seconds, memory), 0.1, 0.2) == expected
+
+
+def test_compare_accepts_changes_within_tolerance() -> None:
+    assert compare(_report(1.0, 1000), _report(1.09, 1190), 0.1, 0.2) == []
+    assert compare(_report(1.0, 1000), _report(0.5, 500), 0.1, 0.2) == []
+
+
+def test_compare_command_exits_with_status_one_on_regression(tmp_path: Path) -> None:
+    baseline = tmp_path / "baseline.json"
+    current = tmp_path / "current.json"
+    baseline.write_text(json.dumps(_report(1.0, 1000)), encoding="utf-8")
+
+    current.write_text(json.dumps(_report(1.05, 1000)), encoding="utf-8")
+    main(["compare", str(baseline), str(current)])
+
+    current.write_text(json.dumps(_report(1.5, 1000)), encoding="utf-8")
+    with pytest.raises(SystemExit) as exited:
+        main(["compare", str(baseline), str(current)])
+    assert exited.value.code == 1